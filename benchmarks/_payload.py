@@ -0,0 +1,88 @@
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+def make_payload(days, seed=0):
+    """
+    Builds a synthetic Alpha-vantage TIME_SERIES_DAILY_ADJUSTED payload
+
+    Parameters
+    ----------
+    days : int
+        Number of daily signals
+    seed : (optional) int
+        Seed for the random walk of prices
+
+    Returns
+    -------
+    payload : dict
+        Payload in the form returned by the API, most recent first
+    """
+
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+
+    # Weekdays only, most recent first like the API
+    dates = []
+    day = date(2020, 12, 31)
+    while len(dates) < days:
+        if day.weekday() < 5:
+            dates.append(day)
+        day -= timedelta(days=1)
+
+    series = {}
+    for day, close in zip(dates, closes[::-1]):
+        series[day.isoformat()] = {
+            "1. open": f"{close * 0.99:.4f}",
+            "2. high": f"{close * 1.01:.4f}",
+            "3. low": f"{close * 0.98:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. adjusted close": f"{close:.4f}",
+            "6. volume": f"{rng.integers(1e5, 1e7)}",
+            "7. dividend amount": "0.0000",
+            "8. split coefficient": "1.0",
+        }
+
+    return {"Meta Data": {}, "Time Series (Daily)": series}
+
+
+def serve_payload(payload):
+    """
+    Serves a payload over HTTP/1.1 from a local stand-in server
+
+    Parameters
+    ----------
+    payload : dict
+        JSON payload returned for every GET request
+
+    Returns
+    -------
+    server : http.server.ThreadingHTTPServer
+        Running server, its address is server.server_address
+    """
+
+    body = json.dumps(payload).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep connections alive between requests
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
@@ -0,0 +1,32 @@
+"""
+Times half_lives over 5000 spreads of 1260 days against statsmodels' OLS
+fitted spread by spread.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_half_life.py
+"""
+import time
+
+import numpy as np
+import statsmodels.api as sm
+
+from radium.pair import half_lives
+
+SPREADS = 5000
+DAYS = 1260
+
+rng = np.random.default_rng(0)
+phi = rng.uniform(0.8, 1.0, SPREADS)
+spreads = np.empty((DAYS, SPREADS))
+spreads[0] = 0
+for t in range(1, DAYS):
+    spreads[t] = phi * spreads[t - 1] + rng.normal(size=SPREADS)
+
+start = time.perf_counter()
+for i in range(SPREADS):
+    s = spreads[:, i]
+    sm.OLS(np.diff(s), sm.add_constant(s[:-1])).fit()
+print(f"OLS spread by spread: {time.perf_counter() - start:6.2f}s")
+
+start = time.perf_counter()
+half_lives(spreads)
+print(f"half_lives          : {time.perf_counter() - start:6.2f}s")
@@ -0,0 +1,137 @@
+"""
+Compares the statsmodels per-window OLS hedge against the vectorized rolling
+OLS hedge across lookbacks.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_hedge.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+from radium import Equity, Pair
+from radium.equity import ArraySource
+
+DAYS = 2000
+
+rng = np.random.default_rng(0)
+dates = pd.bdate_range("2000-01-03", periods=DAYS)
+x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS)))
+y = 1.5 * x + rng.normal(0, 1, DAYS)
+
+source = ArraySource()
+source.add("Y", dates, y)
+source.add("X", dates, x)
+pair = Pair(Equity("Y", dates[0], dates[-1], source=source),
+            Equity("X", dates[0], dates[-1], source=source))
+
+print(f"{DAYS} days")
+for lookback in (20, 60, 250):
+    start = time.perf_counter()
+    reference = pair._hedge_ols_reference(lookback)
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = pair._hedge_ols(lookback)
+    new = time.perf_counter() - start
+
+    error = np.max(np.abs(reference - vectorized))
+    print(f"lookback {lookback:>3}: statsmodels {old:6.2f}s, "
+          f"vectorized {1e3 * new:6.2f}ms, {old / new:8.0f}x faster, "
+          f"max difference {error:.1e}")
+
+# Johansen vector of every window against coint_johansen window by window
+prices = pair.prices
+lookback = 60
+start = time.perf_counter()
+reference = [coint_johansen(prices[i - lookback + 1:i + 1], 0, 1).evec[:, 0]
+             for i in range(lookback - 1, DAYS - 1)]
+old = time.perf_counter() - start
+reference = np.array([vector[1] / vector[0] for vector in reference])
+
+start = time.perf_counter()
+pair.hedge("JOHANSEN", lookback)
+new = time.perf_counter() - start
+
+error = np.max(np.abs(reference - pair.hedge_ratios[lookback - 1:-1, 1]))
+print(f"johansen {lookback}: coint_johansen {old:6.2f}s, "
+      f"vectorized {1e3 * new:6.2f}ms, {old / new:8.0f}x faster, "
+      f"max difference {error:.1e}")
+
+# Sweep of many lookbacks against separate vectorized hedges, the sweep
+# only saves summing the moments again for each lookback
+lookbacks = list(range(10, 260, 10))
+
+start = time.perf_counter()
+separate = np.stack([pair._hedge_ols(lookback) for lookback in lookbacks])
+old = time.perf_counter() - start
+
+pair._hedge_cache.clear()
+start = time.perf_counter()
+swept = pair.hedge_sweep("OLS", lookbacks)
+new = time.perf_counter() - start
+
+error = np.nanmax(np.abs(separate - swept))
+print(f"{len(lookbacks)} lookbacks: separate {1e3 * old:6.2f}ms, "
+      f"sweep {1e3 * new:6.2f}ms, {old / new:4.1f}x faster, "
+      f"max difference {error:.1e}")
+
+# Daily update by extending against hedging every date again, on a long
+# history where recomputing every window dominates
+LONG = 50000
+long_dates = pd.bdate_range("1800-01-01", periods=LONG + 20)
+long_x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, LONG + 20)))
+long_y = 1.5 * long_x + rng.normal(0, 1, LONG + 20)
+
+source.add("LY", long_dates[:LONG], long_y[:LONG])
+source.add("LX", long_dates[:LONG], long_x[:LONG])
+pair = Pair(Equity("LY", long_dates[0], long_dates[LONG - 1], source=source),
+            Equity("LX", long_dates[0], long_dates[LONG - 1], source=source))
+pair.hedge("OLS", 60)
+pair.price_spread
+new_dates = long_dates[LONG:]
+new_prices = np.column_stack([long_y[LONG:], long_x[LONG:]])
+
+start = time.perf_counter()
+for i in range(20):
+    pair.extend(new_dates[i:i + 1], new_prices[i:i + 1])
+new = (time.perf_counter() - start) / 20
+
+start = time.perf_counter()
+for i in range(20):
+    pair._hedge_cache.clear()
+    pair._spread_cache.clear()
+    pair.hedge("OLS", 60)
+    pair.price_spread
+old = (time.perf_counter() - start) / 20
+
+print(f"daily update on {LONG} days: rehedge {1e3 * old:6.2f}ms, "
+      f"extend {1e3 * new:6.2f}ms, {old / new:4.1f}x faster")
+
+# Extending writes into buffers doubled when full, so the cost of a daily
+# update stays flat as the history grows
+for days in (5000, 500000):
+    days_dates = pd.date_range("1000-01-01", periods=days + 200, freq="D",
+                               unit="s")
+    days_x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days + 200)))
+    days_y = 1.5 * days_x + rng.normal(0, 1, days + 200)
+
+    source.add("DY", days_dates[:days], days_y[:days])
+    source.add("DX", days_dates[:days], days_x[:days])
+    pair = Pair(Equity("DY", days_dates[0], days_dates[days - 1],
+                       source=source),
+                Equity("DX", days_dates[0], days_dates[days - 1],
+                       source=source))
+    pair.hedge("OLS", 60)
+    pair.price_spread
+    new_dates = days_dates[days:]
+    new_prices = np.column_stack([days_y[days:], days_x[days:]])
+
+    start = time.perf_counter()
+    for i in range(200):
+        pair.extend(new_dates[i:i + 1], new_prices[i:i + 1])
+    new = (time.perf_counter() - start) / 200
+
+    print(f"extend on {days} days: {1e3 * new:6.2f}ms per date")
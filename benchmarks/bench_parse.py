@@ -0,0 +1,40 @@
+"""
+Compares parsing an Alpha-vantage payload with pandas column conversion
+against radium's one pass array parser.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_parse.py
+"""
+import json
+import timeit
+
+import pandas as pd
+
+from radium.equity.source import _parse_daily
+from _payload import make_payload
+
+
+def parse_pandas(daily_json):
+    # Former Equity._daily parsing
+    df = pd.DataFrame(daily_json).T
+    for col in list(df.columns):
+        df[col] = pd.to_numeric(df[col])
+    df.index = pd.to_datetime(df.index).date
+    return df
+
+
+def parse_arrays(daily_json):
+    dates, values, columns = _parse_daily(daily_json)
+    return pd.DataFrame(values, index=dates.astype(object), columns=columns)
+
+
+for days in (100, 1250, 5000):
+    # Round trip through JSON so values are strings as received
+    payload = json.loads(json.dumps(make_payload(days)))
+    daily_json = payload["Time Series (Daily)"]
+
+    number = 20
+    old = timeit.timeit(lambda: parse_pandas(daily_json), number=number)
+    new = timeit.timeit(lambda: parse_arrays(daily_json), number=number)
+
+    print(f"{days:>5} days: pandas {1e3 * old / number:7.2f}ms, "
+          f"arrays {1e3 * new / number:6.2f}ms, {old / new:5.1f}x faster")
@@ -0,0 +1,44 @@
+"""
+Times prefilter_pairs over every pair of 200 symbols of 1260 days, then
+screen_pairs over all pairs against only the survivors.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_prefilter.py
+"""
+import time
+
+import numpy as np
+
+from radium import PricePanel
+from radium.screen import prefilter_pairs, screen_pairs
+
+SYMBOLS = 200
+DAYS = 1260
+
+# Symbols loaded on a few factors, planted pairs sharing a random walk one
+# for one and one pair at a hedge ratio of 0.4
+rng = np.random.default_rng(0)
+factors = np.cumsum(rng.normal(scale=0.01, size=(DAYS, 5)), axis=0)
+loadings = rng.normal(1, 0.5, size=(5, SYMBOLS)) / 5
+log_prices = factors @ loadings \
+    + np.cumsum(rng.normal(scale=0.005, size=(DAYS, SYMBOLS)), axis=0)
+log_prices[:, 1:20:2] = log_prices[:, 0:20:2] \
+    + rng.normal(scale=0.01, size=(DAYS, 10))
+log_prices[:, 21] = 0.4 * log_prices[:, 20] + rng.normal(scale=0.01, size=DAYS)
+planted = [(f'S{i}', f'S{i + 1}') for i in range(0, 22, 2)]
+
+dates = np.datetime64('2015-01-01') + np.arange(DAYS)
+panel = PricePanel([f'S{i}' for i in range(SYMBOLS)], dates,
+                   100 * np.exp(log_prices.T))
+
+result = prefilter_pairs(panel)
+print(result)
+kept = len(set(planted) & set(result.survivors))
+print(f"planted pairs kept: {kept} of {len(planted)}\n")
+
+start = time.perf_counter()
+screen_pairs(panel)
+print(f"screen_pairs, all pairs      : {time.perf_counter() - start:6.2f}s")
+
+start = time.perf_counter()
+screen_pairs(panel, pairs=result.survivors)
+print(f"screen_pairs, survivors only : {time.perf_counter() - start:6.2f}s")
@@ -0,0 +1,40 @@
+"""
+Times the robust rolling hedges over 5000 days, in one process and split
+over a process pool, against statsmodels' RLM fitted window by window.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_robust.py
+"""
+import os
+import time
+
+import numpy as np
+import statsmodels.api as sm
+
+from radium.pair.pair import _lookback_hedge_ratios
+
+DAYS = 5000
+LOOKBACK = 60
+
+rng = np.random.default_rng(0)
+x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS)))
+y = 1.5 * x + rng.normal(0, 1, DAYS)
+y[rng.integers(0, DAYS, DAYS // 50)] += 20
+prices = np.column_stack([y, x])
+
+# statsmodels on a sample of windows, scaled up to every window
+sample = range(LOOKBACK - 1, DAYS - 1, 50)
+start = time.perf_counter()
+for i in sample:
+    window = prices[i - LOOKBACK + 1:i + 1]
+    sm.RLM(window[:, 0], sm.add_constant(window[:, 1]),
+           M=sm.robust.norms.HuberT()).fit()
+reference = (time.perf_counter() - start) * (DAYS - LOOKBACK) / len(sample)
+print(f"{DAYS} days, lookback {LOOKBACK}, {os.cpu_count()} CPUs")
+print(f"HUBER statsmodels (estimated): {reference:6.2f}s")
+
+for method in ("HUBER", "THEILSEN"):
+    for n_jobs in (1, None):
+        start = time.perf_counter()
+        _lookback_hedge_ratios(prices, method, LOOKBACK, n_jobs)
+        elapsed = time.perf_counter() - start
+        print(f"{method:<8} n_jobs={str(n_jobs):<4}: {elapsed:6.2f}s")
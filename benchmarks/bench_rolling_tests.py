@@ -0,0 +1,51 @@
+"""
+Times rolling cointegration tests of a pair over 5000 days against
+statsmodels' coint and coint_johansen fitted window by window.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_rolling_tests.py
+"""
+import time
+
+import numpy as np
+import statsmodels.tsa.stattools as ts
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+from radium import Equity, Pair
+from radium.equity import ArraySource
+
+DAYS = 5000
+WINDOW = 250
+
+rng = np.random.default_rng(0)
+x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS)))
+y = 1.5 * x + rng.normal(0, 1, DAYS)
+dates = np.datetime64('2000-01-03') + np.arange(DAYS)
+
+source = ArraySource()
+source.add('Y', dates, y)
+source.add('X', dates, x)
+pair = Pair(Equity('Y', '2000-01-01', '2014-01-01', source=source),
+            Equity('X', '2000-01-01', '2014-01-01', source=source))
+prices = pair.prices
+n_windows = prices.shape[0] - WINDOW + 1
+
+# statsmodels on a sample of windows, scaled up to every window
+sample = range(0, n_windows, 100)
+for name, test in (('coint', lambda w: ts.coint(w[:, 0], w[:, 1], maxlag=1,
+                                                autolag=None)),
+                   ('coint_johansen', lambda w: coint_johansen(w, 0, 1))):
+    start = time.perf_counter()
+    for i in sample:
+        test(prices[i:i + WINDOW])
+    elapsed = (time.perf_counter() - start) * n_windows / len(sample)
+    print(f"{name:<16} window by window (estimated): {elapsed:6.2f}s")
+
+start = time.perf_counter()
+pair.rolling_cadf(WINDOW)
+print(f"rolling_cadf                                : "
+      f"{time.perf_counter() - start:6.2f}s")
+
+start = time.perf_counter()
+pair.rolling_johansen(WINDOW)
+print(f"rolling_johansen                            : "
+      f"{time.perf_counter() - start:6.2f}s")
@@ -0,0 +1,44 @@
+"""
+Times screen_pairs over every pair of a universe of 5 years of prices, in one
+process and split over a process pool, against statsmodels' coint fitted
+pair by pair as cadf_test does.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_screen.py
+"""
+import os
+import time
+from itertools import combinations
+
+import numpy as np
+import statsmodels.tsa.stattools as ts
+
+from radium import PricePanel
+from radium.screen import screen_pairs
+
+SYMBOLS = 200
+DAYS = 1260
+
+rng = np.random.default_rng(0)
+factors = np.cumsum(rng.normal(0, 0.01, (DAYS, 5)), axis=0)
+loadings = rng.normal(1, 0.5, (5, SYMBOLS))
+values = 100 * np.exp(factors @ loadings / 5
+                      + np.cumsum(rng.normal(0, 0.005, (DAYS, SYMBOLS)),
+                                  axis=0))
+dates = np.datetime64('2016-01-01') + np.arange(DAYS)
+panel = PricePanel([f'S{i}' for i in range(SYMBOLS)], dates, values.T)
+n_pairs = SYMBOLS * (SYMBOLS - 1) // 2
+
+# statsmodels on a sample of pairs, scaled up to every pair
+sample = list(combinations(range(SYMBOLS), 2))[::250]
+start = time.perf_counter()
+for i, j in sample:
+    ts.coint(values[:, i], values[:, j])
+reference = (time.perf_counter() - start) * n_pairs / len(sample)
+print(f"{n_pairs} pairs, {DAYS} days, {os.cpu_count()} CPUs")
+print(f"coint pair by pair (estimated): {reference:7.2f}s")
+
+for n_jobs in (1, None):
+    start = time.perf_counter()
+    screen_pairs(panel, n_jobs=n_jobs)
+    elapsed = time.perf_counter() - start
+    print(f"screen_pairs n_jobs={str(n_jobs):<4}: {elapsed:7.2f}s")
@@ -0,0 +1,39 @@
+"""
+Compares fetching from a local stand-in Alpha-vantage server with a new
+connection per request against the shared pooled session.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_session.py
+"""
+import time
+
+import requests
+
+from radium.equity import configure_session
+from _payload import make_payload, serve_payload
+
+SYMBOLS = 200
+DAYS = 100
+
+server = serve_payload(make_payload(DAYS))
+url = "http://%s:%d/query" % server.server_address
+params = {"function": "TIME_SERIES_DAILY_ADJUSTED", "apikey": "demo",
+          "outputsize": "compact"}
+
+# One new connection per request, as before the shared session
+start = time.perf_counter()
+for i in range(SYMBOLS):
+    requests.get(url, params=dict(params, symbol=f"S{i}")).json()
+unpooled = time.perf_counter() - start
+
+# Pooled keep-alive connections, as used by AlphaVantageSource
+session = configure_session()
+start = time.perf_counter()
+for i in range(SYMBOLS):
+    session.get(url, params=dict(params, symbol=f"S{i}"), timeout=5).json()
+pooled = time.perf_counter() - start
+
+print(f"{SYMBOLS} requests of {DAYS} days")
+print(f"new connection per request: {unpooled:.3f}s")
+print(f"shared session: {pooled:.3f}s")
+
+server.shutdown()
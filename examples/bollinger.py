@@ -15,8 +15,8 @@ pair = Pair(equity1, equity2)
 pair.plot_closed()
 
 # Test for cointegration
-cadf_test(pair)
-johansen_test(pair)
+print(cadf_test(pair))
+print(johansen_test(pair))
 
 # Hedge the pair
 pair.hedge('OLS', 30)
@@ -1,2 +1,5 @@
 from radium.equity.equity import Equity
+from radium.equity.universe import load_universe
 from radium.pair.pair import Pair
+from radium.panel.panel import PricePanel
+from radium.basket.basket import Basket
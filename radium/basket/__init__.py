@@ -0,0 +1 @@
+from .basket import Basket
@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+
+from radium import Equity
+from radium.helpers import _align
+from radium.pair._coint import _rolling_blocks, _rolling_trace
+from radium.pair._rolling import _rolling_johansen
+from radium.pair.pair import _check_lookback, _check_step, _read_only
+
+
+class Basket:
+    """
+    Class for a basket of N equities traded as one spread.
+
+    Attributes
+    ----------
+    equities : list of radium.Equity
+    symbols : list of str
+        Symbol of each equity
+    start_date : datetime.date
+    end_date : datetime.date
+    hedge_ratios : float np.ndarray[][]
+        Day-wise hedge ratios with a column per equity
+    price_spread : pd.Series
+        Price spread of equities for self.hedge_ratios
+    align : str
+        Missing data policy prices were aligned by
+    dates : pd.DatetimeIndex
+        Dates of the aligned prices
+    prices : float np.ndarray[][]
+        Aligned closed prices with a column per equity, read-only
+    """
+
+    def __init__(self, equities, align='inner'):
+        """
+        Initialise Basket class
+
+        Closed prices of the equities are aligned once here, as by
+        radium.Pair, and every calculation on the basket reads the aligned
+        prices.
+
+        Parameters
+        ----------
+        equities : list of radium.Equity
+        align : (optional) str
+            Missing data policy, 'inner' keeps only dates every equity has a
+            price for, 'ffill' carries the last price forward over dates an
+            equity has no price for, defaults to 'inner'
+
+        Raises
+        ------
+        TypeError
+            If an equity is not of type radium.Equity.
+            If align isn't a string.
+        ValueError
+            If there are fewer than 2 equities.
+            If the equities do not share any date ranges.
+            If align isn't 'inner' or 'ffill'.
+        """
+
+        equities = list(equities)
+        for equity in equities:
+            if not isinstance(equity, Equity):
+                raise TypeError('equities must be of type radium.Equity')
+
+        if len(equities) < 2:
+            raise ValueError('A basket needs at least 2 equities')
+
+        self.equities = equities
+        self.symbols = [equity.symbol for equity in equities]
+
+        # Dates shared by every equity
+        self.start_date = max(equity.start_date for equity in equities)
+        self.end_date = min(equity.end_date for equity in equities)
+
+        if self.end_date <= self.start_date:
+            raise ValueError('There is no shared date range between the '
+                             'equities')
+
+        self.align = align
+        self._dates, prices = _align([equity.closed for equity in equities],
+                                     align)
+        self._prices = _read_only(prices)
+
+        if len(self._dates) == 0:
+            raise ValueError('equities have no prices on shared dates')
+
+    def hedge(self, method, lookback):
+        """
+        Calculates the hedge_ratios given a method and lookback and stores it
+        in self.hedge_ratios
+
+        Parameters
+        ----------
+        method : str
+            Method for calculating hedge ratios ('JOHANSEN')
+        lookback : int
+            Number of signals to lookback on when calculating hedge ratios
+
+        Raises
+        ------
+        TypeError
+            If method isn't a string.
+            If lookback isn't an integer.
+        ValueError
+            If lookback <= 0.
+            If method isn't available.
+
+        Notes
+        -----
+        'JOHANSEN' weights equities by the first cointegrating vector of a
+        VECM with one lagged difference over each window, scaled to hold one
+        of the first equity. Every window's eigenproblem is solved together
+        from rolling moments, so with two equities this matches
+        radium.Pair.hedge('JOHANSEN', lookback).
+        """
+
+        if not isinstance(method, str):
+            raise TypeError('method must be a string')
+        elif method != 'JOHANSEN':
+            raise ValueError('Available method strings: "JOHANSEN"')
+
+        _check_lookback(lookback)
+
+        hedge_ratios = np.zeros(self._prices.shape)
+
+        if lookback < self._prices.shape[0]:
+            _, eigenvectors, _ = _rolling_johansen(self._prices, lookback)
+            vector = eigenvectors[:, :, 0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weights = vector / vector[:, :1]
+
+            # Ratios of the window ending on a date are stored on that date,
+            # the window ending on the last date is left unused
+            rows = slice(lookback - 1, self._prices.shape[0] - 1)
+            hedge_ratios[rows] = weights[:-1]
+
+        self.hedge_ratios = _read_only(hedge_ratios)
+
+    def rolling_johansen(self, window, step=1, n_jobs=1):
+        """
+        Conducts Johansen Tests over rolling windows
+
+        Parameters
+        ----------
+        window : int
+            Number of signals in each window
+        step : (optional) int
+            Number of signals between the ends of windows, defaults to 1
+        n_jobs : (optional) int or None
+            Number of processes to test blocks of windows in, None uses
+            every CPU, defaults to 1
+
+        Returns
+        -------
+        results : pd.DataFrame
+            Row per window indexed by its last date with columns trace_stat_r
+            for each rank r then eigen_stat_r for each rank r, critical values
+            are those of johansen_test
+
+        Raises
+        ------
+        TypeError
+            If window, step or n_jobs isn't an integer.
+        ValueError
+            If window, step or n_jobs <= 0.
+        """
+
+        _check_lookback(window)
+        _check_step(step)
+
+        ranks = range(len(self.symbols))
+        columns = [f'trace_stat_{r}' for r in ranks] \
+            + [f'eigen_stat_{r}' for r in ranks]
+        dates = self._dates[window - 1::step]
+        if len(dates) == 0:
+            return pd.DataFrame(columns=columns, index=dates)
+
+        trace_stat, eigen_stat = _rolling_blocks(_rolling_trace, self._prices,
+                                                 window, step, n_jobs)
+
+        return pd.DataFrame(np.concatenate([trace_stat, eigen_stat], axis=1),
+                            columns=columns, index=dates)
+
+    @property
+    def hedge_ratios(self):
+        """
+        float np.ndarray[][] : Day-wise hedge ratios with a column per equity
+
+        Setting or deleting hedge ratios discards the spread of the previous
+        ones.
+        """
+
+        if hasattr(self, '_hedge_ratios') == False:
+            raise AttributeError('Basket.hedge_ratios is not defined.')
+
+        return self._hedge_ratios
+
+    @hedge_ratios.setter
+    def hedge_ratios(self, hedge_ratios):
+        if np.shape(hedge_ratios) != self._prices.shape:
+            raise ValueError('hedge_ratios must be of shape (dates, '
+                             'equities)')
+
+        self._hedge_ratios = hedge_ratios
+        if hasattr(self, '_price_spread'):
+            del self._price_spread
+
+    @hedge_ratios.deleter
+    def hedge_ratios(self):
+        if hasattr(self, '_hedge_ratios') == False:
+            raise AttributeError('Basket.hedge_ratios is not defined.')
+
+        del self._hedge_ratios
+        if hasattr(self, '_price_spread'):
+            del self._price_spread
+
+    @property
+    def dates(self):
+        """
+        pd.DatetimeIndex : Dates of the aligned prices
+        """
+
+        return self._dates
+
+    @property
+    def prices(self):
+        """
+        float np.ndarray[][] : Aligned closed prices with a column per
+        equity, read-only
+        """
+
+        return self._prices
+
+    @property
+    def price_spread(self):
+        """
+        pd.Series : Price spread of equities for self.hedge_ratios
+
+        Raises
+        ------
+        Exception
+            If self.hedge_ratios isn't defined.
+
+        Notes
+        -----
+        Spread calculated using y = h1*y1 + ... + hN*yN, one product of each
+        date's hedge ratios and prices.
+        """
+
+        if hasattr(self, '_hedge_ratios') == False:
+            raise Exception('Basket.hedge_ratios is not defined.')
+
+        if hasattr(self, '_price_spread') == False:
+            price_spread = np.einsum('ij,ij->i', self._hedge_ratios,
+                                     self._prices)
+            self._price_spread = pd.Series(price_spread, index=self._dates)
+
+        return self._price_spread
+
+    def __len__(self):
+        return len(self.equities)
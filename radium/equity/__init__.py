@@ -1 +1,5 @@
-
+from .cache import PriceCache
+from .source import DataSource, AlphaVantageSource, DirectorySource, \
+    ArraySource, configure_session
+from .store import SymbolStore, configure_store
+from .universe import TokenBucket, load_universe, prefetch_equities
@@ -0,0 +1,168 @@
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class PriceCache:
+    """
+    On-disk cache of daily equity signals, one compressed .npz file per symbol.
+
+    Attributes
+    ----------
+    directory : pathlib.Path
+        Directory cache files are stored in
+    ttl : datetime.timedelta
+        Age after which a cached entry is considered stale
+    """
+
+    def __init__(self, directory, ttl=timedelta(hours=12)):
+        """
+        Initialises PriceCache class
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            Directory to store cache files in, created if it does not exist
+        ttl : (optional) datetime.timedelta or numeric
+            Age after which an entry is refreshed, numerics are taken as
+            seconds, defaults to 12 hours
+
+        Raises
+        ------
+        TypeError
+            If ttl is not a timedelta or numeric.
+        ValueError
+            If ttl is negative.
+        """
+
+        if isinstance(ttl, (int, float)) and not isinstance(ttl, bool):
+            ttl = timedelta(seconds=ttl)
+        elif not isinstance(ttl, timedelta):
+            raise TypeError('ttl must be a timedelta or number of seconds')
+
+        if ttl.total_seconds() < 0:
+            raise ValueError('ttl must be >= 0')
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def path(self, symbol):
+        """
+        Path of the cache file for a symbol
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        path : pathlib.Path
+        """
+
+        return self.directory / f"{symbol.upper()}.npz"
+
+    def load(self, symbol):
+        """
+        Loads the cached daily signals of a symbol
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : tuple of (pd.DataFrame, float) or None
+            Daily signals with date as index and the unix time they were
+            fetched at, None if the symbol is not cached
+        """
+
+        path = self.path(symbol)
+        if not path.exists():
+            return None
+
+        with np.load(path, allow_pickle=False) as npz:
+            dates = npz["dates"]
+            values = npz["values"]
+            columns = list(npz["columns"])
+            fetched_at = float(npz["fetched_at"])
+
+        df = pd.DataFrame(values, index=pd.DatetimeIndex(dates),
+                          columns=columns)
+
+        return df, fetched_at
+
+    def save(self, symbol, df, fetched_at=None):
+        """
+        Saves daily signals of a symbol, replacing any existing entry
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+        df : pd.DataFrame
+            Daily signals with date as index
+        fetched_at : (optional) float
+            Unix time the signals were fetched at, defaults to now
+        """
+
+        if fetched_at is None:
+            fetched_at = time.time()
+
+        dates = np.array(df.index, dtype="datetime64[D]")
+        values = df.to_numpy(dtype=np.float64)
+        columns = np.array(df.columns, dtype=str)
+
+        # Write to a temporary file first so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez_compressed(file, dates=dates, values=values,
+                                    columns=columns,
+                                    fetched_at=np.float64(fetched_at))
+            os.replace(tmp_path, self.path(symbol))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def is_stale(self, fetched_at):
+        """
+        Whether an entry fetched at a given time has outlived the ttl
+
+        Parameters
+        ----------
+        fetched_at : float
+            Unix time the entry was fetched at
+
+        Returns
+        -------
+        ret : bool
+        """
+
+        return time.time() - fetched_at > self.ttl.total_seconds()
+
+    def clear(self, symbol=None):
+        """
+        Removes cached entries
+
+        Parameters
+        ----------
+        symbol : (optional) str
+            Symbol to remove, defaults to removing every entry
+        """
+
+        if symbol is not None:
+            paths = [self.path(symbol)]
+        else:
+            paths = self.directory.glob("*.npz")
+
+        for path in paths:
+            if path.exists():
+                path.unlink()
@@ -2,8 +2,9 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import pandas as pd
-import requests
 from radium.helpers import _convert_date
+from .source import DataSource, AlphaVantageSource
+from .store import _get_store
 
 
 class Equity:
@@ -13,7 +14,7 @@ class Equity:
     Attributes
     ----------
     data : pd.DataFrame
-        Contains all daily signals with date as index
+        Contains all daily signals with a DatetimeIndex
     high : pd.Series
         Contains daily high prices with date as index
     low : pd.Series
@@ -28,11 +29,14 @@ class Equity:
         First date of interest
     end_date : datetime.date
         Last date of interest
-    key : str
+    key : str or None
         Alpha-vantage API key
+    source : radium.equity.DataSource
+        Source daily signals are read from
     """
 
-    def __init__(self, symbol, start_date, end_date, key):
+    def __init__(self, symbol, start_date, end_date, key=None, cache=None,
+                 source=None, lazy=False):
         """
         Initialises equity class
 
@@ -44,13 +48,26 @@ class Equity:
             First date of interest in YYYY-MM-DD form
         end_date : str of datetime or datetime.date
             Last date of interest in YYYY-MM-DD form
-        key : str
-            Alpha-vantage API key
+        key : (optional) str
+            Alpha-vantage API key, required if source is not given
+        cache : (optional) radium.equity.PriceCache
+            On-disk cache to read Alpha-vantage signals from, stale entries
+            are refreshed with only the most recent signals
+        source : (optional) radium.equity.DataSource
+            Source to read daily signals from, defaults to Alpha-vantage
+        lazy : (optional) bool
+            If True signals are only fetched when first accessed or when
+            prefetch is called, defaults to False
 
         Raises
         ------
+        TypeError
+            API Key is not a string
+            Cache is not a radium.equity.PriceCache
+            Source is not a radium.equity.DataSource
         ValueError
             API Key is invalid
+            Both source and key or cache given
             Equity symbol does not exist
             End date is same as or before start date
         RuntimeError
@@ -65,45 +82,103 @@ class Equity:
         if end_date <= start_date:
             raise ValueError("end_date is the same as or before start_date")
 
-        # Raises error if key is empty string
-        if len(key) == 0:
-            raise ValueError("Invalid API Key")
+        # Default to Alpha-vantage when no source given
+        if source is None:
+            if key is None:
+                raise ValueError("Invalid API Key")
+            source = AlphaVantageSource(key, cache)
+        elif not isinstance(source, DataSource):
+            raise TypeError("source must be of type radium.equity.DataSource")
+        elif key is not None or cache is not None:
+            raise ValueError("key and cache can't be used with a source")
 
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
         self.key = key
+        self.source = source
 
-        # Fetch all data
-        df = self._daily()
+        if not lazy:
+            self.prefetch()
+
+    @property
+    def data(self):
+        """
+        pd.DataFrame : Contains all daily signals with a DatetimeIndex
+        """
+
+        # Fetch data if undefined
+        if hasattr(self, '_data') == False:
+            self.prefetch()
+
+        return self._data
+
+    @property
+    def high(self):
+        """
+        pd.Series : Contains daily high prices with date as index
+        """
+
+        return self.data["2. high"]
+
+    @property
+    def low(self):
+        """
+        pd.Series : Contains daily low prices with date as index
+        """
+
+        return self.data["3. low"]
+
+    @property
+    def open(self):
+        """
+        pd.Series : Contains daily open prices with date as index
+        """
+
+        return self.data["1. open"]
+
+    @property
+    def closed(self):
+        """
+        pd.Series : Contains daily adjusted closed prices with date as index
+        """
 
-        # Get dates of interest only
-        mask = (df.index >= start_date) & (df.index <= end_date)
-        df = df.loc[mask]
+        return self.data["5. adjusted close"]
 
-        # Sort date earliest first
-        df.sort_index(inplace=True)
+    def prefetch(self):
+        """
+        Fetches daily signals between the equity dates if not already fetched
 
-        # Set data attribute
-        self.data = df
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        RuntimeError
+            API Call limit reached
+        """
 
-        # Set each possible price type
-        self.high = df["2. high"]
-        self.low = df["3. low"]
-        self.open = df["1. open"]
-        self.closed = df["5. adjusted close"]
+        if hasattr(self, '_data'):
+            return
+
+        # Fetch all data, sorted date earliest first
+        df = self._daily()
+
+        # Get dates of interest only, as a view of the shared data
+        self._data = df.iloc[_date_slice(df.index, self.start_date,
+                                         self.end_date)]
 
     def _daily(self):
         """
-        Gets all available daily signals from an equity between two dates
+        Gets all available daily signals of the equity from self.source
 
-        Contains open, high, low, close, adjusted close, volume, dividend
-        amount, split coefficient, for each day/
+        Signals are held in the process-wide symbol store, unless the source
+        opts out, so the history of a symbol is only fetched once and shared
+        by all of its equities.
 
         Returns
         -------
-        ret : pd.DataFrame Dataframe containing daily signal
-        information with date as an index, sorted most recent first.
+        ret : pd.DataFrame Read-only dataframe containing daily signal
+        information with date as an index, sorted earliest first.
 
         Raises
         ------
@@ -113,39 +188,53 @@ class Equity:
             API Call limit reached
         """
 
-        # Get signals in JSON form
-        url = f"https://www.alphavantage.co/query?function" \
-              f"=TIME_SERIES_DAILY_ADJUSTED&symbol={self.symbol}" \
-              f"&apikey={self.key}" \
-              f"&outputsize=full"
-        json = requests.get(url).json()
-
-        # Extract signals
-        try:
-            # If correct data present place time series into list
-            daily_json = json["Time Series (Daily)"]
-        except KeyError:
-            # Test whether an error message is recieved
-            try:
-                # If error message received from API, incorrect symbol used
-                error_json = json["Error Message"]
-                raise ValueError("Equity Symbol does not exist")
-            except KeyError:
-                # Otherwise call limit reached
-                raise RuntimeError(
-                    "API call limit reached, try again in 1 minute.")
-
-        df = pd.DataFrame(daily_json).T
-
-        # Format data as numerical
-        columns = list(df.columns)
-        for col in columns:
-            df[col] = pd.to_numeric(df[col])
-
-        # Format index as a date
-        df.index = pd.to_datetime(df.index).date
-
-        return df
+        if not self.source.memoize:
+            return self.source.daily(self.symbol)
+
+        return _get_store().daily(self.source, self.symbol)
+
+    def window(self, start_date=None, end_date=None):
+        """
+        Gets daily signals between two dates inclusive
+
+        Dates are found by binary search and the returned dataframe is a view
+        of self.data rather than a copy.
+
+        Parameters
+        ----------
+        start_date : (optional) str or datetime or datetime.date
+            First date in YYYY-MM-DD form, defaults to equity start date
+        end_date : (optional) str of datetime or datetime.date
+            Last date in YYYY-MM-DD form, defaults to equity end date
+
+        Returns
+        -------
+        ret : pd.DataFrame
+            Daily signals between the dates with date as index
+
+        Raises
+        ------
+        ValueError
+            End date is before start date
+        """
+
+        # If no start/end date specified use default
+        if start_date is None:
+            start_date = self.start_date
+        else:
+            start_date = _convert_date(start_date)
+
+        if end_date is None:
+            end_date = self.end_date
+        else:
+            end_date = _convert_date(end_date)
+
+        # Raises error if date range invalid
+        if end_date < start_date:
+            raise ValueError("end_date is before start_date")
+
+        return self.data.iloc[_date_slice(self.data.index, start_date,
+                                          end_date)]
 
     def plot(self, start_date=None, end_date=None):
         """
@@ -180,9 +269,7 @@ class Equity:
             raise ValueError("end_date is the same as or before start_date")
 
         # Gets required range only
-        closed = self.closed
-        mask = (closed.index >= start_date) & (closed.index <= end_date)
-        closed = closed.loc[mask]
+        closed = self.window(start_date, end_date)["5. adjusted close"]
 
         fig, ax = plt.subplots()
         ax.plot(closed)
@@ -197,3 +284,28 @@ class Equity:
 
         plt.grid()
         plt.show()
+
+
+def _date_slice(index, start_date, end_date):
+    """
+    Finds positions of dates between two dates inclusive by binary search
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        Dates sorted earliest first
+    start_date : datetime.date
+        First date of interest
+    end_date : datetime.date
+        Last date of interest
+
+    Returns
+    -------
+    ret : slice
+        Positions of dates of interest in index
+    """
+
+    start = index.searchsorted(pd.Timestamp(start_date), side="left")
+    end = index.searchsorted(pd.Timestamp(end_date), side="right")
+
+    return slice(start, end)
@@ -0,0 +1,690 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import PriceCache
+from .store import _get_store
+
+# Columns of daily signals, named as returned by Alpha-vantage
+COLUMNS = ["1. open", "2. high", "3. low", "4. close", "5. adjusted close",
+           "6. volume", "7. dividend amount", "8. split coefficient"]
+
+URL = "https://www.alphavantage.co/query"
+
+# Shared session and timeouts used for Alpha-vantage requests
+_session = None
+_timeout = None
+
+
+def configure_session(pool_size=10, retries=3, backoff_factor=0.5,
+                      timeout=(5, 30)):
+    """
+    Configures the HTTP session shared by Alpha-vantage sources
+
+    Connections are kept alive and pooled between requests, responses are
+    gzip compressed and failed connections or server errors are retried.
+
+    Parameters
+    ----------
+    pool_size : (optional) int
+        Maximum number of connections kept open, defaults to 10
+    retries : (optional) int
+        Times a failed request is retried, defaults to 3
+    backoff_factor : (optional) float
+        Seconds waited before retrying grow as backoff_factor * 2 ** retry,
+        defaults to 0.5
+    timeout : (optional) float or tuple of (float, float)
+        Seconds waited to connect and between bytes read, defaults to (5, 30)
+
+    Returns
+    -------
+    session : requests.Session
+        The shared session
+
+    Raises
+    ------
+    TypeError
+        If pool_size or retries isn't an integer.
+    ValueError
+        If pool_size <= 0 or retries < 0.
+    """
+
+    global _session, _timeout
+
+    if not isinstance(pool_size, int):
+        raise TypeError('pool_size must be an integer')
+    elif pool_size <= 0:
+        raise ValueError('pool_size must be > 0')
+
+    if not isinstance(retries, int):
+        raise TypeError('retries must be an integer')
+    elif retries < 0:
+        raise ValueError('retries must be >= 0')
+
+    # Retry dropped connections and transient server errors
+    retry = Retry(total=retries, backoff_factor=backoff_factor,
+                  status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate",
+                            "Connection": "keep-alive"})
+
+    # Close connections of the session being replaced
+    if _session is not None:
+        _session.close()
+
+    _session = session
+    _timeout = timeout
+
+    return session
+
+
+def _parse_daily(daily_json):
+    """
+    Parses the daily time series of an Alpha-vantage payload in one pass
+
+    Parameters
+    ----------
+    daily_json : dict
+        "Time Series (Daily)" of the payload, mapping dates to signals
+
+    Returns
+    -------
+    dates : datetime64[D] np.ndarray[]
+        Date of each signal in payload order
+    values : float np.ndarray[][]
+        Contiguous signals with a row per date and a column per signal
+    columns : list of str
+        Name of each signal column
+    """
+
+    # Signal names are the same for every date
+    columns = list(next(iter(daily_json.values()), COLUMNS))
+
+    # ISO date strings and numeric strings are converted by numpy in C
+    dates = np.array(list(daily_json), dtype="datetime64[D]")
+    values = np.array([row[column] for row in daily_json.values()
+                       for column in columns], dtype=np.float64)
+    values = values.reshape(len(dates), len(columns))
+
+    return dates, values, columns
+
+
+def _adjust(df):
+    """
+    Computes adjusted closed prices from raw closes, dividends and splits
+
+    Each dividend or split multiplies the adjusted close of every earlier day
+    by (1 - dividend / previous close) / split coefficient.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Daily signals with date as index, sorted earliest first
+
+    Returns
+    -------
+    ret : pd.DataFrame
+        Copy of daily signals with the adjusted close column recomputed
+    """
+
+    close = df["4. close"].to_numpy(dtype=np.float64)
+    dividend = df["7. dividend amount"].to_numpy(dtype=np.float64)
+    split = df["8. split coefficient"].to_numpy(dtype=np.float64)
+
+    # Factor of each day's events, the first day has no previous close
+    factors = np.ones(close.shape[0])
+    factors[1:] = (1 - dividend[1:] / close[:-1]) / split[1:]
+
+    # Days are adjusted by the product of all later days' factors
+    cumulative = np.ones(close.shape[0])
+    cumulative[:-1] = np.cumprod(factors[:0:-1])[::-1]
+
+    df = df.copy()
+    df["5. adjusted close"] = close * cumulative
+
+    return df
+
+
+def _get_session():
+    """
+    Gets the shared HTTP session, configuring it with defaults if needed
+
+    Returns
+    -------
+    session : requests.Session
+    """
+
+    if _session is None:
+        configure_session()
+
+    return _session
+
+
+class DataSource:
+    """
+    Base class for sources of daily equity signals.
+
+    Subclasses implement daily, returning a dataframe of all available daily
+    signals for a symbol with a DatetimeIndex sorted earliest first and
+    COLUMNS as columns.
+
+    Attributes
+    ----------
+    memoize : bool
+        Whether equities hold signals of this source in the symbol store,
+        False for sources whose signals are already shared in memory
+    """
+
+    memoize = True
+
+    def daily(self, symbol):
+        """
+        Gets all available daily signals of an equity
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        """
+
+        raise NotImplementedError
+
+    def is_stale(self, fetched_at):
+        """
+        Whether signals fetched at a given time should be fetched again
+
+        Parameters
+        ----------
+        fetched_at : float
+            Unix time the signals were fetched at
+
+        Returns
+        -------
+        ret : bool
+            False unless overridden, the signals never change
+        """
+
+        return False
+
+
+class AlphaVantageSource(DataSource):
+    """
+    Daily equity signals from the Alpha-vantage API.
+
+    Attributes
+    ----------
+    key : str
+        Alpha-vantage API key
+    cache : radium.equity.PriceCache or None
+        On-disk cache signals are read from before calling the API
+    limiter : radium.equity.TokenBucket or None
+        Limits how often the API is called
+    url : str
+        Address of the Alpha-vantage query endpoint
+    adjust : str
+        'api' to use adjusted closes from the API, 'local' to compute them
+        from raw closes, dividends and splits
+    """
+
+    def __init__(self, key, cache=None, limiter=None, url=URL, adjust=None):
+        """
+        Initialises AlphaVantageSource class
+
+        Parameters
+        ----------
+        key : str
+            Alpha-vantage API key
+        cache : (optional) radium.equity.PriceCache
+            On-disk cache to read signals from, stale entries are refreshed
+            with only the most recent signals
+        limiter : (optional) radium.equity.TokenBucket
+            Token bucket acquired before every API call, may be shared
+            between sources using the same key
+        url : (optional) str
+            Address of the Alpha-vantage query endpoint, defaults to URL
+        adjust : (optional) str
+            'api' to use adjusted closes from the API, 'local' to compute them
+            from raw closes, dividends and splits. Defaults to 'local' with a
+            cache, which must be used so refreshes need only the latest
+            signals, and 'api' otherwise
+
+        Raises
+        ------
+        TypeError
+            Key is not a string
+            Cache is not a radium.equity.PriceCache
+        ValueError
+            API Key is invalid
+            Adjust isn't available or is 'api' with a cache
+        """
+
+        # Raises error if key is empty string
+        if not isinstance(key, str):
+            raise TypeError("key must be a string")
+        elif len(key) == 0:
+            raise ValueError("Invalid API Key")
+
+        if cache is not None and not isinstance(cache, PriceCache):
+            raise TypeError("cache must be of type radium.equity.PriceCache")
+
+        if adjust is None:
+            adjust = 'api' if cache is None else 'local'
+
+        if adjust not in ('api', 'local'):
+            raise ValueError('Available adjust strings: "api", "local"')
+        elif adjust == 'api' and cache is not None:
+            raise ValueError('adjust must be "local" when using a cache')
+
+        self.key = key
+        self.cache = cache
+        self.limiter = limiter
+        self.url = url
+        self.adjust = adjust
+
+    def _identity(self):
+        """
+        Values which determine the signals returned by the source
+
+        Returns
+        -------
+        identity : tuple
+            API key, url, adjust and resolved cache directory
+        """
+
+        directory = None
+        if self.cache is not None:
+            directory = str(self.cache.directory.resolve())
+
+        return (self.key, self.url, self.adjust, directory)
+
+    def __eq__(self, other):
+        # Sources returning the same signals share symbol store entries
+        if not isinstance(other, AlphaVantageSource):
+            return NotImplemented
+
+        return self._identity() == other._identity()
+
+    def __hash__(self):
+        return hash(self._identity())
+
+    def is_stale(self, fetched_at):
+        """
+        Whether signals fetched at a given time have outlived the cache ttl
+
+        Parameters
+        ----------
+        fetched_at : float
+            Unix time the signals were fetched at
+
+        Returns
+        -------
+        ret : bool
+            False without a cache
+        """
+
+        return self.cache is not None and self.cache.is_stale(fetched_at)
+
+    def daily(self, symbol):
+        """
+        Gets all available daily signals of an equity
+
+        Contains open, high, low, close, adjusted close, volume, dividend
+        amount, split coefficient, for each day.
+
+        If a cache is set, fresh entries are returned without calling the API
+        and stale entries are refreshed with only the most recent signals,
+        adjusting the cached history locally for any new dividends or splits.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        RuntimeError
+            API Call limit reached
+        """
+
+        if self.cache is None:
+            df = self._request(symbol, "full")
+            if self.adjust == 'local':
+                df = _adjust(df)
+            return df
+
+        entry = self.cache.load(symbol)
+
+        # Nothing cached so full history is needed
+        if entry is None:
+            df = _adjust(self._request(symbol, "full"))
+            self.cache.save(symbol, df)
+            return df
+
+        df, fetched_at = entry
+        if not self.cache.is_stale(fetched_at):
+            return df
+
+        # Refresh stale entry with the latest signals only
+        tail = self._request(symbol, "compact")
+        merged = self._merge(df, tail)
+
+        # Tail could not be merged so fall back to the full history
+        if merged is None:
+            merged = self._request(symbol, "full")
+
+        # Re-adjust the history for dividends or splits in the tail
+        merged = _adjust(merged)
+        self.cache.save(symbol, merged)
+
+        return merged
+
+    def _request(self, symbol, outputsize):
+        """
+        Requests daily signals from the Alpha-vantage API
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+        outputsize : str
+            'full' for the entire history, 'compact' for the latest 100 days
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        RuntimeError
+            API Call limit reached
+        requests.RequestException
+            Request failed or timed out after all retries
+        """
+
+        # Wait for the call quota if limited
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+        # Get signals in JSON form over the shared session
+        params = {"function": "TIME_SERIES_DAILY_ADJUSTED",
+                  "symbol": symbol,
+                  "apikey": self.key,
+                  "outputsize": outputsize}
+        json = _get_session().get(self.url, params=params,
+                                  timeout=_timeout).json()
+
+        # Extract signals
+        try:
+            # If correct data present place time series into list
+            daily_json = json["Time Series (Daily)"]
+        except KeyError:
+            # Test whether an error message is recieved
+            try:
+                # If error message received from API, incorrect symbol used
+                error_json = json["Error Message"]
+                raise ValueError("Equity Symbol does not exist")
+            except KeyError:
+                # Otherwise call limit reached
+                raise RuntimeError(
+                    "API call limit reached, try again in 1 minute.")
+
+        dates, values, columns = _parse_daily(daily_json)
+
+        # Sort earliest first, the API returns most recent first
+        order = np.argsort(dates, kind="stable")
+        df = pd.DataFrame(values[order], index=pd.DatetimeIndex(dates[order]),
+                          columns=columns)
+
+        return df
+
+    @staticmethod
+    def _merge(df, tail):
+        """
+        Merges the latest signals into a previously fetched history
+
+        Signals of the tail replace those of the history on the same date.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Previously fetched daily signals with date as index
+        tail : pd.DataFrame
+            Latest daily signals with date as index
+
+        Returns
+        -------
+        ret : pd.DataFrame or None
+            Merged signals sorted earliest first, None if the tail does not
+            overlap the history so signals may be missing between them
+        """
+
+        overlap = df.index.intersection(tail.index)
+        if len(overlap) == 0:
+            return None
+
+        merged = pd.concat([df[~df.index.isin(tail.index)], tail])
+        merged.sort_index(inplace=True)
+
+        return merged
+
+
+class DirectorySource(DataSource):
+    """
+    Daily equity signals from a directory of files, one file per symbol.
+
+    Files are named {symbol}.csv or {symbol}.parquet with dates as the first
+    column. Columns may be named as in COLUMNS ('5. adjusted close') or
+    without their number prefix ('adjusted close').
+
+    Attributes
+    ----------
+    directory : pathlib.Path
+        Directory containing the files
+    fmt : str
+        File format, 'csv' or 'parquet'
+    """
+
+    def __init__(self, directory, fmt='csv'):
+        """
+        Initialises DirectorySource class
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            Directory containing the files
+        fmt : (optional) str
+            File format, 'csv' or 'parquet', defaults to 'csv'
+
+        Raises
+        ------
+        ValueError
+            If directory does not exist.
+            If fmt isn't available.
+        """
+
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError('Available fmt strings: "csv", "parquet"')
+
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise ValueError(f"{directory} is not a directory")
+
+        self.directory = directory
+        self.fmt = fmt
+
+    def daily(self, symbol):
+        """
+        Gets all available daily signals of an equity
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+            File is missing a column
+        """
+
+        path = self.directory / f"{symbol}.{self.fmt}"
+        if not path.exists():
+            raise ValueError("Equity Symbol does not exist")
+
+        if self.fmt == 'csv':
+            df = pd.read_csv(path, index_col=0)
+        else:
+            df = pd.read_parquet(path)
+
+        # Accept column names with or without their number prefix
+        names = {column.split(". ", 1)[1]: column for column in COLUMNS}
+        df.columns = [names.get(str(column).lower(), column)
+                      for column in df.columns]
+
+        missing = [column for column in COLUMNS if column not in df.columns]
+        if len(missing) > 0:
+            raise ValueError(f"{path} is missing columns {missing}")
+
+        df = df[COLUMNS].astype(np.float64)
+
+        # Format index as dates sorted earliest first
+        df.index = pd.to_datetime(df.index)
+        df.sort_index(inplace=True)
+
+        return df
+
+
+class ArraySource(DataSource):
+    """
+    Daily equity signals held in memory as arrays.
+
+    Attributes
+    ----------
+    frames : dict of str to pd.DataFrame
+        Daily signals of each added symbol with date as index
+    """
+
+    def __init__(self):
+        """
+        Initialises ArraySource class
+        """
+
+        self.frames = {}
+
+    def add(self, symbol, dates, closed, open=None, high=None, low=None,
+            volume=None):
+        """
+        Adds daily signals of an equity
+
+        Signals not given default to the closed price, or zero volume. Closed
+        prices are taken as already adjusted.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+        dates : array-like of str or datetime or datetime.date
+            Date of each signal
+        closed : float array-like
+            Adjusted closed prices
+        open : (optional) float array-like
+            Open prices
+        high : (optional) float array-like
+            High prices
+        low : (optional) float array-like
+            Low prices
+        volume : (optional) float array-like
+            Volumes traded
+
+        Raises
+        ------
+        ValueError
+            If signals are not the same length as dates.
+        """
+
+        dates = pd.to_datetime(pd.Index(dates))
+        closed = np.asarray(closed, dtype=np.float64)
+
+        signals = [open, high, low, closed, closed, volume]
+        defaults = [closed, closed, closed, closed, closed, 0.0]
+
+        values = np.zeros((len(dates), len(COLUMNS)))
+        for i, (signal, default) in enumerate(zip(signals, defaults)):
+            signal = default if signal is None else signal
+            signal = np.asarray(signal, dtype=np.float64)
+
+            if signal.ndim > 0 and signal.shape[0] != len(dates):
+                raise ValueError("signals must be the same length as dates")
+
+            values[:, i] = signal
+
+        # No dividends or splits as closed prices are already adjusted
+        values[:, 7] = 1
+
+        df = pd.DataFrame(values, index=dates, columns=COLUMNS)
+        df.sort_index(inplace=True)
+
+        self.frames[symbol] = df
+
+        # Equities read the new signals rather than a held history
+        _get_store().clear(symbol, self)
+
+    def daily(self, symbol):
+        """
+        Gets all available daily signals of an equity
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        """
+
+        try:
+            return self.frames[symbol]
+        except KeyError:
+            raise ValueError("Equity Symbol does not exist")
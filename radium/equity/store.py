@@ -0,0 +1,222 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from radium.helpers import _LRUCache
+
+
+class SymbolStore:
+    """
+    In-process store of the full daily signal history of each symbol.
+
+    Each history is fetched once per equal source and held as a read-only
+    dataframe, so every equity of a symbol views the same arrays. Least
+    recently used histories are evicted to keep within a memory budget.
+    Histories are fetched again once the source reports them stale, e.g.
+    past the ttl of an Alpha-vantage source's cache, and are otherwise kept
+    until evicted or cleared.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Memory budget for the histories held
+    """
+
+    def __init__(self, max_bytes=512 * 2 ** 20):
+        """
+        Initialises SymbolStore class
+
+        Parameters
+        ----------
+        max_bytes : (optional) int
+            Memory budget for the histories held, defaults to 512MiB
+
+        Raises
+        ------
+        TypeError
+            If max_bytes isn't an integer.
+        ValueError
+            If max_bytes < 0.
+        """
+
+        if not isinstance(max_bytes, int):
+            raise TypeError('max_bytes must be an integer')
+        elif max_bytes < 0:
+            raise ValueError('max_bytes must be >= 0')
+
+        self.max_bytes = max_bytes
+
+        self._cache = _LRUCache(max_bytes, sizeof=_entry_nbytes)
+        self._lock = threading.Lock()
+        self._fetching = {}
+
+    def daily(self, source, symbol):
+        """
+        Gets all available daily signals of an equity, fetching them once
+
+        Parameters
+        ----------
+        source : radium.equity.DataSource
+            Source to fetch the signals from if not held
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Read-only dataframe containing daily signal
+        information with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        RuntimeError
+            API Call limit reached
+        """
+
+        key = (source, symbol)
+
+        entry = self._cache.get(key)
+        if entry is not None and not source.is_stale(entry[1]):
+            return entry[0]
+
+        # Only one thread fetches a symbol, others wait for its result
+        with self._lock:
+            lock = self._fetching.setdefault(key, threading.Lock())
+
+        # Lock is dropped even if the fetch raises, so it isn't left behind
+        try:
+            with lock:
+                entry = self._cache.get(key)
+                if entry is None or source.is_stale(entry[1]):
+                    fetched_at = time.time()
+                    entry = (_freeze(source.daily(symbol)), fetched_at)
+                    self._cache.put(key, entry)
+        finally:
+            with self._lock:
+                self._fetching.pop(key, None)
+
+        return entry[0]
+
+    @property
+    def nbytes(self):
+        """
+        int : Memory used by the histories held
+        """
+
+        return self._cache.total
+
+    def clear(self, symbol=None, source=None):
+        """
+        Removes held histories
+
+        Parameters
+        ----------
+        symbol : (optional) str
+            Symbol to remove, defaults to removing all
+        source : (optional) radium.equity.DataSource
+            Source to remove the symbol of, defaults to every source
+        """
+
+        if symbol is None:
+            self._cache.clear()
+            return
+
+        for key in self._cache.keys():
+            if key[1] == symbol and (source is None or key[0] == source):
+                self._cache.pop(key)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __len__(self):
+        return len(self._cache)
+
+
+# Store shared by every equity in the process
+_store = None
+
+
+def configure_store(max_bytes=512 * 2 ** 20):
+    """
+    Configures the symbol store shared by every equity in the process
+
+    Parameters
+    ----------
+    max_bytes : (optional) int
+        Memory budget for the histories held, 0 disables the store, defaults
+        to 512MiB
+
+    Returns
+    -------
+    store : radium.equity.SymbolStore
+        The shared store
+    """
+
+    global _store
+
+    _store = SymbolStore(max_bytes)
+
+    return _store
+
+
+def _get_store():
+    """
+    Gets the shared symbol store, configuring it with defaults if needed
+
+    Returns
+    -------
+    store : radium.equity.SymbolStore
+    """
+
+    if _store is None:
+        configure_store()
+
+    return _store
+
+
+def _freeze(df):
+    """
+    Converts daily signals to a sorted dataframe over one read-only array
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Daily signals with date as index
+
+    Returns
+    -------
+    ret : pd.DataFrame
+    """
+
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    # Copies only if signals aren't already one contiguous float64 block
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+    values = values.view()
+    values.flags.writeable = False
+
+    return pd.DataFrame(values, index=df.index, columns=df.columns,
+                        copy=False)
+
+
+def _entry_nbytes(entry):
+    """
+    Memory used by a held history's values and index
+
+    Parameters
+    ----------
+    entry : tuple of (pd.DataFrame, float)
+        History and the unix time it was fetched at
+
+    Returns
+    -------
+    ret : int
+    """
+
+    df = entry[0]
+
+    return int(df.to_numpy().nbytes + df.index.nbytes)
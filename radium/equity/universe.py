@@ -0,0 +1,228 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .equity import Equity
+from .source import AlphaVantageSource
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how often calls can be made.
+
+    Attributes
+    ----------
+    rate : float
+        Tokens added per second
+    capacity : float
+        Maximum number of tokens held, i.e. the largest burst of calls
+    """
+
+    def __init__(self, calls_per_minute, burst=None):
+        """
+        Initialises TokenBucket class
+
+        Parameters
+        ----------
+        calls_per_minute : numeric
+            Sustained number of calls allowed per minute
+        burst : (optional) numeric
+            Largest number of calls allowed at once, defaults to
+            calls_per_minute
+
+        Raises
+        ------
+        ValueError
+            If calls_per_minute or burst <= 0.
+        """
+
+        if burst is None:
+            burst = calls_per_minute
+
+        if calls_per_minute <= 0:
+            raise ValueError('calls_per_minute must be > 0')
+        elif burst <= 0:
+            raise ValueError('burst must be > 0')
+
+        self.rate = calls_per_minute / 60
+        self.capacity = burst
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a call is allowed then takes a token for it
+        """
+
+        while True:
+            with self._lock:
+                # Refill tokens for the time passed since the last call
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens
+                                   + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def load_universe(symbols, start_date, end_date, key=None, cache=None,
+                  source=None, calls_per_minute=5, max_workers=4, retries=3,
+                  backoff=20.0, errors='raise'):
+    """
+    Loads equities for many symbols concurrently within an API call quota.
+
+    Parameters
+    ----------
+    symbols : list of str
+        Symbols for equities as found on exchange
+    start_date : str or datetime or datetime.date
+        First date of interest in YYYY-MM-DD form
+    end_date : str of datetime or datetime.date
+        Last date of interest in YYYY-MM-DD form
+    key : (optional) str
+        Alpha-vantage API key, required if source is not given
+    cache : (optional) radium.equity.PriceCache
+        On-disk cache to read Alpha-vantage signals from
+    source : (optional) radium.equity.DataSource
+        Source to read daily signals from, defaults to Alpha-vantage
+    calls_per_minute : (optional) numeric
+        API calls allowed per minute by the key, defaults to 5. Only used when
+        source is not given
+    max_workers : (optional) int
+        Number of equities loaded at once, defaults to 4
+    retries : (optional) int
+        Times a symbol is retried after the API call limit is reached or a
+        request fails, defaults to 3
+    backoff : (optional) float
+        Seconds waited before the first retry, doubled after each retry,
+        defaults to 20
+    errors : (optional) str
+        'raise' to raise the first error, 'skip' to leave symbols which fail
+        out of the result, defaults to 'raise'
+
+    Returns
+    -------
+    equities : dict of str to radium.Equity
+        Equity of each loaded symbol, in the order of symbols
+
+    Raises
+    ------
+    TypeError
+        If max_workers or retries isn't an integer.
+    ValueError
+        API Key is invalid
+        If max_workers <= 0 or retries < 0.
+        If errors isn't available.
+        Equity symbol does not exist (errors='raise')
+    RuntimeError
+        API Call limit still reached after all retries (errors='raise')
+    """
+
+    # Share one rate limited source between all workers
+    if source is None:
+        if key is None:
+            raise ValueError("Invalid API Key")
+        source = AlphaVantageSource(key, cache,
+                                    limiter=TokenBucket(calls_per_minute))
+    elif key is not None or cache is not None:
+        raise ValueError("key and cache can't be used with a source")
+
+    equities = [Equity(symbol, start_date, end_date, source=source, lazy=True)
+                for symbol in symbols]
+    equities = prefetch_equities(equities, max_workers, retries, backoff,
+                                 errors)
+
+    return {equity.symbol: equity for equity in equities}
+
+
+def prefetch_equities(equities, max_workers=4, retries=3, backoff=20.0,
+                      errors='raise'):
+    """
+    Fetches signals of lazy equities concurrently.
+
+    Parameters
+    ----------
+    equities : list of radium.Equity
+        Equities to fetch signals of, equities already fetched are skipped
+    max_workers : (optional) int
+        Number of equities fetched at once, defaults to 4
+    retries : (optional) int
+        Times an equity is retried after the API call limit is reached or a
+        request fails, defaults to 3
+    backoff : (optional) float
+        Seconds waited before the first retry, doubled after each retry,
+        defaults to 20
+    errors : (optional) str
+        'raise' to raise the first error, 'skip' to leave equities which fail
+        out of the result, defaults to 'raise'
+
+    Returns
+    -------
+    equities : list of radium.Equity
+        Equities which were fetched, in the order given
+
+    Raises
+    ------
+    TypeError
+        If max_workers or retries isn't an integer.
+    ValueError
+        If max_workers <= 0 or retries < 0.
+        If errors isn't available.
+        Equity symbol does not exist (errors='raise')
+    RuntimeError
+        API Call limit still reached after all retries (errors='raise')
+    requests.RequestException
+        Request still failing after all retries (errors='raise')
+    """
+
+    if not isinstance(max_workers, int):
+        raise TypeError('max_workers must be an integer')
+    elif max_workers <= 0:
+        raise ValueError('max_workers must be > 0')
+
+    if not isinstance(retries, int):
+        raise TypeError('retries must be an integer')
+    elif retries < 0:
+        raise ValueError('retries must be >= 0')
+
+    if errors not in ('raise', 'skip'):
+        raise ValueError('Available errors strings: "raise", "skip"')
+
+    def fetch(equity):
+        for attempt in range(retries + 1):
+            try:
+                return equity.prefetch()
+            except (RuntimeError, requests.RequestException):
+                # Call limit reached or request failed so wait to recover
+                if attempt == retries:
+                    raise
+                time.sleep(backoff * 2 ** attempt)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(equity, executor.submit(fetch, equity))
+                   for equity in equities]
+
+        fetched = []
+        for equity, future in futures:
+            try:
+                future.result()
+                fetched.append(equity)
+            except (ValueError, RuntimeError, requests.RequestException):
+                if errors == 'raise':
+                    # Don't start fetching equities which haven't begun yet
+                    for _, pending in futures:
+                        pending.cancel()
+                    raise
+
+    return fetched
@@ -1,2 +1,6 @@
 from ._truncate import _truncate
-from ._convert_date import _convert_date
\ No newline at end of file
+from ._convert_date import _convert_date
+from ._lru_cache import _LRUCache
+from ._align import _align
+from ._mackinnonp import _mackinnonp, _SQRTEPS
+from ._growing_array import _GrowingArray
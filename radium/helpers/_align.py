@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+def _align(series, how='inner'):
+    """
+    Aligns price series on a shared date index
+
+    Parameters
+    ----------
+    series : list of pd.Series
+        Prices with date as index
+    how : (optional) str
+        Missing data policy, 'inner' keeps only dates every series has a
+        price for, 'ffill' keeps every date carrying prices forward and drops
+        dates before every series has a price, defaults to 'inner'
+
+    Returns
+    -------
+    dates : pd.DatetimeIndex
+        Shared dates, sorted earliest first
+    prices : float np.ndarray[][]
+        C-contiguous prices with a row per date and a column per series
+
+    Raises
+    ------
+    TypeError
+        If how isn't a string.
+    ValueError
+        If how isn't 'inner' or 'ffill'.
+    """
+
+    if not isinstance(how, str):
+        raise TypeError('how must be a string')
+    elif how not in ('inner', 'ffill'):
+        raise ValueError('Available missing data policies: "inner", "ffill"')
+
+    # Columns are numbered so series of the same name don't collide
+    if how == 'inner':
+        df = pd.concat(series, axis=1, join='inner', ignore_index=True)
+    else:
+        df = pd.concat(series, axis=1, join='outer', ignore_index=True)
+        df = df.sort_index().ffill()
+
+    # Missing prices within a series are dropped under either policy
+    df = df.dropna()
+
+    prices = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+
+    return pd.DatetimeIndex(df.index), prices
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class _GrowingArray:
+    """
+    Array grown by appending rows to a buffer whose capacity doubles when
+    full, so appending k rows costs amortised O(k) rather than a copy of
+    every row.
+
+    Attributes
+    ----------
+    view : np.ndarray
+        Read-only view of the rows held, sharing memory with the buffer
+    """
+
+    def __init__(self, values):
+        """
+        Initialises _GrowingArray class
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Initial rows, copied into the buffer
+        """
+
+        self._buffer = np.array(values)
+        self._size = self._buffer.shape[0]
+        self.view = self._view()
+
+    def append(self, values, start=None):
+        """
+        Writes rows from a start row, dropping any rows held after them
+
+        Rows before start are left in place, so earlier views of them are
+        still valid.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Rows to write, shaped as the rows held
+        start : (optional) int
+            First row to write, defaults to appending after the rows held
+
+        Returns
+        -------
+        view : np.ndarray
+            Read-only view of the rows now held
+
+        Raises
+        ------
+        ValueError
+            If start isn't between 0 and the number of rows held.
+        """
+
+        if start is None:
+            start = self._size
+        elif not 0 <= start <= self._size:
+            raise ValueError('start must be between 0 and the number of rows')
+
+        end = start + values.shape[0]
+        capacity = self._buffer.shape[0]
+
+        # Double capacity so copies are amortised over appended rows
+        if end > capacity:
+            buffer = np.empty((max(end, 2 * capacity),)
+                              + self._buffer.shape[1:],
+                              dtype=self._buffer.dtype)
+            buffer[:start] = self._buffer[:start]
+            self._buffer = buffer
+
+        self._buffer[start:end] = values
+        self._size = end
+        self.view = self._view()
+
+        return self.view
+
+    def _view(self):
+        """
+        Read-only view of the rows held
+
+        Returns
+        -------
+        view : np.ndarray
+        """
+
+        view = self._buffer[:self._size]
+        view.flags.writeable = False
+
+        return view
+
+    def __len__(self):
+        return self._size
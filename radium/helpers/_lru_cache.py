@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+
+
+class _LRUCache:
+    """
+    Thread-safe mapping evicting least recently used items beyond a budget.
+
+    Attributes
+    ----------
+    maxsize : numeric
+        Budget for the total size of items held
+    total : numeric
+        Total size of items held
+    """
+
+    def __init__(self, maxsize, sizeof=None):
+        """
+        Initialises _LRUCache class
+
+        Parameters
+        ----------
+        maxsize : numeric
+            Budget for the total size of items held, must be non-negative
+        sizeof : (optional) callable
+            Gives the size of an item, defaults to every item having size 1
+
+        Raises
+        ------
+        ValueError
+            If maxsize is negative.
+        """
+
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0')
+
+        self.maxsize = maxsize
+        self.total = 0
+
+        self._sizeof = sizeof
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """
+        Gets an item, marking it as most recently used
+
+        Parameters
+        ----------
+        key : hashable
+        default : (optional)
+            Returned if key is not held, defaults to None
+
+        Returns
+        -------
+        ret : item or default
+        """
+
+        with self._lock:
+            try:
+                value, size = self._items[key]
+            except KeyError:
+                return default
+
+            self._items.move_to_end(key)
+
+            return value
+
+    def put(self, key, value):
+        """
+        Adds or replaces an item then evicts items until within budget
+
+        Items larger than the whole budget are not held.
+
+        Parameters
+        ----------
+        key : hashable
+        value : item
+        """
+
+        size = 1 if self._sizeof is None else self._sizeof(value)
+
+        with self._lock:
+            self.pop(key)
+
+            if size > self.maxsize:
+                return
+
+            self._items[key] = (value, size)
+            self.total += size
+
+            # Evict least recently used items
+            while self.total > self.maxsize:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.total -= evicted_size
+
+    def pop(self, key, default=None):
+        """
+        Removes an item
+
+        Parameters
+        ----------
+        key : hashable
+        default : (optional)
+            Returned if key is not held, defaults to None
+
+        Returns
+        -------
+        ret : item or default
+        """
+
+        with self._lock:
+            try:
+                value, size = self._items.pop(key)
+            except KeyError:
+                return default
+
+            self.total -= size
+
+            return value
+
+    def clear(self):
+        """
+        Removes every item
+        """
+
+        with self._lock:
+            self._items.clear()
+            self.total = 0
+
+    def keys(self):
+        """
+        Keys held, least recently used first
+
+        Returns
+        -------
+        ret : list
+        """
+
+        with self._lock:
+            return list(self._items)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
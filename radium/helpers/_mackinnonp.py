@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.stats import norm
+
+# Pairs fitted almost perfectly aren't tested, as statsmodels' coint
+_SQRTEPS = np.sqrt(np.finfo(np.float64).eps)
+
+# MacKinnon (1994) response surface of the Engle-Granger t-statistic with a
+# constant and 2 variables, as tabulated in statsmodels.tsa.adfvalues. The
+# p-value is Phi of a polynomial in the statistic, with coefficients lowest
+# power first and separate fits either side of _TAU_STAR.
+_TAU_MAX = 0.92
+_TAU_MIN = -18.86
+_TAU_STAR = -2.62
+_TAU_SMALLP = np.array([2.92, 1.5012, 0.039796])
+_TAU_LARGEP = np.array([2.1945, 0.64695, -0.29198, -0.042377])
+
+
+def _mackinnonp(statistic):
+    """
+    MacKinnon's approximate p-values of Engle-Granger t-statistics of pairs
+
+    Vectorises statsmodels' mackinnonp(statistic, regression='c', N=2).
+
+    Parameters
+    ----------
+    statistic : float np.ndarray[]
+
+    Returns
+    -------
+    pvalue : float np.ndarray[]
+
+    References
+    ----------
+    MacKinnon, J.G. 1994. "Approximate asymptotic distribution functions for
+    unit-root and cointegration tests." Journal of Business and Economic
+    Statistics 12, 167-76.
+    """
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        fitted = np.where(statistic <= _TAU_STAR,
+                          np.polyval(_TAU_SMALLP[::-1], statistic),
+                          np.polyval(_TAU_LARGEP[::-1], statistic))
+        pvalue = norm.cdf(fitted)
+
+    pvalue[statistic > _TAU_MAX] = 1.0
+    pvalue[statistic < _TAU_MIN] = 0.0
+
+    return pvalue
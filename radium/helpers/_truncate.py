@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 def _truncate(number, decimals=0):
     """
@@ -7,14 +9,14 @@ def _truncate(number, decimals=0):
 
     Parameters
     ----------
-    number : numeric
-        Number to truncate
+    number : numeric or array-like
+        Number to truncate, arrays are truncated elementwise
     decimals : int
         Decimal places to truncate to, must be non-negative
 
     Returns
     -------
-    ret : numeric
+    ret : numeric or float np.ndarray
         Number truncated to specified decimal places
 
     Raises
@@ -29,7 +31,17 @@ def _truncate(number, decimals=0):
         raise TypeError('Decimals must be an integer.')
     elif decimals < 0:
         raise ValueError('Decimals must be >= 0.')
-    elif decimals == 0:
+
+    # Arrays are truncated in one pass
+    if not np.isscalar(number):
+        number = np.asarray(number, dtype=np.float64)
+        if decimals == 0:
+            return np.trunc(number)
+
+        factor = 10.0 ** decimals
+        return np.trunc(number * factor) / factor
+
+    if decimals == 0:
         # If decimals is zero can truncate as normal
         return math.trunc(number)
 
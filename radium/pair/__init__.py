@@ -1,2 +1,4 @@
-from .cadf_test import cadf_test
-from .johansen_test import johansen_test
+from .cadf_test import cadf_test, cadf_test_many, CADFResult
+from .johansen_test import johansen_test, johansen_test_many, JohansenResult
+from .half_life import half_lives
+from .kalman import KalmanHedge
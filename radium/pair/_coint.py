@@ -0,0 +1,443 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from radium.helpers import _SQRTEPS
+from ._rolling import (_cumulative_sums, _rolling_sums, _pair_moments,
+                       _rolling_johansen)
+
+# Elements of residual arrays built at once, bounds memory of each chunk of
+# pairs tested by _engle_granger
+_CHUNK_ELEMENTS = 2 ** 22
+
+
+def _rolling_blocks(function, prices, window, step, n_jobs=1, *args):
+    """
+    Applies a rolling window test to blocks of windows
+
+    Blocks are spread over a process pool when n_jobs > 1, each sent only
+    the prices its windows cover.
+
+    Parameters
+    ----------
+    function : callable
+        function(prices, window, step, *args) giving a tuple of arrays with a
+        row per window ending at dates window-1, window-1+step, ...
+    prices : float np.ndarray[][]
+        Prices with a row per date
+    window : int
+        Number of dates in each window
+    step : int
+        Number of dates between the ends of windows
+    n_jobs : (optional) int or None
+        Number of processes, None uses every CPU, defaults to 1
+    *args
+        Further arguments of function
+
+    Returns
+    -------
+    results : tuple of np.ndarray
+        Results of function over every window
+
+    Raises
+    ------
+    TypeError
+        If n_jobs isn't an integer or None.
+    ValueError
+        If n_jobs < 1.
+    """
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    elif not isinstance(n_jobs, int):
+        raise TypeError('n_jobs must be an integer or None')
+    elif n_jobs < 1:
+        raise ValueError('n_jobs must be >= 1')
+
+    n_windows = len(range(window - 1, prices.shape[0], step))
+    if n_jobs == 1 or n_windows < 2:
+        return function(prices, window, step, *args)
+
+    # Window k covers dates k*step to k*step+window-1
+    bounds = np.linspace(0, n_windows, 4 * n_jobs + 1).astype(int)
+    blocks = [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    with ProcessPoolExecutor(n_jobs) as pool:
+        futures = [pool.submit(function,
+                               prices[a * step:(b - 1) * step + window],
+                               window, step, *args)
+                   for a, b in blocks]
+        results = [future.result() for future in futures]
+
+    return tuple(np.concatenate(result) for result in zip(*results))
+
+
+def _rolling_cadf(prices, window, step, lag):
+    """
+    Engle-Granger test statistics of the first prices on the second over
+    rolling windows
+
+    Each window matches statsmodels' coint(y, x, maxlag=lag, autolag=None).
+    Residuals of a window are linear in its prices, so the moments of its
+    ADF regression are a quadratic form of the window's sums of products of
+    prices and their lagged differences, differenced from cumulative sums
+    shared by every window.
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    window : int
+        Number of dates in each window
+    step : int
+        Number of dates between the ends of windows
+    lag : int
+        Number of lagged differences in the ADF regressions
+
+    Returns
+    -------
+    statistic : float np.ndarray[]
+        ADF t-statistic of each window's residuals, -inf if the window's
+        prices are almost perfectly colinear
+    beta : float np.ndarray[]
+        Gradient of the first prices on the second of each window
+    """
+
+    cumulative, x_mean, y_mean = _pair_moments(prices[:, 0], prices[:, 1])
+    y = prices[:, 0] - y_mean
+    x = prices[:, 1] - x_mean
+
+    # First stage regression of each window
+    n, sx, sy, sxx, sxy, syy = _rolling_sums(None, window, cumulative)[::step].T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cxx = sxx - sx * sx / n
+        cxy = sxy - sx * sy / n
+        cyy = syy - sy * sy / n
+        beta = cxy / cxx
+        alpha = (sy - beta * sx) / n
+        rsquared = cxy * cxy / (cxx * cyy)
+
+    # Each date k from lag has [dy_k, dx_k, y_k, x_k, 1, dy_(k-1), dx_(k-1),
+    # ..., dy_(k-lag), dx_(k-lag)] of forward differences dy_k = y_(k+1) - y_k
+    dy = np.diff(y)
+    dx = np.diff(x)
+    m = dy.shape[0] - lag
+    columns = [dy[lag:], dx[lag:], y[lag:-1], x[lag:-1], np.ones(m)]
+    for j in range(1, lag + 1):
+        columns += [dy[lag - j:lag - j + m], dx[lag - j:lag - j + m]]
+    variables = np.column_stack(columns)
+
+    size = variables.shape[1]
+    products = variables[:, :, None] * variables[:, None, :]
+    cumulative = _cumulative_sums(products.reshape(m, size * size))
+
+    # Windows have window-1-lag dates of ADF regression
+    sums = _rolling_sums(None, window - 1 - lag, cumulative)[::step]
+    sums = sums.reshape(-1, size, size)
+
+    # Residual variables [d_k, e_k, d_(k-1), ..., d_(k-lag)] of each window
+    # as combinations of the variables
+    combination = np.zeros((sums.shape[0], lag + 2, size))
+    combination[:, 0, 0] = 1.0
+    combination[:, 0, 1] = -beta
+    combination[:, 1, 2] = 1.0
+    combination[:, 1, 3] = -beta
+    combination[:, 1, 4] = -alpha
+    for j in range(1, lag + 1):
+        combination[:, j + 1, 3 + 2 * j] = 1.0
+        combination[:, j + 1, 4 + 2 * j] = -beta
+
+    colinear = ~(rsquared < 1 - 100 * _SQRTEPS)
+    combination[colinear] = 0.0
+    moments = np.einsum('wid,wde,wje->wij', combination, sums, combination)
+
+    # Regress differences on the lagged residual and lagged differences
+    gram = moments[:, 1:, 1:]
+    gram[colinear] = np.eye(lag + 1)
+    rhs = np.zeros((sums.shape[0], lag + 1, 2))
+    rhs[:, :, 0] = moments[:, 1:, 0]
+    rhs[:, 0, 1] = 1.0
+    solved = np.linalg.solve(gram, rhs)
+    params = solved[:, :, 0]
+    inverse = solved[:, 0, 1]
+
+    ssr = moments[:, 0, 0] - np.einsum('ij,ij->i', rhs[:, :, 0], params)
+    dof = window - 1 - lag - (lag + 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = params[:, 0] / np.sqrt(ssr / dof * inverse)
+
+    statistic[colinear] = -np.inf
+
+    return statistic, beta
+
+
+def _rolling_trace(prices, window, step):
+    """
+    Johansen trace and maximum eigenvalue statistics over rolling windows
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per equity
+    window : int
+        Number of dates in each window
+    step : int
+        Number of dates between the ends of windows
+
+    Returns
+    -------
+    trace_stat : float np.ndarray[][]
+        Trace statistic of each rank of each window, as statsmodels'
+        coint_johansen(window, det_order=0, k_ar_diff=1).lr1
+    eigen_stat : float np.ndarray[][]
+        Maximum eigenvalue statistic of each rank of each window, as lr2
+    """
+
+    eigenvalues, _, n = _rolling_johansen(prices, window, step=step)
+
+    return _trace_statistics(eigenvalues, n)
+
+
+def _trace_statistics(eigenvalues, n):
+    """
+    Johansen trace and maximum eigenvalue statistics of batches of
+    eigenvalues
+
+    Parameters
+    ----------
+    eigenvalues : float np.ndarray[][]
+        Eigenvalues of each eigenproblem in descending order
+    n : int np.ndarray[]
+        Number of dates of each eigenproblem
+
+    Returns
+    -------
+    trace_stat : float np.ndarray[][]
+        Trace statistic of each rank of each eigenproblem, as statsmodels'
+        coint_johansen(prices, det_order=0, k_ar_diff=1).lr1
+    eigen_stat : float np.ndarray[][]
+        Maximum eigenvalue statistic of each rank, as lr2
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eigen_stat = -n[:, None] * np.log(1 - eigenvalues)
+    trace_stat = np.cumsum(eigen_stat[:, ::-1], axis=1)[:, ::-1]
+
+    return trace_stat, eigen_stat
+
+
+def _default_maxlag(nobs):
+    """
+    Largest number of lagged differences statsmodels' coint tries by default
+
+    Parameters
+    ----------
+    nobs : int
+        Number of dates tested
+
+    Returns
+    -------
+    maxlag : int
+        Negative if there are too few dates to test
+    """
+
+    maxlag = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+
+    return min(nobs // 2 - 1, maxlag)
+
+
+def _engle_granger(y, x, maxlag):
+    """
+    Engle-Granger test statistics of a batch of pairs
+
+    The ADF regressions of each pair are nested, so the sums of squared
+    residuals of every lag are read off one Cholesky factor of their moment
+    matrix. The chosen lag is then refitted on its longer sample.
+
+    Parameters
+    ----------
+    y : float np.ndarray[][]
+        Prices regressed with a row per date and a column per pair
+    x : float np.ndarray[][]
+        Prices regressed on with a row per date and a column per pair
+    maxlag : int
+        Largest number of lagged differences
+
+    Returns
+    -------
+    statistic : float np.ndarray[]
+        ADF t-statistic of each pair's residuals, -inf if the pair is almost
+        perfectly colinear
+    beta : float np.ndarray[]
+        Gradient of y on x of each pair
+    lags : int np.ndarray[]
+        Number of lagged differences chosen for each pair
+    """
+
+    nobs, n_pairs = y.shape
+    n_lags = maxlag + 1
+
+    # First stage regression of y on x with an intercept
+    xc = x - x.mean(axis=0)
+    yc = y - y.mean(axis=0)
+    sxx = np.einsum('ij,ij->j', xc, xc)
+    sxy = np.einsum('ij,ij->j', xc, yc)
+    syy = np.einsum('ij,ij->j', yc, yc)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = sxy / sxx
+        residuals = yc - beta * xc
+        rsquared = 1 - np.einsum('ij,ij->j', residuals, residuals) / syy
+
+    # As statsmodels, colinear pairs aren't tested
+    colinear = ~(rsquared < 1 - 100 * _SQRTEPS)
+    residuals[:, colinear] = 0.0
+
+    # Lags are compared over the dates every lag has
+    sums = _lag_sums(residuals, maxlag)
+    moments = _adf_moments(sums, np.full(n_pairs, maxlag))
+    n = nobs - 1 - maxlag
+
+    # Sums of squared residuals of each number of regressors by Cholesky
+    gram = moments[:, 1:, 1:].copy()
+    gram[colinear] = np.eye(n_lags)
+    factor = np.linalg.cholesky(gram)
+    projected = np.linalg.solve(factor, moments[:, 1:, :1])[:, :, 0]
+    ssr = moments[:, :1, 0] - np.cumsum(projected * projected, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aic = n * np.log(ssr / n) + 2 * np.arange(1, n_lags + 1)
+    lags = np.argmin(np.where(np.isnan(aic), np.inf, aic), axis=1)
+
+    # Refit the chosen lag over every date it has each lag of
+    moments = _adf_moments(sums, lags)
+
+    # Regressors beyond the chosen lag are replaced by independent ones
+    unused = np.arange(n_lags)[None, :] > lags[:, None]
+    gram = moments[:, 1:, 1:].copy()
+    gram[unused[:, :, None] | unused[:, None, :]] = 0.0
+    gram[:, np.arange(n_lags), np.arange(n_lags)] += unused
+    gram[colinear] = np.eye(n_lags)
+    xy = np.where(unused, 0.0, moments[:, 1:, 0])
+
+    # Solve for the parameters and the first column of the inverse together
+    rhs = np.zeros((n_pairs, n_lags, 2))
+    rhs[:, :, 0] = xy
+    rhs[:, 0, 1] = 1.0
+    solved = np.linalg.solve(gram, rhs)
+    params = solved[:, :, 0]
+    inverse = solved[:, 0, 1]
+
+    ssr = moments[:, 0, 0] - np.einsum('ij,ij->i', xy, params)
+    dof = nobs - 1 - lags - (lags + 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = params[:, 0] / np.sqrt(ssr / dof * inverse)
+
+    statistic[colinear] = -np.inf
+
+    return statistic, beta, lags
+
+
+def _lag_sums(residuals, maxlag):
+    """
+    Sums of products of residuals and their lagged differences
+
+    Moments of ADF regressions over the dates from any start up to maxlag
+    are these totals less the few products before the start, and after the
+    end for lagged variables.
+
+    Parameters
+    ----------
+    residuals : float np.ndarray[][]
+        Residuals e with a row per date and a column per pair
+    maxlag : int
+        Largest number of lagged differences
+
+    Returns
+    -------
+    sums : tuple of float np.ndarray
+        For each lag h, totals, cumulative sums of the first maxlag and of
+        the last maxlag products of d_t * d_(t-h), then totals and cumulative
+        sums of the first maxlag products of e_t * d_(t-h), then of e_t * e_t
+    """
+
+    # Pairs along rows so each pair's products are summed contiguously
+    residuals = np.ascontiguousarray(residuals.T)
+    differences = np.diff(residuals, axis=1)
+    levels = residuals[:, :-1]
+    n = differences.shape[1]
+
+    # Differences before the first date are taken as 0
+    padded = np.concatenate([np.zeros((differences.shape[0], maxlag)),
+                             differences], axis=1)
+
+    dd_total, dd_head, dd_tail, ed_total, ed_head = [], [], [], [], []
+    for h in range(maxlag + 1):
+        lagged = padded[:, maxlag - h:maxlag - h + n]
+
+        # Only the first and last products are kept, totals are summed
+        # without building every product
+        dd_total.append(np.einsum('ij,ij->i', differences, lagged))
+        dd_head.append(_cumulative_sums((differences[:, :maxlag]
+                                         * lagged[:, :maxlag]).T))
+        dd_tail.append(_cumulative_sums((differences[:, n - maxlag:]
+                                         * lagged[:, n - maxlag:]).T[::-1]))
+
+        ed_total.append(np.einsum('ij,ij->i', levels, lagged))
+        ed_head.append(_cumulative_sums((levels[:, :maxlag]
+                                         * lagged[:, :maxlag]).T))
+
+    return (np.array(dd_total), np.array(dd_head), np.array(dd_tail),
+            np.array(ed_total), np.array(ed_head),
+            np.einsum('ij,ij->i', levels, levels),
+            _cumulative_sums((levels[:, :maxlag] * levels[:, :maxlag]).T))
+
+
+def _adf_moments(sums, start):
+    """
+    Moment matrices of ADF regressions starting at a date of each pair
+
+    Variables of each date t of differences are [d_t, e_t, d_(t-1), ...,
+    d_(t-maxlag)], summed over dates from start to the last.
+
+    Parameters
+    ----------
+    sums : tuple of float np.ndarray
+        Result of _lag_sums
+    start : int np.ndarray[]
+        First date of differences of each pair, at most maxlag
+
+    Returns
+    -------
+    moments : float np.ndarray[][][]
+        Sums of products of variables of each pair, only those of lags up to
+        the start are of full windows
+    """
+
+    dd_total, dd_head, dd_tail, ed_total, ed_head, ee_total, ee_head = sums
+    n_lags, n_pairs = dd_total.shape
+    pairs = np.arange(n_pairs)
+
+    # Position of d_(t-i) in the variables
+    position = np.array([0] + list(range(2, n_lags + 1)))
+
+    moments = np.empty((n_pairs, n_lags + 1, n_lags + 1))
+    for h in range(n_lags):
+        i = np.arange(n_lags - h)
+
+        # Products d_(t-i) * d_(t-i-h) are of differences start-i to n-1-i
+        head = dd_head[h][np.maximum(start[None, :] - i[:, None], 0), pairs]
+        total = (dd_total[h] - head - dd_tail[h][i]).T
+        moments[:, position[i], position[i + h]] = total
+        moments[:, position[i + h], position[i]] = total
+
+        total = ed_total[h] - ed_head[h][start, pairs]
+        moments[:, 1, position[h]] = total
+        moments[:, position[h], 1] = total
+
+    moments[:, 1, 1] = ee_total - ee_head[start, pairs]
+
+    return moments
@@ -0,0 +1,380 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8, prices are copied to each worker instead
+    shared_memory = None
+
+# Parameters taken by each method
+_PARAMETERS = {'HUBER': ('c', 'max_iter', 'tol'), 'THEILSEN': ()}
+
+# Elements of window arrays built at once, bounds memory of each chunk
+_CHUNK_ELEMENTS = 2 ** 22
+
+# Prices read by a pool's worker process, set by _init_worker
+_worker_prices = None
+_worker_memory = None
+
+
+def _rolling_robust(prices, method, lookback, n_jobs=1, **kwargs):
+    """
+    Robust gradients of the first prices on the second over trailing windows
+
+    Windows are split into chunks which are spread over a process pool when
+    n_jobs > 1. Workers read the prices from shared memory rather than each
+    task being sent a copy.
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    method : str
+        'HUBER' or 'THEILSEN'
+    lookback : int
+        Number of dates in each window
+    n_jobs : (optional) int or None
+        Number of processes, None uses every CPU, defaults to 1
+    **kwargs
+        Parameters of the method, 'HUBER' takes c, max_iter and tol as in
+        _huber_windows
+
+    Returns
+    -------
+    beta : float np.ndarray[]
+        Gradient of the windows ending at dates lookback-1 to T-2, NaN if a
+        window has too few prices
+
+    Raises
+    ------
+    TypeError
+        If n_jobs isn't an integer or None.
+        If a parameter isn't taken by the method.
+    ValueError
+        If n_jobs < 1.
+        If method isn't 'HUBER' or 'THEILSEN'.
+    """
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    elif not isinstance(n_jobs, int):
+        raise TypeError('n_jobs must be an integer or None')
+    elif n_jobs < 1:
+        raise ValueError('n_jobs must be >= 1')
+
+    # Check parameters before starting any processes
+    if method not in _PARAMETERS:
+        raise ValueError('Available robust methods: "HUBER", "THEILSEN"')
+    for name in kwargs:
+        if name not in _PARAMETERS[method]:
+            raise TypeError(f'{method} takes no parameter {name}')
+
+    first = lookback - 1
+    last = prices.shape[0] - 1
+    if last <= first:
+        return np.empty(0)
+
+    if n_jobs == 1:
+        return _robust_windows(prices, method, lookback, first, last,
+                               **kwargs)
+
+    # A few chunks per process keeps processes busy until the end
+    bounds = np.linspace(first, last, 4 * n_jobs + 1).astype(int)
+    chunks = [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    memory = None
+    if shared_memory is not None:
+        memory = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+        shared = np.ndarray(prices.shape, dtype=np.float64,
+                            buffer=memory.buf)
+        shared[:] = prices
+        initargs = (memory.name, prices.shape, None)
+    else:
+        initargs = (None, None, prices)
+
+    try:
+        with ProcessPoolExecutor(n_jobs, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            futures = [pool.submit(_worker_windows, method, lookback, a, b,
+                                   kwargs)
+                       for a, b in chunks]
+            beta = np.concatenate([future.result() for future in futures])
+    finally:
+        if memory is not None:
+            del shared
+            memory.close()
+            memory.unlink()
+
+    return beta
+
+
+def _init_worker(name, shape, prices):
+    """
+    Points a worker process at the prices of its pool
+
+    Parameters
+    ----------
+    name : str or None
+        Name of the shared memory holding the prices
+    shape : tuple of int or None
+        Shape of the prices in shared memory
+    prices : float np.ndarray[][2] or None
+        Prices, if not in shared memory
+    """
+
+    global _worker_prices, _worker_memory
+
+    if name is None:
+        _worker_prices = prices
+        return
+
+    # The parent process owns and unlinks the memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_prices = np.ndarray(shape, dtype=np.float64,
+                                buffer=_worker_memory.buf)
+
+
+def _worker_windows(method, lookback, start, stop, kwargs):
+    return _robust_windows(_worker_prices, method, lookback, start, stop,
+                           **kwargs)
+
+
+def _robust_windows(prices, method, lookback, start, stop, **kwargs):
+    """
+    Robust gradients of windows ending at a range of dates
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    method : str
+        'HUBER' or 'THEILSEN'
+    lookback : int
+        Number of dates in each window
+    start : int
+        Date the first window ends at
+    stop : int
+        Date after the one the last window ends at
+    **kwargs
+        Parameters of the method
+
+    Returns
+    -------
+    beta : float np.ndarray[]
+        Gradient of each window
+
+    """
+
+    # Window arrays of Theil-Sen hold every two dates of a window
+    if method == 'HUBER':
+        fit = _huber_windows
+        size = lookback
+    else:
+        fit = _theilsen_windows
+        size = lookback * (lookback - 1) // 2
+
+    beta = np.empty(stop - start)
+    step = max(1, _CHUNK_ELEMENTS // max(size, 1))
+
+    for a in range(start, stop, step):
+        b = min(a + step, stop)
+        block = prices[a - lookback + 1:b]
+        y = np.lib.stride_tricks.sliding_window_view(block[:, 0], lookback)
+        x = np.lib.stride_tricks.sliding_window_view(block[:, 1], lookback)
+        beta[a - start:b - start] = fit(y, x, **kwargs)
+
+    return beta
+
+
+def _huber_windows(y, x, c=1.345, max_iter=50, tol=1e-8):
+    """
+    Huber M-estimates of the gradient of y on x by IRLS, for each window
+
+    Every window is reweighted together. As statsmodels' RLM with HuberT,
+    the scale is re-estimated from the median absolute residual each
+    iteration.
+
+    Parameters
+    ----------
+    y : float np.ndarray[][]
+        Response variable with a row per window
+    x : float np.ndarray[][]
+        Explanatory variable with a row per window
+    c : (optional) float
+        Residuals beyond c scales are downweighted, defaults to 1.345
+    max_iter : (optional) int
+        Maximum number of reweightings, defaults to 50
+    tol : (optional) float
+        Relative change in gradients to stop at, defaults to 1e-8
+
+    Returns
+    -------
+    beta : float np.ndarray[]
+        Gradient of each window
+    """
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    n = valid.sum(axis=1)
+
+    # Centre windows so sums of squares don't lose precision
+    with np.errstate(invalid='ignore'):
+        x = x - _row_mean(x, valid, n)[:, None]
+        y = y - _row_mean(y, valid, n)[:, None]
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    weights = valid.astype(np.float64)
+    beta = np.full(y.shape[0], np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iter):
+            # Weighted least squares of each window
+            sw = weights.sum(axis=1)
+            sx = (weights * x).sum(axis=1)
+            sy = (weights * y).sum(axis=1)
+            sxx = (weights * x * x).sum(axis=1)
+            sxy = (weights * x * y).sum(axis=1)
+
+            previous = beta
+            beta = (sxy - sx * sy / sw) / (sxx - sx * sx / sw)
+            alpha = (sy - beta * sx) / sw
+
+            residuals = y - alpha[:, None] - beta[:, None] * x
+            scale = _row_mad(residuals, valid, n)
+
+            # Huber weights, windows fitted exactly keep their weights
+            u = np.abs(residuals) / scale[:, None]
+            huber = np.where(u > c, c / u, 1.0)
+            weights = np.where(valid & (scale[:, None] > 0), huber,
+                               weights)
+
+            change = np.abs(beta - previous)
+            if np.all((change <= tol * (1 + np.abs(beta)))
+                      | ~np.isfinite(beta)):
+                break
+
+    beta[(n < 2) | ~np.isfinite(beta)] = np.nan
+
+    return beta
+
+
+def _theilsen_windows(y, x):
+    """
+    Theil-Sen estimates of the gradient of y on x, for each window
+
+    The gradient is the median of the slopes between every two dates with
+    different x, as scipy.stats.theilslopes.
+
+    Parameters
+    ----------
+    y : float np.ndarray[][]
+        Response variable with a row per window
+    x : float np.ndarray[][]
+        Explanatory variable with a row per window
+
+    Returns
+    -------
+    beta : float np.ndarray[]
+        Gradient of each window
+    """
+
+    windows, lookback = y.shape
+    slopes = np.empty((windows, lookback * (lookback - 1) // 2))
+
+    # Slopes between dates d apart, slicing is quicker than gathering pairs
+    column = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for d in range(1, lookback):
+            out = slopes[:, column:column + lookback - d]
+            np.divide(y[:, d:] - y[:, :-d], x[:, d:] - x[:, :-d], out=out)
+            column += lookback - d
+
+    # Pairs with a missing price or equal x have no slope
+    finite = np.isfinite(slopes)
+    n = finite.sum(axis=1)
+    if np.any(n < slopes.shape[1]):
+        slopes[~finite] = np.nan
+
+    return _row_median(slopes, n)
+
+
+def _row_mean(values, valid, n):
+    """
+    Mean of the valid values of each row
+
+    Parameters
+    ----------
+    values : float np.ndarray[][]
+    valid : bool np.ndarray[][]
+    n : int np.ndarray[]
+        Number of valid values of each row
+
+    Returns
+    -------
+    mean : float np.ndarray[]
+    """
+
+    return np.where(valid, values, 0.0).sum(axis=1) / n
+
+
+def _row_mad(residuals, valid, n):
+    """
+    Median absolute residual of the valid residuals of each row, scaled to
+    estimate a normal standard deviation as statsmodels' RLM
+
+    Parameters
+    ----------
+    residuals : float np.ndarray[][]
+    valid : bool np.ndarray[][]
+    n : int np.ndarray[]
+        Number of valid residuals of each row
+
+    Returns
+    -------
+    scale : float np.ndarray[]
+    """
+
+    deviations = np.where(valid, np.abs(residuals), np.nan)
+
+    return _row_median(deviations, n) / 0.6744897501960817
+
+
+def _row_median(values, n):
+    """
+    Median of each row ignoring NaNs, quicker than np.nanmedian on 2D arrays
+
+    Parameters
+    ----------
+    values : float np.ndarray[][]
+    n : int np.ndarray[]
+        Number of values of each row which aren't NaN
+
+    Returns
+    -------
+    median : float np.ndarray[]
+        NaN for rows with no values
+    """
+
+    median = np.full(values.shape[0], np.nan)
+    if values.shape[1] == 0:
+        return median
+
+    # Rows without NaNs only need their middle values partitioned
+    full = n == values.shape[1]
+    if full.any():
+        kth = [(values.shape[1] - 1) // 2, values.shape[1] // 2]
+        middle = np.partition(values[full], kth, axis=1)[:, kth]
+        median[full] = middle.mean(axis=1)
+
+    # NaNs are sorted to the end of other rows
+    partial = ~full & (n > 0)
+    if partial.any():
+        ordered = np.sort(values[partial], axis=1)
+        rows = np.arange(ordered.shape[0])
+        low = (n[partial] - 1) // 2
+        high = n[partial] // 2
+        median[partial] = (ordered[rows, low] + ordered[rows, high]) / 2
+
+    return median
@@ -0,0 +1,424 @@
+import numpy as np
+
+
+def _cumulative_sums(values):
+    """
+    Cumulative sums of values down rows, starting from a row of zeros
+
+    Parameters
+    ----------
+    values : float np.ndarray[][]
+        Values with a row per date
+
+    Returns
+    -------
+    cumulative : float np.ndarray[][]
+        Row i is the sum of the first i rows of values
+    """
+
+    cumulative = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumulative[1:])
+
+    return cumulative
+
+
+def _rolling_sums(values, lookback, cumulative=None):
+    """
+    Sums values over every trailing window by differencing cumulative sums
+
+    Parameters
+    ----------
+    values : float np.ndarray[][]
+        Values with a row per date
+    lookback : int
+        Number of rows in each window
+    cumulative : (optional) float np.ndarray[][]
+        Cumulative sums of values if already computed
+
+    Returns
+    -------
+    sums : float np.ndarray[][]
+        Sums of each window, row k is the window ending at row lookback-1+k
+    """
+
+    if cumulative is None:
+        cumulative = _cumulative_sums(values)
+
+    return cumulative[lookback:] - cumulative[:-lookback]
+
+
+def _pair_moments(y, x):
+    """
+    Cumulative sums of the moments needed to regress y on x over windows
+
+    Dates where either price is missing are left out of the sums.
+
+    Parameters
+    ----------
+    y : float np.ndarray[]
+        Response variable
+    x : float np.ndarray[]
+        Explanatory variable
+
+    Returns
+    -------
+    moments : tuple of (float np.ndarray[][6], float, float)
+        Cumulative sums of [count, x, y, x*x, x*y, y*y] of centred prices and
+        the means of x and y they were centred by
+    """
+
+    valid = np.isfinite(x) & np.isfinite(y)
+
+    # Centre prices so sums of squares don't lose precision
+    x_mean = x[valid].mean() if valid.any() else 0.0
+    y_mean = y[valid].mean() if valid.any() else 0.0
+    x = np.where(valid, x - x_mean, 0.0)
+    y = np.where(valid, y - y_mean, 0.0)
+
+    cumulative = _cumulative_sums(np.column_stack([valid, x, y, x * x,
+                                                   x * y, y * y]))
+
+    return cumulative, x_mean, y_mean
+
+
+def _rolling_ols(y, x, lookback, moments=None):
+    """
+    Regresses y on x with an intercept over every trailing window
+
+    Dates where either price is missing are left out of their windows.
+
+    Parameters
+    ----------
+    y : float np.ndarray[]
+        Response variable
+    x : float np.ndarray[]
+        Explanatory variable
+    lookback : int
+        Number of dates in each window
+    moments : (optional) tuple
+        Result of _pair_moments(y, x), shared between lookbacks
+
+    Returns
+    -------
+    alpha : float np.ndarray[]
+        Intercept of each window, row k is the window ending at date
+        lookback-1+k, NaN if fewer than 2 dates or x is constant
+    beta : float np.ndarray[]
+        Gradient of each window, laid out as alpha
+    """
+
+    if moments is None:
+        moments = _pair_moments(y, x)
+    cumulative, x_mean, y_mean = moments
+
+    sums = _rolling_sums(None, lookback, cumulative)
+    n, sx, sy, sxx, sxy, _ = sums.T
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (sxy - sx * sy / n) / (sxx - sx * sx / n)
+        alpha = (sy - beta * sx) / n + y_mean - beta * x_mean
+
+    # Fewer than 2 points or constant x leave the gradient undefined
+    undefined = (n < 2) | ~np.isfinite(beta)
+    beta[undefined] = np.nan
+    alpha[undefined] = np.nan
+
+    return alpha, beta
+
+
+def _rolling_tls(y, x, lookback, moments=None):
+    """
+    Fits y = alpha + beta * x by total least squares over every trailing
+    window
+
+    The line minimises orthogonal distances, so it treats y and x alike and
+    the gradient of x on y is 1 / beta. Dates where either price is missing
+    are left out of their windows.
+
+    Parameters
+    ----------
+    y : float np.ndarray[]
+    x : float np.ndarray[]
+    lookback : int
+        Number of dates in each window
+    moments : (optional) tuple
+        Result of _pair_moments(y, x), shared between lookbacks
+
+    Returns
+    -------
+    alpha : float np.ndarray[]
+        Intercept of each window, row k is the window ending at date
+        lookback-1+k, NaN if fewer than 2 dates or y and x are uncorrelated
+    beta : float np.ndarray[]
+        Gradient of each window, laid out as alpha
+    """
+
+    if moments is None:
+        moments = _pair_moments(y, x)
+    cumulative, x_mean, y_mean = moments
+
+    sums = _rolling_sums(None, lookback, cumulative)
+    n, sx, sy, sxx, sxy, syy = sums.T
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cxx = sxx - sx * sx / n
+        cyy = syy - sy * sy / n
+        cxy = sxy - sx * sy / n
+
+        # Direction of the principal axis of the window's covariance
+        spread = cyy - cxx
+        beta = (spread + np.sqrt(spread * spread + 4 * cxy * cxy)) / (2 * cxy)
+        alpha = (sy - beta * sx) / n + y_mean - beta * x_mean
+
+    undefined = (n < 2) | ~np.isfinite(beta)
+    beta[undefined] = np.nan
+    alpha[undefined] = np.nan
+
+    return alpha, beta
+
+
+def _johansen_moments(prices):
+    """
+    Cumulative sums of the moments of a VECM with one lagged difference
+
+    Each date t from 2 has the variables [dp_t, p_(t-1), dp_(t-1)] of
+    prices p and their differences dp. Dates where a price is missing are
+    left out of the sums.
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per equity
+
+    Returns
+    -------
+    cumulative : float np.ndarray[][]
+        Cumulative sums of [count, variables, outer products of variables]
+        from date 2, outer products flattened row by row
+    """
+
+    n_vars = 3 * prices.shape[1]
+    valid, variables = _johansen_variables(prices)
+
+    products = variables[:, :, None] * variables[:, None, :]
+    values = np.concatenate([valid[:, None], variables,
+                             products.reshape(-1, n_vars * n_vars)], axis=1)
+
+    return _cumulative_sums(values)
+
+
+def _johansen_sums(prices):
+    """
+    Sums of the moments of a VECM with one lagged difference over every date
+
+    Equal to the last row of _johansen_moments(prices), without summing
+    every date's outer products cumulatively.
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per equity
+
+    Returns
+    -------
+    sums : float np.ndarray[]
+        Sums of [count, variables, outer products of variables]
+    """
+
+    valid, variables = _johansen_variables(prices)
+
+    return np.concatenate([[valid.sum()], variables.sum(axis=0),
+                           (variables.T @ variables).ravel()])
+
+
+def _johansen_variables(prices):
+    """
+    Variables [dp_t, p_(t-1), dp_(t-1)] of a VECM with one lagged difference
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per equity
+
+    Returns
+    -------
+    valid : bool np.ndarray[]
+        Whether each date from 2 has every price
+    variables : float np.ndarray[][]
+        Variables of each date from 2 from centred prices, zero where
+        invalid
+    """
+
+    # Centre prices so sums of squares don't lose precision
+    valid = np.isfinite(prices).all(axis=1)
+    if valid.any():
+        prices = prices - prices[valid].mean(axis=0)
+
+    differences = np.diff(prices, axis=0)
+    variables = np.concatenate([differences[1:], prices[1:-1],
+                                differences[:-1]], axis=1)
+
+    valid = np.isfinite(variables).all(axis=1)
+    variables = np.where(valid[:, None], variables, 0.0)
+
+    return valid, variables
+
+
+def _rolling_johansen(prices, lookback, moments=None, step=1):
+    """
+    Johansen eigenvalues and cointegrating vectors over every trailing window
+
+    Matches statsmodels' coint_johansen(window, det_order=0, k_ar_diff=1) of
+    each window, solving every window's eigenproblem together from rolling
+    moments.
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per equity
+    lookback : int
+        Number of dates in each window
+    moments : (optional) float np.ndarray[][]
+        Result of _johansen_moments(prices), shared between lookbacks
+    step : (optional) int
+        Number of dates between the ends of windows, defaults to 1
+
+    Returns
+    -------
+    eigenvalues : float np.ndarray[][]
+        Eigenvalues of each window in descending order, row k is the window
+        ending at date lookback-1+k*step, NaN if a window's moments are
+        singular
+    eigenvectors : float np.ndarray[][][]
+        Cointegrating vectors of each window as columns ordered as
+        eigenvalues, normalised as statsmodels' evec up to sign
+    n : int np.ndarray[]
+        Number of dates each window's moments are over
+    """
+
+    n_equities = prices.shape[1]
+
+    if moments is None:
+        moments = _johansen_moments(prices)
+
+    # Windows of lookback prices have lookback-2 dates of variables
+    size = lookback - 2
+    n_windows = len(range(lookback - 1, prices.shape[0], step))
+    if size < 1 or n_windows == 0:
+        return (np.full((n_windows, n_equities), np.nan),
+                np.full((n_windows, n_equities, n_equities), np.nan),
+                np.zeros(n_windows, dtype=int))
+
+    sums = _rolling_sums(None, size, moments)[::step]
+
+    return _johansen_eig(sums, n_equities)
+
+
+def _johansen_eig(sums, n_equities):
+    """
+    Johansen eigenvalues and cointegrating vectors from sums of VECM moments
+
+    Every set of sums, e.g. of a window or of a pair's whole sample, is
+    solved together.
+
+    Parameters
+    ----------
+    sums : float np.ndarray[][]
+        Sums of [count, variables, outer products of variables] as rows of
+        _johansen_moments, one row per eigenproblem
+    n_equities : int
+        Number of equities
+
+    Returns
+    -------
+    eigenvalues : float np.ndarray[][]
+        Eigenvalues of each row of sums in descending order, NaN if its
+        moments are singular
+    eigenvectors : float np.ndarray[][][]
+        Cointegrating vectors of each row of sums as columns ordered as
+        eigenvalues, normalised as statsmodels' evec up to sign
+    n : int np.ndarray[]
+        Number of dates each row of sums is over
+    """
+
+    n_vars = 3 * n_equities
+
+    n = sums[:, 0]
+    means = sums[:, 1:n_vars + 1] / n[:, None]
+    products = sums[:, n_vars + 1:].reshape(-1, n_vars, n_vars)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products / n[:, None, None] \
+                     - means[:, :, None] * means[:, None, :]
+
+    # Blocks of differences, lagged prices and lagged differences
+    d = slice(0, n_equities)
+    p = slice(n_equities, 2 * n_equities)
+    l = slice(2 * n_equities, n_vars)
+
+    # Partial out lagged differences
+    lagged, bad = _solve(covariance[:, l, l],
+                         np.concatenate([covariance[:, l, d],
+                                         covariance[:, l, p]], axis=2))
+    s00 = covariance[:, d, d] - covariance[:, d, l] @ lagged[:, :, d]
+    skk = covariance[:, p, p] - covariance[:, p, l] @ lagged[:, :, p]
+    sk0 = covariance[:, p, d] - covariance[:, p, l] @ lagged[:, :, d]
+
+    # Eigenproblem of skk^-1 sk0 s00^-1 sk0'
+    a, bad_00 = _solve(s00, np.swapaxes(sk0, 1, 2))
+    b, bad_kk = _solve(skk, sk0 @ a)
+    bad = bad | bad_00 | bad_kk | (n < 2)
+    b[bad] = np.eye(n_equities)
+
+    eigenvalues, eigenvectors = np.linalg.eig(b)
+    eigenvalues = eigenvalues.real
+    eigenvectors = eigenvectors.real
+
+    order = np.argsort(-eigenvalues, axis=1)
+    eigenvalues = np.take_along_axis(eigenvalues, order, axis=1)
+    eigenvectors = np.take_along_axis(eigenvectors, order[:, None, :], axis=2)
+
+    # Normalise so each vector v has v' skk v = 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        norms = np.einsum('wij,wik,wkj->wj', eigenvectors, skk, eigenvectors)
+        eigenvectors = eigenvectors / np.sqrt(norms)[:, None, :]
+
+    eigenvalues[bad] = np.nan
+    eigenvectors[bad] = np.nan
+
+    return eigenvalues, eigenvectors, n.astype(int)
+
+
+def _solve(a, b):
+    """
+    Solves a batch of linear systems a x = b, flagging singular systems
+
+    Parameters
+    ----------
+    a : float np.ndarray[][][]
+        Square matrices
+    b : float np.ndarray[][][]
+        Right hand sides
+
+    Returns
+    -------
+    x : float np.ndarray[][][]
+        Solutions, NaN for singular systems
+    singular : bool np.ndarray[]
+        Whether each system is singular or not finite
+    """
+
+    a = a.copy()
+
+    finite = np.isfinite(a).all(axis=(1, 2)) & np.isfinite(b).all(axis=(1, 2))
+    singular = ~finite
+    a[singular] = np.eye(a.shape[1])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        singular |= np.linalg.cond(a) > 1 / np.finfo(np.float64).eps
+    a[singular] = np.eye(a.shape[1])
+
+    x = np.linalg.solve(a, np.where(singular[:, None, None], 0.0, b))
+    x[singular] = np.nan
+
+    return x, singular
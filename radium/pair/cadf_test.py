@@ -1,19 +1,111 @@
+import numpy as np
 import pandas as pd
 import statsmodels.tsa.stattools as ts
+from statsmodels.tsa import adfvalues
 
+from radium.helpers import _mackinnonp
+from ._coint import _engle_granger, _default_maxlag, _CHUNK_ELEMENTS
 from .pair import Pair
 
 
+class CADFResult:
+    """
+    Result of a Cointegrated Augmented Dickey Fuller Test on a pair.
+
+    Values are held at full precision, print the result or call summary()
+    for a readable report.
+
+    Attributes
+    ----------
+    symbols : tuple of str
+        Symbols of the pair's equities
+    start_date : datetime.date
+        First date tested
+    end_date : datetime.date
+        Last date tested
+    statistic : float
+        t-statistic of the unit root test on the residuals
+    pvalue : float
+        MacKinnon's approximate p-value
+    critical_values : float np.ndarray[3]
+        1%, 5% and 10% critical values
+    nobs : int
+        Number of dates tested
+    """
+
+    def __init__(self, symbols, start_date, end_date, statistic, pvalue,
+                 critical_values, nobs):
+        """
+        Initialises CADFResult class
+
+        Parameters
+        ----------
+        symbols : tuple of str
+        start_date : datetime.date
+        end_date : datetime.date
+        statistic : float
+        pvalue : float
+        critical_values : float np.ndarray[3]
+        nobs : int
+        """
+
+        self.symbols = tuple(symbols)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.statistic = float(statistic)
+        self.pvalue = float(pvalue)
+        self.critical_values = np.asarray(critical_values, dtype=np.float64)
+        self.nobs = int(nobs)
+
+    def summary(self, decimals=3):
+        """
+        Readable report of the test
+
+        Parameters
+        ----------
+        decimals : (optional) int
+            Decimal places to round to, defaults to 3
+
+        Returns
+        -------
+        summary : str
+        """
+
+        statistic = round(self.statistic, decimals)
+        pvalue = round(self.pvalue, decimals)
+        crit_value = [round(x, decimals) for x in self.critical_values]
+
+        return (f'CADF Test for cointegration between {self.symbols[0]} '
+                f'and {self.symbols[1]} from {self.start_date} to '
+                f'{self.end_date}\n\n'
+                f't-statistic = {statistic}\n'
+                f'p-value = {pvalue}\n\n'
+                f'1% Critical Value: {crit_value[0]}\n'
+                f'5% Critical Value: {crit_value[1]}\n'
+                f'10% Critical Value: {crit_value[2]}\n')
+
+    def __str__(self):
+        return self.summary()
+
+    def __repr__(self):
+        return (f'CADFResult(symbols={self.symbols}, '
+                f'statistic={self.statistic}, pvalue={self.pvalue}, '
+                f'nobs={self.nobs})')
+
+
 def cadf_test(pair):
     """
     Conducts a Cointegrated Augmented Dickey Fuller Test on a pair of equities.
 
-    Prints t-statistic, p-value and critical values
-
     Parameters
     ----------
     pair : radium.Pair
 
+    Returns
+    -------
+    result : radium.pair.CADFResult
+        t-statistic, p-value and critical values, print for a report
+
     Raises
     ------
     TypeError
@@ -23,34 +115,78 @@ def cadf_test(pair):
     if not isinstance(pair, Pair):
         raise TypeError('Pair must be of type radium.Pair')
 
-    # Get closed prices in dataframe
-    equity1_df = pair.equity1.closed
-    equity2_df = pair.equity2.closed
+    # Get CADF result
+    coint_t, pvalue, crit_value = ts.coint(pair.prices[:, 0],
+                                           pair.prices[:, 1])
+
+    symbols = (pair.equity1.symbol, pair.equity2.symbol)
 
-    # Set column name as symbol
-    equity1_df = equity1_df.rename(pair.equity1.symbol)
-    equity2_df = equity2_df.rename(pair.equity2.symbol)
+    return CADFResult(symbols, pair.dates[0].date(), pair.dates[-1].date(),
+                      coint_t, pvalue, crit_value, pair.prices.shape[0])
 
-    # Augment dataframes, removing missing data
-    df = pd.concat([equity1_df, equity2_df], axis=1, join="inner")
 
-    # Get CADF result
-    coint_t, pvalue, crit_value = ts.coint(df[pair.equity1.symbol],
-                                           df[pair.equity2.symbol])
-
-    # Round to make more interpretable
-    coint_t = round(coint_t, 3)
-    pvalue = round(pvalue, 3)
-    crit_value = [round(x, 3) for x in crit_value]
-
-    # Print results
-    results = (f'CADF Test for cointegration between {pair.equity1.symbol} '
-               f'and {pair.equity2.symbol} from {pair.start_date} to '
-               f'{pair.end_date}\n\n'
-               f't-statistic = {coint_t}\n'
-               f'p-value = {pvalue}\n\n'
-               f'1% Critical Value: {crit_value[0]}\n'
-               f'5% Critical Value: {crit_value[1]}\n'
-               f'10% Critical Value: {crit_value[2]}\n\n')
-
-    print(results)
+def cadf_test_many(pairs):
+    """
+    Conducts Cointegrated Augmented Dickey Fuller Tests on many pairs
+
+    Pairs with the same number of dates are tested together by the batched
+    Engle-Granger regressions of radium.screen.screen_pairs, giving the same
+    results as cadf_test of each pair up to rounding.
+
+    Parameters
+    ----------
+    pairs : list of radium.Pair
+
+    Returns
+    -------
+    results : pd.DataFrame
+        Row per pair with columns symbol1, symbol2, start_date, end_date,
+        nobs, statistic, pvalue and crit_1, crit_5, crit_10 critical values
+
+    Raises
+    ------
+    TypeError
+        If a pair is not of type radium.Pair.
+    ValueError
+        If a pair has too few dates to test.
+    """
+
+    pairs = list(pairs)
+    for pair in pairs:
+        if not isinstance(pair, Pair):
+            raise TypeError('Pair must be of type radium.Pair')
+
+    columns = ['symbol1', 'symbol2', 'start_date', 'end_date', 'nobs',
+               'statistic', 'pvalue', 'crit_1', 'crit_5', 'crit_10']
+    results = pd.DataFrame({'symbol1': [p.equity1.symbol for p in pairs],
+                            'symbol2': [p.equity2.symbol for p in pairs],
+                            'start_date': [p.dates[0].date() for p in pairs],
+                            'end_date': [p.dates[-1].date() for p in pairs],
+                            'nobs': [p.prices.shape[0] for p in pairs]},
+                           columns=columns)
+
+    # Pairs of the same length are regressed together, in chunks which fit
+    # in memory
+    nobs = results['nobs'].to_numpy()
+    values = np.full((len(pairs), 5), np.nan)
+    for n in np.unique(nobs):
+        maxlag = _default_maxlag(n)
+        if maxlag < 0:
+            raise ValueError('Pairs must have enough dates to test')
+
+        group = np.flatnonzero(nobs == n)
+        step = max(1, _CHUNK_ELEMENTS // n)
+        for a in range(0, group.shape[0], step):
+            chunk = group[a:a + step]
+            prices = np.stack([pairs[k].prices for k in chunk], axis=2)
+            statistic, _, _ = _engle_granger(prices[:, 0], prices[:, 1],
+                                             maxlag)
+            values[chunk, 0] = statistic
+
+        values[group, 2:] = adfvalues.mackinnoncrit(N=2, regression='c',
+                                                    nobs=n - 1)
+
+    values[:, 1] = _mackinnonp(values[:, 0])
+    results[columns[5:]] = values
+
+    return results
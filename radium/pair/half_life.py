@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def half_lives(spreads):
+    """
+    Half-lives of mean reversion of many spreads at once
+
+    Fits each spread as an Ornstein-Uhlenbeck process sampled daily, i.e.
+    the AR(1) regression s_t - s_(t-1) = a + b * s_(t-1) + noise, with
+    every spread regressed together from its sums of products. The
+    half-life is -ln(2) / ln|1 + b| dates, the time for deviations from the
+    mean to halve in size.
+
+    Parameters
+    ----------
+    spreads : float np.ndarray[] or float np.ndarray[][] or pd.Series or
+              pd.DataFrame
+        One spread, or spreads with a row per date and a column per spread.
+        Dates where a spread or its previous value is missing are left out of
+        its regression.
+
+    Returns
+    -------
+    half_life : float or float np.ndarray[] or pd.Series
+        Half-life of each spread in dates, a float for one spread and a
+        pd.Series indexed by column for a pd.DataFrame. inf if a spread
+        doesn't mean revert, NaN if it has fewer than 3 dates.
+    """
+
+    values = np.asarray(spreads, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    # Regress each difference on the previous spread
+    x = values[:-1]
+    y = values[1:] - values[:-1]
+    valid = np.isfinite(x) & np.isfinite(y)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    n = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        xc = np.where(valid, x - x_mean, 0.0)
+        yc = np.where(valid, y - y_mean, 0.0)
+        b = np.einsum('ij,ij->j', xc, yc) / np.einsum('ij,ij->j', xc, xc)
+
+        persistence = np.abs(1 + b)
+        half_life = -math.log(2) / np.log(persistence)
+
+    # Spreads whose deviations don't shrink never halve
+    half_life[persistence >= 1] = np.inf
+    half_life[(n < 2) | np.isnan(b)] = np.nan
+
+    if isinstance(spreads, pd.DataFrame):
+        return pd.Series(half_life, index=spreads.columns)
+    elif np.ndim(spreads) == 1:
+        return float(half_life[0])
+
+    return half_life
+
+
+def _auto_lookback(half_life, n_dates):
+    """
+    Lookback of a spread's half-life, rounded up to whole dates
+
+    Parameters
+    ----------
+    half_life : float
+        Half-life of the spread in dates
+    n_dates : int
+        Number of dates of the spread
+
+    Returns
+    -------
+    lookback : int
+        Between 2 and n_dates - 1
+
+    Raises
+    ------
+    ValueError
+        If the spread doesn't mean revert within n_dates - 1 dates.
+    """
+
+    if not half_life < n_dates - 1:
+        raise ValueError('Spread does not mean revert, lookback can\'t be '
+                         'chosen automatically')
+
+    return max(2, int(math.ceil(half_life)))
@@ -1,69 +1,228 @@
-import statsmodels.tsa.vector_ar.vecm as vm
+import numpy as np
 import pandas as pd
+import statsmodels.tsa.vector_ar.vecm as vm
+from statsmodels.tsa.coint_tables import c_sja, c_sjt
 
+from radium.basket import Basket
+from ._coint import _trace_statistics
+from ._rolling import _johansen_sums, _johansen_eig
 from .pair import Pair
 
-def johansen_test(pair):
+
+class JohansenResult:
+    """
+    Result of a Johansen Test on equities.
+
+    Values are held at full precision, print the result or call summary()
+    for a readable report. Statistics are indexed by rank r, testing the
+    hypothesis that there are at most r cointegrating vectors.
+
+    Attributes
+    ----------
+    symbols : tuple of str
+        Symbols of the equities
+    start_date : datetime.date
+        First date tested
+    end_date : datetime.date
+        Last date tested
+    trace_stat : float np.ndarray[]
+        Trace statistic of each rank
+    trace_crit : float np.ndarray[][3]
+        90%, 95% and 99% critical values of each trace statistic
+    eigen_stat : float np.ndarray[]
+        Maximum eigenvalue statistic of each rank
+    eigen_crit : float np.ndarray[][3]
+        90%, 95% and 99% critical values of each eigenvalue statistic
+    eigenvalues : float np.ndarray[]
+        Eigenvalues in descending order
+    eigenvectors : float np.ndarray[][]
+        Cointegrating vectors as columns ordered as eigenvalues
+    nobs : int
+        Number of dates tested
     """
-    Conducts a Johansen Test on a pair of equities.
 
-    Print trace/eigenvalue statistics and critical values.
+    def __init__(self, symbols, start_date, end_date, trace_stat, trace_crit,
+                 eigen_stat, eigen_crit, eigenvalues, eigenvectors, nobs):
+        """
+        Initialises JohansenResult class
+
+        Parameters
+        ----------
+        symbols : tuple of str
+        start_date : datetime.date
+        end_date : datetime.date
+        trace_stat : float np.ndarray[]
+        trace_crit : float np.ndarray[][3]
+        eigen_stat : float np.ndarray[]
+        eigen_crit : float np.ndarray[][3]
+        eigenvalues : float np.ndarray[]
+        eigenvectors : float np.ndarray[][]
+        nobs : int
+        """
+
+        self.symbols = tuple(symbols)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.trace_stat = np.asarray(trace_stat, dtype=np.float64)
+        self.trace_crit = np.asarray(trace_crit, dtype=np.float64)
+        self.eigen_stat = np.asarray(eigen_stat, dtype=np.float64)
+        self.eigen_crit = np.asarray(eigen_crit, dtype=np.float64)
+        self.eigenvalues = np.asarray(eigenvalues, dtype=np.float64)
+        self.eigenvectors = np.asarray(eigenvectors, dtype=np.float64)
+        self.nobs = int(nobs)
+
+    def summary(self, decimals=3):
+        """
+        Readable report of the test
+
+        Parameters
+        ----------
+        decimals : (optional) int
+            Decimal places to round to, defaults to 3
+
+        Returns
+        -------
+        summary : str
+        """
+
+        # Round to make more interpretable
+        trace_stat = [round(x, decimals) for x in self.trace_stat]
+        trace_crit = [[round(x, decimals) for x in y] for y in self.trace_crit]
+        eigen_stat = [round(x, decimals) for x in self.eigen_stat]
+        eigen_crit = [[round(x, decimals) for x in y] for y in self.eigen_crit]
+
+        symbols = ', '.join(self.symbols[:-1]) + f' and {self.symbols[-1]}'
+        lines = [f'Johansen Test for cointegration between {symbols} from '
+                 f'{self.start_date} to {self.end_date}\n']
+
+        for i in range(len(trace_stat)):
+            lines.append(f'r<={i} Trace Statistic = {trace_stat[i]}\n'
+                         f'r<={i} Trace Critical Values:\n'
+                         f'90%: {trace_crit[i][0]}\n'
+                         f'95%: {trace_crit[i][1]}\n'
+                         f'99% {trace_crit[i][2]}')
+
+        lines.append('')
+
+        for i in range(len(eigen_stat)):
+            lines.append(f'r<={i} Eigenvalue Statistic = {eigen_stat[i]}\n'
+                         f'r<={i} Eigenvalue Critical Values:\n'
+                         f'90%: {eigen_crit[i][0]}\n'
+                         f'95%: {eigen_crit[i][1]}\n'
+                         f'99% {eigen_crit[i][2]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def __str__(self):
+        return self.summary()
+
+    def __repr__(self):
+        return (f'JohansenResult(symbols={self.symbols}, '
+                f'trace_stat={self.trace_stat.tolist()}, '
+                f'eigen_stat={self.eigen_stat.tolist()}, nobs={self.nobs})')
+
+
+def johansen_test(pair):
+    """
+    Conducts a Johansen Test on a pair or basket of equities.
 
     Parameters
     ----------
-    pair : radium.Pair
+    pair : radium.Pair or radium.Basket
+
+    Returns
+    -------
+    result : radium.pair.JohansenResult
+        Trace/eigenvalue statistics and critical values of every rank, print
+        for a report
 
     Raises
     ------
     TypeError
-        If pair is not of type radium.Pair.
+        If pair is not of type radium.Pair or radium.Basket.
     """
 
-    if not isinstance(pair, Pair):
-        raise TypeError('Pair must be of type radium.Pair')
+    if isinstance(pair, Pair):
+        symbols = (pair.equity1.symbol, pair.equity2.symbol)
+    elif isinstance(pair, Basket):
+        symbols = tuple(pair.symbols)
+    else:
+        raise TypeError('Pair must be of type radium.Pair or radium.Basket')
 
-    # Get closed prices in dataframe
-    equity1_df = pair.equity1.closed
-    equity2_df = pair.equity2.closed
+    # Get Johansen results
+    result = vm.coint_johansen(pair.prices, det_order=0, k_ar_diff=1)
 
-    # Set column name as symbol
-    equity1_df = equity1_df.rename(pair.equity1.symbol)
-    equity2_df = equity2_df.rename(pair.equity2.symbol)
+    return JohansenResult(symbols, pair.dates[0].date(),
+                          pair.dates[-1].date(), result.lr1, result.cvt,
+                          result.lr2, result.cvm, result.eig, result.evec,
+                          pair.prices.shape[0])
 
-    # Augment dataframes, removing missing data
-    df = pd.concat([equity1_df, equity2_df], axis=1, join="inner")
 
-    # Get Johansen results
-    result = vm.coint_johansen(df.values, det_order=0, k_ar_diff=1)
-    trace_stat = result.lr1
-    trace_crit = result.cvt
-    eigen_stat = result.lr2
-    eigen_crit = result.cvm
-
-    # Round to make more interpretable
-    trace_stat = [round(x, 3) for x in trace_stat]
-    trace_crit = [[round(x, 3) for x in y] for y in trace_crit]
-    eigen_stat = [round(x, 3) for x in eigen_stat]
-    eigen_crit = [[round(x, 3) for x in y] for y in eigen_crit]
-
-    # Print results
-    print(f'Johansen Test for cointegration between {pair.equity1.symbol} and ' 
-          f'{pair.equity2.symbol} from {pair.start_date} to {pair.end_date}\n')
-
-    for i in [0,1]:
-        print(f'r<={i} Trace Statistic = {trace_stat[i]}\n'
-              f'r<={i} Trace Critical Values:\n'
-              f'90%: {trace_crit[i][0]}\n'
-              f'95%: {trace_crit[i][1]}\n'
-              f'99% {trace_crit[i][2]}')
-
-    print('\n')
-
-    for i in [0,1]:
-        print(f'r<={i} Eigenvalue Statistic = {eigen_stat[i]}\n'
-              f'r<={i} Eigenvalue Critical Values:\n'
-              f'90%: {eigen_crit[i][0]}\n'
-              f'95%: {eigen_crit[i][1]}\n'
-              f'99% {eigen_crit[i][2]}')
-
-    print('\n')
+def johansen_test_many(pairs):
+    """
+    Conducts Johansen Tests on many pairs or baskets of equities
+
+    The VECM moments of each pair are summed over its dates and every
+    pair's eigenproblem is solved together, as for rolling Johansen tests,
+    giving the same results as johansen_test of each pair up to rounding.
+
+    Parameters
+    ----------
+    pairs : list of radium.Pair or list of radium.Basket
+        Pairs, or baskets of the same number of equities N
+
+    Returns
+    -------
+    results : pd.DataFrame
+        Row per pair with columns symbol1, ..., symbolN, start_date, end_date
+        and nobs, then for each rank r trace_stat_r, eigen_stat_r and their
+        trace_crit_r_90, trace_crit_r_95, trace_crit_r_99, eigen_crit_r_90,
+        eigen_crit_r_95, eigen_crit_r_99 critical values
+
+    Raises
+    ------
+    TypeError
+        If a pair is not of type radium.Pair or radium.Basket.
+    ValueError
+        If baskets hold different numbers of equities.
+    """
+
+    symbols = []
+    for pair in pairs:
+        if isinstance(pair, Pair):
+            symbols.append((pair.equity1.symbol, pair.equity2.symbol))
+        elif isinstance(pair, Basket):
+            symbols.append(tuple(pair.symbols))
+        else:
+            raise TypeError('Pair must be of type radium.Pair or '
+                            'radium.Basket')
+
+    n = len(symbols[0]) if len(symbols) > 0 else 2
+    if any(len(s) != n for s in symbols):
+        raise ValueError('Baskets must hold the same number of equities')
+
+    columns = [f'symbol{i}' for i in range(1, n + 1)]
+    columns += ['start_date', 'end_date', 'nobs']
+    for r in range(n):
+        columns += [f'trace_stat_{r}', f'eigen_stat_{r}']
+        columns += [f'trace_crit_{r}_{p}' for p in (90, 95, 99)]
+        columns += [f'eigen_crit_{r}_{p}' for p in (90, 95, 99)]
+
+    if len(symbols) == 0:
+        return pd.DataFrame(columns=columns)
+
+    # Moments summed over every date of each pair, solved together
+    sums = np.stack([_johansen_sums(pair.prices) for pair in pairs])
+    eigenvalues, _, nobs = _johansen_eig(sums, n)
+    trace_stat, eigen_stat = _trace_statistics(eigenvalues, nobs)
+
+    rows = []
+    for k, pair in enumerate(pairs):
+        row = symbols[k] + (pair.dates[0].date(), pair.dates[-1].date(),
+                            pair.prices.shape[0])
+        for r in range(n):
+            row += (trace_stat[k, r], eigen_stat[k, r])
+            row += tuple(c_sjt(n - r, 0)) + tuple(c_sja(n - r, 0))
+        rows.append(row)
+
+    return pd.DataFrame(rows, columns=columns)
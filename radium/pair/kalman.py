@@ -0,0 +1,141 @@
+import math
+
+import numpy as np
+
+
+class KalmanHedge:
+    """
+    Kalman filter estimating a time-varying intercept and hedge gradient.
+
+    Models y = intercept + gradient * x + noise, with intercept and gradient
+    following random walks. The filter keeps its state between calls so it can
+    continue as new prices arrive.
+
+    Attributes
+    ----------
+    delta : float
+        Random walk variance of the state relative to its persistence
+    ve : float
+        Variance of the observation noise
+    state : float np.ndarray[2]
+        Current estimate of [intercept, gradient]
+    covariance : float np.ndarray[2][2]
+        Covariance of the current estimate
+    """
+
+    def __init__(self, delta=1e-4, ve=1e-3):
+        """
+        Initialises KalmanHedge class
+
+        Parameters
+        ----------
+        delta : (optional) float
+            Random walk variance of the state relative to its persistence,
+            larger values let the hedge adapt faster, defaults to 1e-4
+        ve : (optional) float
+            Variance of the observation noise, defaults to 1e-3
+
+        Raises
+        ------
+        ValueError
+            If delta isn't in (0, 1) or ve <= 0.
+        """
+
+        if not 0 < delta < 1:
+            raise ValueError('delta must be between 0 and 1')
+        elif ve <= 0:
+            raise ValueError('ve must be > 0')
+
+        self.delta = delta
+        self.ve = ve
+        self.state = np.zeros(2)
+        self.covariance = np.zeros((2, 2))
+
+    def filter(self, y, x):
+        """
+        Updates the state with each pair of prices in turn
+
+        Dates where either price is missing only add state uncertainty.
+
+        Parameters
+        ----------
+        y : float np.ndarray[]
+            Prices of the response equity
+        x : float np.ndarray[]
+            Prices of the explanatory equity
+
+        Returns
+        -------
+        states : float np.ndarray[][2]
+            [intercept, gradient] estimated after each date
+        """
+
+        y = np.asarray(y, dtype=np.float64).tolist()
+        x = np.asarray(x, dtype=np.float64).tolist()
+        states = np.empty((len(y), 2))
+
+        # Unpack state into floats, 2x2 algebra is faster written out
+        vw = self.delta / (1 - self.delta)
+        ve = self.ve
+        a, b = self.state.tolist()
+        (p00, p01), (p10, p11) = self.covariance.tolist()
+
+        for t in range(len(y)):
+            # Predict, the state is a random walk
+            r00 = p00 + vw
+            r01 = p01
+            r10 = p10
+            r11 = p11 + vw
+
+            yt = y[t]
+            xt = x[t]
+            if math.isnan(yt) or math.isnan(xt):
+                p00, p01, p10, p11 = r00, r01, r10, r11
+                states[t, 0] = a
+                states[t, 1] = b
+                continue
+
+            # Update with the observation y = a + b * x
+            rx0 = r00 + r01 * xt
+            rx1 = r10 + r11 * xt
+            q = rx0 + rx1 * xt + ve
+            k0 = rx0 / q
+            k1 = rx1 / q
+
+            error = yt - a - b * xt
+            a += k0 * error
+            b += k1 * error
+
+            xr0 = r00 + xt * r10
+            xr1 = r01 + xt * r11
+            p00 = r00 - k0 * xr0
+            p01 = r01 - k0 * xr1
+            p10 = r10 - k1 * xr0
+            p11 = r11 - k1 * xr1
+
+            states[t, 0] = a
+            states[t, 1] = b
+
+        self.state = np.array([a, b])
+        self.covariance = np.array([[p00, p01], [p10, p11]])
+
+        return states
+
+    def update(self, y, x):
+        """
+        Updates the state with one new pair of prices
+
+        Parameters
+        ----------
+        y : float
+            Price of the response equity
+        x : float
+            Price of the explanatory equity
+
+        Returns
+        -------
+        state : float np.ndarray[2]
+            [intercept, gradient] estimated after the new prices
+        """
+
+        return self.filter([y], [x])[0]
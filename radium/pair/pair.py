@@ -6,7 +6,14 @@ import matplotlib.ticker as ticker
 import statsmodels.formula.api as sm
 
 from radium import Equity
-from radium.helpers import _truncate, _convert_date
+from radium.helpers import (_truncate, _convert_date, _align, _LRUCache,
+                            _GrowingArray, _mackinnonp)
+from ._coint import _rolling_blocks, _rolling_cadf, _rolling_trace
+from ._robust import _rolling_robust
+from ._rolling import (_pair_moments, _johansen_moments, _rolling_ols,
+                       _rolling_tls, _rolling_johansen)
+from .half_life import half_lives, _auto_lookback
+from .kalman import KalmanHedge
 
 
 class Pair:
@@ -23,24 +30,45 @@ class Pair:
     end_date : datetime.date
     hedge_ratios : float np.ndarray[][2]
         Day-wise pairs of hedge ratios
+    kalman : radium.pair.KalmanHedge
+        Filter of the last 'KALMAN' hedge, defined after hedging by 'KALMAN'
+    align : str
+        Missing data policy prices were aligned by
+    dates : pd.DatetimeIndex
+        Dates of the aligned prices
+    prices : float np.ndarray[][2]
+        Aligned closed prices of both equities, read-only
 
     """
 
-    def __init__(self, equity1, equity2):
+    def __init__(self, equity1, equity2, align='inner', cache_size=32):
         """
         Initialise Pair class
 
+        Closed prices of the equities are aligned once here, and every
+        calculation on the pair reads the aligned prices.
+
         Parameters
         ----------
         equity1 : radium.Equity 
         equity2 : radium.Equity 
+        align : (optional) str
+            Missing data policy, 'inner' keeps only dates both equities have
+            a price for, 'ffill' carries the last price forward over dates
+            one equity has no price for, defaults to 'inner'
+        cache_size : (optional) int
+            Number of hedges whose ratios and spreads are cached, defaults
+            to 32
 
         Raises
         ------
         TypeError
             If equity1 or equity2 is not of type radium.Equity.
+            If align isn't a string.
         ValueError
             If equity1 and equity2 do not share any date ranges
+            If align isn't 'inner' or 'ffill'.
+            If cache_size < 0.
         """
         if not isinstance(equity1, Equity):
             raise TypeError('equity1 must of type radium.Equity')
@@ -68,7 +96,25 @@ class Pair:
             raise ValueError("There is no shared date ranges between equity1"
                              "and equity2")
 
-    def hedge(self, method, lookback):
+        self.align = align
+        self._dates, prices = _align([equity1.closed, equity2.closed], align)
+        self._prices = _read_only(prices)
+
+        if len(self._dates) == 0:
+            raise ValueError("equity1 and equity2 have no prices on shared "
+                             "dates")
+
+        # Hedge ratios and spreads already calculated, keyed by method and
+        # parameters
+        self._hedge_cache = _LRUCache(cache_size)
+        self._spread_cache = _LRUCache(cache_size)
+
+        # Buffers extended in place by self.extend, with the object exposed
+        # from each and copies of those read while their rows can change
+        self._rows = {}
+        self._copies = {}
+
+    def hedge(self, method, lookback=None, **kwargs):
         """
         Calculates the hedge_ratios given a method and lookback and stores it
         in self.hedge_ratios
@@ -76,39 +122,436 @@ class Pair:
         Parameters
         ----------
         method : str
-            Method for calculating hedge ratios ('ols')
-        lookback: int
-            Number of signals to lookback on when calculating hedge ratios
+            Method for calculating hedge ratios ('OLS', 'TLS', 'JOHANSEN',
+            'HUBER', 'THEILSEN', 'KALMAN')
+        lookback: (optional) int or str
+            Number of signals to lookback on when calculating hedge ratios,
+            required by every method but 'KALMAN'. 'auto' looks back on the
+            spread's half-life, as self.half_life()
+        **kwargs
+            Parameters of the method, 'HUBER' takes c (threshold in scales,
+            1.345), max_iter (50) and tol (1e-8), 'KALMAN' takes delta and ve
+            as in radium.pair.KalmanHedge. 'HUBER' and 'THEILSEN' also take
+            n_jobs, the number of processes to regress windows in (1, None
+            for every CPU). 'OLS', 'TLS' and 'JOHANSEN' take none
 
         Raises
         ------
         TypeError
             If method isn't a string.
-            If lookback isn't an integer.
+            If lookback isn't an integer or 'auto'.
+            If parameters are given to 'OLS', 'TLS' or 'JOHANSEN'.
         ValueError
             If lookback <= 0.
+            If lookback is 'auto' and the spread doesn't mean revert.
+            If lookback given to a method which doesn't use one.
             If method isn't available.
 
         Notes
         -----
-        Available methods: 'OLS'
+        Available methods: 'OLS', 'TLS', 'JOHANSEN', 'HUBER', 'THEILSEN',
+        'KALMAN'
+
+        'OLS' regresses equity1 on equity2. 'TLS' (orthogonal regression)
+        and 'JOHANSEN' (first cointegrating vector of a VECM with one lagged
+        difference) treat both equities alike, so swapping the equities of
+        a pair gives the same spread up to scale. These are fitted in closed
+        form from rolling moments of the prices.
+
+        'HUBER' (Huber M-estimate by IRLS) and 'THEILSEN' (median of pairwise
+        slopes) are robust to outlying prices, e.g. around earnings, but are
+        regressed window by window rather than from cumulative sums.
+
+        Hedge ratios of lookback methods and their spreads are cached
+        read-only per lookback and parameters, so repeating a lookback, e.g.
+        one from self.hedge_sweep, is a lookup.
+
+        'KALMAN' filters a time-varying intercept and gradient, keeping the
+        filter in self.kalman so it can continue as new prices arrive.
         """
 
         # Exception handling of method
         if not isinstance(method, str):
             raise TypeError('method must be a string')
-        
-        # Exception handling of lookback
-        if not isinstance(lookback, int):
-            raise TypeError('lookback must be an integer.')
-        elif lookback <= 0:
-            raise ValueError('lookback must be > 0')
 
         # Calculate hedge ratios based on the method provided
-        if method == 'OLS':
-            self.hedge_ratios = self._hedge_ols(lookback)
+        if method in _LOOKBACK_METHODS:
+            # Moment methods have no parameters, so any given are mistakes
+            if method in _MOMENT_METHODS and kwargs:
+                raise TypeError(f'{method} takes no parameters, got '
+                                f'{", ".join(sorted(kwargs))}')
+            if isinstance(lookback, str) and lookback == 'auto':
+                lookback = _auto_lookback(self.half_life(), len(self._dates))
+            _check_lookback(lookback)
+            # Processes used don't change the hedge ratios so aren't keyed
+            n_jobs = kwargs.pop('n_jobs', 1)
+            key = _hedge_key(method, lookback, kwargs)
+            hedge_ratios = self._hedge_cache.get(key)
+            if hedge_ratios is None:
+                hedge_ratios = _lookback_hedge_ratios(self._prices, method,
+                                                      lookback, n_jobs,
+                                                      **kwargs)
+                hedge_ratios = _read_only(hedge_ratios)
+                self._hedge_cache.put(key, hedge_ratios)
+            self._set_hedge(key, hedge_ratios)
+        elif method == 'KALMAN':
+            if lookback is not None:
+                raise ValueError('KALMAN does not use a lookback')
+            # Filter is recalculated so self.kalman ends on the last date
+            key = _hedge_key(method, lookback, kwargs)
+            self._set_hedge(key, _read_only(self._hedge_kalman(**kwargs)))
+        else:
+            raise ValueError('Available method strings: "OLS", "TLS", '
+                             '"JOHANSEN", "HUBER", "THEILSEN", "KALMAN"')
+
+    def hedge_sweep(self, method, lookbacks):
+        """
+        Calculates hedge ratios for several lookbacks sharing one set of
+        cumulative sums
+
+        Moments of the prices are summed once for the sweep rather than once
+        per lookback. Windows of each lookback are still differenced and
+        fitted in their own pass over the dates, so the cost grows linearly
+        with the number of lookbacks. Hedge ratios are cached as by
+        self.hedge, which is then a lookup for the swept lookbacks.
+        self.hedge_ratios is left unchanged.
+
+        Parameters
+        ----------
+        method : str
+            Method for calculating hedge ratios ('OLS', 'TLS', 'JOHANSEN')
+        lookbacks : list of int
+            Numbers of signals to lookback on
+
+        Returns
+        -------
+        hedge_ratios : float np.ndarray[][][2]
+            Hedge ratios of each lookback, laid out as by self.hedge
+
+        Raises
+        ------
+        TypeError
+            If method isn't a string.
+            If a lookback isn't an integer.
+        ValueError
+            If a lookback <= 0.
+            If method isn't available.
+        """
+
+        if not isinstance(method, str):
+            raise TypeError('method must be a string')
+        elif method not in _MOMENT_METHODS:
+            raise ValueError('Available method strings: "OLS", "TLS", '
+                             '"JOHANSEN"')
+
+        lookbacks = list(lookbacks)
+        for lookback in lookbacks:
+            _check_lookback(lookback)
+
+        prices = self._prices
+        moments = None
+
+        hedge_ratios = np.empty((len(lookbacks),) + prices.shape)
+        for i, lookback in enumerate(lookbacks):
+            key = _hedge_key(method, lookback, {})
+            ratios = self._hedge_cache.get(key)
+            if ratios is None:
+                # Moments are shared by every lookback not yet cached
+                if moments is None:
+                    moments = _moments(prices, method)
+                ratios = _moment_hedge_ratios(prices, method, lookback,
+                                              moments)
+                ratios = _read_only(ratios)
+                self._hedge_cache.put(key, ratios)
+            hedge_ratios[i] = ratios
+
+        return hedge_ratios
+
+    def extend(self, dates, prices):
+        """
+        Appends new dates of prices, extending the hedge and spread to them
+
+        Only the new dates are calculated, 'OLS' hedges regress just the
+        windows ending on them and 'KALMAN' hedges continue filtering from
+        self.kalman. Dates, prices, hedge ratios and spread are written into
+        buffers whose capacity doubles when full, so a daily update costs
+        amortised O(lookback) rather than a copy of the history. Arrays read
+        before extending never change. Prices and dates are views of rows
+        which are only appended to. Hedge ratios and spread are copied out
+        of their buffers once per extend when read, as the previous last
+        date of each is filled in within the buffer. Cached
+        hedges of other parameters are discarded, hedge ratios set directly
+        are deleted as they can't be extended.
+
+        Parameters
+        ----------
+        dates : array-like of datetime64
+            New dates, sorted earliest first and after self.dates
+        prices : float np.ndarray[][2]
+            Closed prices of both equities on the new dates, missing prices
+            are handled by self.align
+
+        Raises
+        ------
+        ValueError
+            If prices isn't of shape (len(dates), 2).
+            If dates aren't sorted or aren't after self.dates.
+        """
+
+        dates = pd.DatetimeIndex(dates)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        if prices.shape != (len(dates), 2):
+            raise ValueError('prices must be of shape (dates, 2)')
+        elif not (dates.is_monotonic_increasing and dates.is_unique):
+            raise ValueError('dates must be sorted earliest first')
+        elif len(dates) > 0 and dates.values[0] <= self._dates.values[-1]:
+            raise ValueError('dates must be after Pair.dates')
+
+        # Apply the missing data policy to the new prices
+        if self.align == 'ffill':
+            prices = np.vstack([self._prices[-1:], prices])
+            prices = pd.DataFrame(prices).ffill().to_numpy()[1:]
         else:
-            raise ValueError('Available method strings: "OLS"')
+            valid = ~np.isnan(prices).any(axis=1)
+            dates = dates[valid]
+            prices = prices[valid]
+
+        if len(dates) == 0:
+            return
+
+        n = self._prices.shape[0]
+        self._dates = self._append_rows('dates', self._dates, dates.values,
+                                        wrap=_date_index)
+        self._prices = self._append_rows('prices', self._prices, prices)
+        self.end_date = self._dates[-1].date()
+
+        # Other hedges no longer cover every date
+        self._hedge_cache.clear()
+        self._spread_cache.clear()
+        if hasattr(self, '_half_life'):
+            del self._half_life
+
+        if hasattr(self, '_hedge_ratios') == False:
+            return
+        elif self._hedge_key is None:
+            del self.hedge_ratios
+            return
+
+        method = self._hedge_key[0]
+        if method in _LOOKBACK_METHODS:
+            # Window ending on the previous last date is now used too, so
+            # regress windows ending on it onwards
+            lookback = self._hedge_key[1]
+            params = dict(self._hedge_key[2:])
+            first = n - 1
+            start = max(0, n - lookback)
+            tail = _lookback_hedge_ratios(self._prices[start:], method,
+                                          lookback, **params)
+            tail = tail[first - start:]
+        else:
+            first = n
+            states = self.kalman.filter(prices[:, 0], prices[:, 1])
+            tail = np.ones(prices.shape)
+            tail[:, 1] = -1 * states[:, 1]
+
+        hedge_ratios = self._append_rows('hedge_ratios', self._hedge_ratios,
+                                         tail, first)
+
+        price_spread = None
+        if hasattr(self, '_price_spread'):
+            spread = np.sum(tail * self._prices[first:], axis=1)
+            dates = self._dates
+            price_spread = self._append_rows(
+                'price_spread', self._price_spread, spread, first,
+                lambda values: pd.Series(values, index=dates, copy=False))
+
+        key = self._hedge_key
+        if method in _LOOKBACK_METHODS:
+            self._hedge_cache.put(key, hedge_ratios)
+        self._set_hedge(key, hedge_ratios)
+
+        if price_spread is not None:
+            self._price_spread = price_spread
+            self._spread_cache.put(key, price_spread)
+
+    def rolling_cadf(self, window, step=1, lag=1, n_jobs=1):
+        """
+        Conducts Cointegrated Augmented Dickey Fuller Tests over rolling
+        windows
+
+        Each window's test is statsmodels' coint(y, x, maxlag=lag,
+        autolag=None) of its prices. With a fixed lag every window's
+        regressions are solved from cumulative sums shared by overlapping
+        windows rather than refitted.
+
+        Parameters
+        ----------
+        window : int
+            Number of signals in each window
+        step : (optional) int
+            Number of signals between the ends of windows, defaults to 1
+        lag : (optional) int
+            Number of lagged differences in the ADF regressions, defaults
+            to 1
+        n_jobs : (optional) int or None
+            Number of processes to test blocks of windows in, None uses
+            every CPU, defaults to 1
+
+        Returns
+        -------
+        results : pd.DataFrame
+            Row per window indexed by its last date with columns statistic
+            and pvalue, critical values are those of cadf_test on a window
+
+        Raises
+        ------
+        TypeError
+            If window, step, lag or n_jobs isn't an integer.
+        ValueError
+            If window, step or n_jobs <= 0.
+            If lag < 0 or lag > window // 2 - 1.
+        """
+
+        _check_lookback(window)
+        _check_step(step)
+
+        if not isinstance(lag, int):
+            raise TypeError('lag must be an integer')
+        elif lag < 0 or lag > window // 2 - 1:
+            raise ValueError('lag must be between 0 and window // 2 - 1')
+
+        dates = self._dates[window - 1::step]
+        if len(dates) == 0:
+            return pd.DataFrame(columns=['statistic', 'pvalue'], index=dates)
+
+        statistic, _ = _rolling_blocks(_rolling_cadf, self._prices, window,
+                                       step, n_jobs, lag)
+
+        return pd.DataFrame({'statistic': statistic,
+                             'pvalue': _mackinnonp(statistic)}, index=dates)
+
+    def rolling_johansen(self, window, step=1, n_jobs=1):
+        """
+        Conducts Johansen Tests over rolling windows
+
+        Each window's test is statsmodels' coint_johansen(prices,
+        det_order=0, k_ar_diff=1) of its prices, with every window's
+        eigenproblem solved together from cumulative sums shared by
+        overlapping windows.
+
+        Parameters
+        ----------
+        window : int
+            Number of signals in each window
+        step : (optional) int
+            Number of signals between the ends of windows, defaults to 1
+        n_jobs : (optional) int or None
+            Number of processes to test blocks of windows in, None uses
+            every CPU, defaults to 1
+
+        Returns
+        -------
+        results : pd.DataFrame
+            Row per window indexed by its last date with columns
+            trace_stat_0, trace_stat_1, eigen_stat_0 and eigen_stat_1 for
+            each rank, critical values are those of johansen_test
+
+        Raises
+        ------
+        TypeError
+            If window, step or n_jobs isn't an integer.
+        ValueError
+            If window, step or n_jobs <= 0.
+        """
+
+        _check_lookback(window)
+        _check_step(step)
+
+        columns = ['trace_stat_0', 'trace_stat_1', 'eigen_stat_0',
+                   'eigen_stat_1']
+        dates = self._dates[window - 1::step]
+        if len(dates) == 0:
+            return pd.DataFrame(columns=columns, index=dates)
+
+        trace_stat, eigen_stat = _rolling_blocks(_rolling_trace, self._prices,
+                                                 window, step, n_jobs)
+
+        return pd.DataFrame(np.concatenate([trace_stat, eigen_stat], axis=1),
+                            columns=columns, index=dates)
+
+    def half_life(self):
+        """
+        Half-life of mean reversion of the pair's spread
+
+        The spread is equity1 less the full sample OLS gradient times
+        equity2, fitted as an Ornstein-Uhlenbeck process as by
+        radium.pair.half_lives. The half-life is used as the lookback of
+        hedges and strategies given lookback='auto'.
+
+        Returns
+        -------
+        half_life : float
+            Half-life in dates, inf if the spread doesn't mean revert
+        """
+
+        if hasattr(self, '_half_life') == False:
+            y = self._prices[:, 0]
+            x = self._prices[:, 1]
+            xc = x - x.mean()
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                beta = np.dot(xc, y - y.mean()) / np.dot(xc, xc)
+
+            self._half_life = half_lives(y - beta * x)
+
+        return self._half_life
+
+    @property
+    def hedge_ratios(self):
+        """
+        float np.ndarray[][2] : Day-wise pairs of hedge ratios
+
+        Setting or deleting hedge ratios discards the spread of the previous
+        ones.
+        """
+
+        if hasattr(self, '_hedge_ratios') == False:
+            raise AttributeError('Pair.hedge_ratios is not defined.')
+
+        return self._copy_out('hedge_ratios', self._hedge_ratios)
+
+    @hedge_ratios.setter
+    def hedge_ratios(self, hedge_ratios):
+        # Ratios set directly aren't cached as their parameters are unknown
+        self._set_hedge(None, hedge_ratios)
+
+    @hedge_ratios.deleter
+    def hedge_ratios(self):
+        if hasattr(self, '_hedge_ratios') == False:
+            raise AttributeError('Pair.hedge_ratios is not defined.')
+
+        del self._hedge_ratios
+        self._hedge_key = None
+        if hasattr(self, '_price_spread'):
+            del self._price_spread
+
+    @property
+    def dates(self):
+        """
+        pd.DatetimeIndex : Dates of the aligned prices
+        """
+
+        return self._dates
+
+    @property
+    def prices(self):
+        """
+        float np.ndarray[][2] : Aligned closed prices of both equities,
+        read-only
+        """
+
+        return self._prices
 
     @property
     def price_spread(self):
@@ -125,20 +568,19 @@ class Pair:
         Spread calculated using y = h1*y1 + h2*y2.
         """
 
-        if hasattr(self, 'hedge_ratios') == False:
+        if hasattr(self, '_hedge_ratios') == False:
             raise Exception('Pair.hedge_ratios is not defined.')
 
         # Calculate price_spread if undefined
         if hasattr(self, '_price_spread') == False:
-            # Construct dataframe of closed prices
-            prices = pd.concat([self.equity1.closed, self.equity2.closed],
-                                axis=1)
-            prices.columns = [self.equity1.symbol, self.equity2.symbol]
-
             # Multiply and add for each date
-            self._price_spread = np.sum(self.hedge_ratios * prices, axis=1)
+            price_spread = np.sum(self._hedge_ratios * self._prices, axis=1)
+            self._price_spread = pd.Series(price_spread, index=self._dates)
 
-        return self._price_spread
+            if self._hedge_key is not None:
+                self._spread_cache.put(self._hedge_key, self._price_spread)
+
+        return self._copy_out('price_spread', self._price_spread)
 
     def budget(self, hedge_ratio, dec):
         """
@@ -179,11 +621,10 @@ class Pair:
             raise ValueError('Decimal places has to be >= 0.')
 
         # Get the prices at end_date
-        equity1_price = self.equity1.closed.iloc[-1]
-        equity2_price = self.equity2.closed.iloc[-1]
+        equity1_price, equity2_price = self._prices[-1]
 
         # Calculate truncated ratios to given number of decimals 
-        truncated_ratios = np.array([_truncate(n, dec) for n in hedge_ratio])
+        truncated_ratios = _truncate(hedge_ratio, dec)
 
         # Calculate budget to buy integer number of equites
         budget = equity1_price * abs(truncated_ratios[0]) * 10 ** dec \
@@ -194,6 +635,51 @@ class Pair:
 
         return budget
 
+    def budget_series(self, dec):
+        """
+        Calculates budget needed to buy integer number of equities on each
+        date for self.hedge_ratios.
+
+        Parameters
+        ----------
+        dec : int
+            Number of decimals to truncate hedge ratios to
+
+        Returns
+        -------
+        budget : pd.Series
+            Budget needed on each date truncated to 2 d.p., indexed by
+            self.dates
+
+        Raises
+        -----
+        Exception
+            If self.hedge_ratios isn't defined.
+        TypeError
+            If dec isnt an integer.
+        ValueError
+            If dec < 0.
+
+        See Also
+        --------
+        Pair.budget : Budget for one pair of hedge ratios at end_date
+        """
+
+        if hasattr(self, '_hedge_ratios') == False:
+            raise Exception('Pair.hedge_ratios is not defined.')
+
+        if not isinstance(dec, int):
+            raise TypeError('Decimal places must be an integer.')
+        elif dec < 0:
+            raise ValueError('Decimal places has to be >= 0.')
+
+        # Integer number of equities held on each date
+        units = np.abs(_truncate(self._hedge_ratios, dec)) * 10 ** dec
+
+        budget = _truncate(np.sum(units * self._prices, axis=1), 2)
+
+        return pd.Series(budget, index=self._dates)
+
     def plot_closed(self, start_date=None, end_date=None):
         """
         Plots closed prices of both equities between two dates as a line graph
@@ -231,15 +717,9 @@ class Pair:
             raise ValueError('end_date can\'t be after pair.end_date')
 
         # Gets required range only for both equities
-        equity1_closed = self.equity1.closed
-        mask = (equity1_closed.index >= start_date) \
-               & (equity1_closed.index <= end_date)
-        equity1_closed = equity1_closed.loc[mask]
-
-        equity2_closed = self.equity2.closed
-        mask = (equity2_closed.index >= start_date) \
-               & (equity2_closed.index <= end_date)
-        equity2_closed = equity2_closed.loc[mask]
+        column = "5. adjusted close"
+        equity1_closed = self.equity1.window(start_date, end_date)[column]
+        equity2_closed = self.equity2.window(start_date, end_date)[column]
 
         fig, ax = plt.subplots()
         plt.plot(equity1_closed, label=self.equity1.symbol)
@@ -272,7 +752,7 @@ class Pair:
         if hasattr(self, '_hedge_ratios') == False:
             raise Exception('Pair.hedge_ratios is not defined.')
 
-        dates = self.equity1.closed.index.values
+        dates = self._dates
         price_spread = self.price_spread
 
         plt.plot(dates, price_spread)
@@ -285,11 +765,159 @@ class Pair:
         plt.grid()
         plt.show()
 
+    def _append_rows(self, name, current, values, start=None, wrap=None):
+        """
+        Writes rows into the buffer of an extended attribute
+
+        The buffer is reused while current is still the object last exposed
+        from it, otherwise one is started from current.
+
+        Parameters
+        ----------
+        name : str
+            Name of the buffer
+        current : np.ndarray or pd.Index or pd.Series
+            Current value of the attribute
+        values : np.ndarray
+            Rows to write
+        start : (optional) int
+            First row to write, defaults to appending
+        wrap : (optional) callable
+            Builds the exposed object from a read-only view of the rows,
+            defaults to exposing the view
+
+        Returns
+        -------
+        exposed : np.ndarray or pd.Index or pd.Series
+            New value of the attribute
+        """
+
+        rows, exposed = self._rows.get(name, (None, None))
+        if exposed is not current:
+            rows = _GrowingArray(np.asarray(current))
+
+        exposed = rows.append(values, start)
+        if wrap is not None:
+            exposed = wrap(exposed)
+
+        self._rows[name] = (rows, exposed)
+        self._copies.pop(name, None)
+
+        return exposed
+
+    def _copy_out(self, name, current):
+        """
+        Copies an extended attribute when read, if it views its buffer
+
+        Rows of hedge ratios and spreads are rewritten in their buffers by the
+        next extend, so views of them aren't returned. Copies are kept until
+        the buffer is written again.
+
+        Parameters
+        ----------
+        name : str
+            Name of the buffer
+        current : np.ndarray or pd.Series
+            Current value of the attribute
+
+        Returns
+        -------
+        value : np.ndarray or pd.Series
+            current, or a copy if it's the object exposed from the buffer
+        """
+
+        rows, exposed = self._rows.get(name, (None, None))
+        if exposed is not current:
+            return current
+
+        if name not in self._copies:
+            if isinstance(current, pd.Series):
+                self._copies[name] = current.copy()
+            else:
+                self._copies[name] = _read_only(current.copy())
+
+        return self._copies[name]
+
+    def _set_hedge(self, key, hedge_ratios):
+        """
+        Sets hedge ratios, restoring their spread if cached
+
+        Parameters
+        ----------
+        key : tuple or None
+            Cache key of the hedge ratios, None if they aren't cached
+        hedge_ratios : float np.ndarray[][2]
+        """
+
+        self._hedge_ratios = hedge_ratios
+        self._hedge_key = key
+
+        price_spread = None
+        if key is not None:
+            price_spread = self._spread_cache.get(key)
+
+        if price_spread is not None:
+            self._price_spread = price_spread
+        elif hasattr(self, '_price_spread'):
+            del self._price_spread
+
     def _hedge_ols(self, lookback):
         """
         Calculate pair hedge ratios by OLS regression.
 
         self.equity1 will be used as response variable when regressing.
+        Regressions of all windows are computed together from cumulative sums
+        of the prices, their squares and products.
+
+        Parameters
+        ----------
+        lookback : int
+            Number of signals to lookback on when regressing.
+
+        Returns 
+        -------
+        hedge_ratios : float np.ndarray[][2]
+            Hedge ratios as [[1, -1*(OLS gradient)],...].
+        """
+
+        return _moment_hedge_ratios(self._prices, 'OLS', lookback)
+
+    def _hedge_kalman(self, delta=1e-4, ve=1e-3):
+        """
+        Calculate pair hedge ratios by Kalman filtering the OLS gradient.
+
+        self.equity1 will be used as response variable, the filter is stored
+        in self.kalman.
+
+        Parameters
+        ----------
+        delta : (optional) float
+            Random walk variance of the state relative to its persistence
+        ve : (optional) float
+            Variance of the observation noise
+
+        Returns
+        -------
+        hedge_ratios : float np.ndarray[][2]
+            Hedge ratios as [[1, -1*(filtered gradient)],...].
+        """
+
+        prices = self._prices
+
+        self.kalman = KalmanHedge(delta, ve)
+        states = self.kalman.filter(prices[:, 0], prices[:, 1])
+
+        # Ratios after each date's update are stored on that date
+        hedge_ratios = np.ones(prices.shape)
+        hedge_ratios[:, 1] = -1 * states[:, 1]
+
+        return hedge_ratios
+
+    def _hedge_ols_reference(self, lookback):
+        """
+        Calculate pair hedge ratios by a statsmodels OLS fit of each window.
+
+        Slow reference implementation used to validate self._hedge_ols.
 
         Parameters
         ----------
@@ -303,8 +931,8 @@ class Pair:
         """
 
         # Construct dataframe of closed prices
-        df = pd.concat([self.equity1.closed, self.equity2.closed], axis=1)
-        df.columns = [self.equity1.symbol, self.equity2.symbol]
+        df = pd.DataFrame(self._prices, index=self._dates,
+                          columns=[self.equity1.symbol, self.equity2.symbol])
 
         # Get ols regression result for each date
         hedge_ratios = np.zeros(df.shape)
@@ -315,6 +943,234 @@ class Pair:
 
             # Hedge ratio for equity2 is -1*(OLS gradient)
             hedge_ratios[i - 1][0] = 1
-            hedge_ratios[i - 1][1] = -1*ols.params[1]
+            hedge_ratios[i - 1][1] = -1*ols.params.iloc[1]
 
         return hedge_ratios
+
+
+def _check_lookback(lookback):
+    """
+    Raises an error if a lookback isn't a positive integer
+
+    Parameters
+    ----------
+    lookback : int
+
+    Raises
+    ------
+    TypeError
+        If lookback isn't an integer.
+    ValueError
+        If lookback <= 0.
+    """
+
+    if not isinstance(lookback, int):
+        raise TypeError('lookback must be an integer.')
+    elif lookback <= 0:
+        raise ValueError('lookback must be > 0')
+
+
+def _check_step(step):
+    """
+    Raises an error if a step between windows isn't a positive integer
+
+    Parameters
+    ----------
+    step : int
+
+    Raises
+    ------
+    TypeError
+        If step isn't an integer.
+    ValueError
+        If step <= 0.
+    """
+
+    if not isinstance(step, int):
+        raise TypeError('step must be an integer')
+    elif step <= 0:
+        raise ValueError('step must be > 0')
+
+
+def _moment_hedge_ratios(prices, method, lookback, moments=None):
+    """
+    Hedge ratios of windows fitted in closed form from rolling moments
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    method : str
+        'OLS' or 'TLS' fits of the first prices on the second, or
+        'JOHANSEN' for the first cointegrating vector
+    lookback : int
+        Number of signals to lookback on when regressing.
+    moments : (optional)
+        Cumulative sums of the prices' moments if already computed, as
+        _moments(prices, method)
+
+    Returns
+    -------
+    hedge_ratios : float np.ndarray[][2]
+        Hedge ratios as [[1, -1*(gradient)],...].
+    """
+
+    if lookback >= prices.shape[0]:
+        return np.zeros(prices.shape)
+
+    if method == 'OLS':
+        _, beta = _rolling_ols(prices[:, 0], prices[:, 1], lookback, moments)
+    elif method == 'TLS':
+        _, beta = _rolling_tls(prices[:, 0], prices[:, 1], lookback, moments)
+    else:
+        # Cointegrating vector scaled to hold one of the first equity
+        _, eigenvectors, _ = _rolling_johansen(prices, lookback, moments)
+        vector = eigenvectors[:, :, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = -1 * vector[:, 1] / vector[:, 0]
+
+    # Window ending on the last date is left unused
+    return _window_hedge_ratios(beta[:-1], lookback, prices.shape)
+
+
+def _moments(prices, method):
+    """
+    Cumulative sums of the prices' moments a closed form method fits from
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    method : str
+        'OLS', 'TLS' or 'JOHANSEN'
+
+    Returns
+    -------
+    moments
+    """
+
+    if method == 'JOHANSEN':
+        return _johansen_moments(prices)
+
+    return _pair_moments(prices[:, 0], prices[:, 1])
+
+
+def _lookback_hedge_ratios(prices, method, lookback, n_jobs=1, **kwargs):
+    """
+    Hedge ratios of regressions of the first prices on the second over
+    trailing windows
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][2]
+        Prices with a row per date
+    method : str
+        'OLS', 'TLS', 'JOHANSEN', 'HUBER' or 'THEILSEN'
+    lookback : int
+        Number of signals to lookback on when regressing.
+    n_jobs : (optional) int or None
+        Number of processes for robust methods, defaults to 1
+    **kwargs
+        Parameters of robust methods, moment methods take none
+
+    Returns
+    -------
+    hedge_ratios : float np.ndarray[][2]
+        Hedge ratios as [[1, -1*(gradient)],...].
+    """
+
+    if method in _MOMENT_METHODS:
+        return _moment_hedge_ratios(prices, method, lookback)
+
+    beta = _rolling_robust(prices, method, lookback, n_jobs, **kwargs)
+
+    return _window_hedge_ratios(beta, lookback, prices.shape)
+
+
+def _window_hedge_ratios(beta, lookback, shape):
+    """
+    Lays out gradients of windows as hedge ratios
+
+    Parameters
+    ----------
+    beta : float np.ndarray[]
+        Gradients of the windows ending at dates lookback-1 onwards
+    lookback : int
+        Number of dates in each window
+    shape : tuple of int
+        Shape of the hedge ratios
+
+    Returns
+    -------
+    hedge_ratios : float np.ndarray[][2]
+        Hedge ratios as [[1, -1*(gradient)],...], zero on dates without a
+        gradient
+    """
+
+    hedge_ratios = np.zeros(shape)
+
+    # Ratios of the window ending on a date are stored on that date
+    rows = slice(lookback - 1, lookback - 1 + beta.shape[0])
+    hedge_ratios[rows, 0] = 1
+    hedge_ratios[rows, 1] = -1 * beta
+
+    return hedge_ratios
+
+
+# Methods fitting windows of a lookback, those fitted from rolling moments
+# can be swept
+_MOMENT_METHODS = ('OLS', 'TLS', 'JOHANSEN')
+_LOOKBACK_METHODS = _MOMENT_METHODS + ('HUBER', 'THEILSEN')
+
+
+def _hedge_key(method, lookback, kwargs):
+    """
+    Key of hedge ratios in the cache
+
+    Parameters
+    ----------
+    method : str
+    lookback : int or None
+    kwargs : dict
+        Parameters of the method
+
+    Returns
+    -------
+    key : tuple
+    """
+
+    return (method, lookback) + tuple(sorted(kwargs.items()))
+
+
+def _date_index(dates):
+    """
+    Dates as an index viewing the same array
+
+    Parameters
+    ----------
+    dates : datetime64 np.ndarray[]
+
+    Returns
+    -------
+    dates : pd.DatetimeIndex
+    """
+
+    return pd.DatetimeIndex(dates, copy=False)
+
+
+def _read_only(array):
+    """
+    Marks an array read-only so cached results can be shared
+
+    Parameters
+    ----------
+    array : np.ndarray
+
+    Returns
+    -------
+    array : np.ndarray
+    """
+
+    array.flags.writeable = False
+
+    return array
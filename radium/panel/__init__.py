@@ -0,0 +1 @@
+from .panel import PricePanel
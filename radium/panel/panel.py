@@ -0,0 +1,381 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from radium import Equity, Pair
+from radium.equity import DataSource
+from radium.equity.equity import _date_slice
+from radium.helpers import _convert_date
+
+
+class PricePanel(DataSource):
+    """
+    Prices of many equities on a shared trading calendar.
+
+    Prices are held as one float array with a row per symbol, optionally
+    memory-mapped from a directory so the panel is not held in RAM and can be
+    shared between processes without copying. Dates a symbol has no price for
+    are NaN.
+
+    As a radium.equity.DataSource, equities and pairs can be built as views
+    of the panel. Only the panel's column of signals is available to them.
+
+    Attributes
+    ----------
+    symbols : list of str
+        Symbol of each row of values
+    dates : pd.DatetimeIndex
+        Shared trading calendar, sorted earliest first
+    values : float np.ndarray[][]
+        Prices with a row per symbol and a column per date
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per symbol, a view of values
+    column : str
+        Signal held, e.g. '5. adjusted close'
+    path : pathlib.Path or None
+        Directory values are memory-mapped from
+    """
+
+    # Prices are already shared so aren't copied into the symbol store
+    memoize = False
+
+    def __init__(self, symbols, dates, values, column="5. adjusted close",
+                 path=None):
+        """
+        Initialises PricePanel class
+
+        Parameters
+        ----------
+        symbols : list of str
+            Symbol of each row of values
+        dates : array-like of datetime64
+            Shared trading calendar, sorted earliest first
+        values : float np.ndarray[][]
+            Prices with a row per symbol and a column per date
+        column : (optional) str
+            Signal held, defaults to '5. adjusted close'
+        path : (optional) str or pathlib.Path
+            Directory values are memory-mapped from
+
+        Raises
+        ------
+        ValueError
+            If values isn't of shape (len(symbols), len(dates)).
+            If symbols aren't unique.
+        """
+
+        symbols = list(symbols)
+        dates = pd.DatetimeIndex(dates)
+
+        if values.shape != (len(symbols), len(dates)):
+            raise ValueError('values must be of shape (symbols, dates)')
+        elif len(set(symbols)) != len(symbols):
+            raise ValueError('symbols must be unique')
+
+        self.symbols = symbols
+        self.dates = dates
+        self.values = values
+        self.column = column
+        self.path = None if path is None else Path(path)
+
+        self._rows = {symbol: i for i, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_equities(cls, equities, path=None, column="5. adjusted close"):
+        """
+        Builds a panel from the prices of equities
+
+        Parameters
+        ----------
+        equities : list of radium.Equity
+        path : (optional) str or pathlib.Path
+            Directory to memory-map the panel to, defaults to holding the
+            panel in memory
+        column : (optional) str
+            Signal to hold, defaults to '5. adjusted close'
+
+        Returns
+        -------
+        panel : radium.PricePanel
+
+        Raises
+        ------
+        TypeError
+            If equities aren't of type radium.Equity.
+        """
+
+        series = {}
+        for equity in equities:
+            if not isinstance(equity, Equity):
+                raise TypeError('equities must be of type radium.Equity')
+
+            prices = equity.data[column]
+            series[equity.symbol] = (prices.index.values, prices.to_numpy())
+
+        return cls._build(series, path, column)
+
+    @classmethod
+    def from_source(cls, source, symbols, start_date, end_date, path=None,
+                    column="5. adjusted close"):
+        """
+        Builds a panel from the signals of symbols between two dates
+
+        Only the panel's column of each symbol is kept while building, so
+        large universes can be built without holding every equity.
+
+        Parameters
+        ----------
+        source : radium.equity.DataSource
+            Source to read daily signals from
+        symbols : list of str
+            Symbols for equities as found on exchange
+        start_date : str or datetime or datetime.date
+            First date of interest in YYYY-MM-DD form
+        end_date : str of datetime or datetime.date
+            Last date of interest in YYYY-MM-DD form
+        path : (optional) str or pathlib.Path
+            Directory to memory-map the panel to, defaults to holding the
+            panel in memory
+        column : (optional) str
+            Signal to hold, defaults to '5. adjusted close'
+
+        Returns
+        -------
+        panel : radium.PricePanel
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+            End date is same as or before start date
+        RuntimeError
+            API Call limit reached
+        """
+
+        start_date = _convert_date(start_date)
+        end_date = _convert_date(end_date)
+
+        if end_date <= start_date:
+            raise ValueError("end_date is the same as or before start_date")
+
+        series = {}
+        for symbol in symbols:
+            df = source.daily(symbol)
+            prices = df.iloc[_date_slice(df.index, start_date, end_date)]
+            prices = prices[column]
+            series[symbol] = (prices.index.values,
+                              prices.to_numpy(dtype=np.float64, copy=True))
+
+        return cls._build(series, path, column)
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """
+        Opens a panel previously memory-mapped to a directory
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Directory the panel was memory-mapped to
+        mode : (optional) str
+            'r' for read-only, 'r+' to allow writing, defaults to 'r'
+
+        Returns
+        -------
+        panel : radium.PricePanel
+        """
+
+        path = Path(path)
+
+        with np.load(path / "meta.npz", allow_pickle=False) as meta:
+            symbols = [str(symbol) for symbol in meta["symbols"]]
+            dates = meta["dates"]
+            column = str(meta["column"])
+
+        values = np.load(path / "prices.npy", mmap_mode=mode)
+
+        return cls(symbols, dates, values, column, path)
+
+    @classmethod
+    def _build(cls, series, path, column):
+        """
+        Builds a panel aligning prices of symbols on the union of their dates
+
+        Parameters
+        ----------
+        series : dict of str to tuple of (datetime64 np.ndarray[],
+                 float np.ndarray[])
+            Dates and prices of each symbol
+        path : str or pathlib.Path or None
+            Directory to memory-map the panel to
+        column : str
+            Signal held
+
+        Returns
+        -------
+        panel : radium.PricePanel
+        """
+
+        symbols = list(series)
+
+        # Shared calendar of every date any symbol has a price for
+        dates = [np.asarray(d, dtype="datetime64[D]")
+                 for d, _ in series.values()]
+        if len(dates) > 0:
+            calendar = np.unique(np.concatenate(dates))
+        else:
+            calendar = np.array([], dtype="datetime64[D]")
+        shape = (len(symbols), calendar.shape[0])
+
+        if path is None:
+            values = np.empty(shape)
+        else:
+            path = Path(path)
+            path.mkdir(parents=True, exist_ok=True)
+            np.savez(path / "meta.npz", symbols=np.array(symbols, dtype=str),
+                     dates=calendar, column=np.array(column))
+            values = np.lib.format.open_memmap(path / "prices.npy", mode="w+",
+                                               dtype=np.float64, shape=shape)
+
+        # Place each symbol's prices on the calendar
+        values[:] = np.nan
+        for i, (_, prices) in enumerate(series.values()):
+            values[i, np.searchsorted(calendar, dates[i])] = prices
+
+        if path is not None:
+            values.flush()
+
+        return cls(symbols, calendar, values, column, path)
+
+    @property
+    def prices(self):
+        """
+        float np.ndarray[][] : Prices with a row per date and a column per
+        symbol, a view of values
+        """
+
+        return self.values.T
+
+    def row(self, symbol):
+        """
+        Row of values holding a symbol's prices
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        row : int
+
+        Raises
+        ------
+        ValueError
+            Symbol not in panel
+        """
+
+        try:
+            return self._rows[symbol]
+        except KeyError:
+            raise ValueError(f"{symbol} is not in the panel")
+
+    def daily(self, symbol):
+        """
+        Gets the panel's signals of an equity as a view of the panel
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+
+        Returns
+        -------
+        ret : pd.DataFrame Dataframe containing the panel's column of
+        signals with date as an index, sorted earliest first.
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+        """
+
+        try:
+            i = self._rows[symbol]
+        except KeyError:
+            raise ValueError("Equity Symbol does not exist")
+
+        # Row of a symbol is contiguous so can be viewed as a column
+        values = np.asarray(self.values[i]).reshape(-1, 1)
+
+        return pd.DataFrame(values, index=self.dates, columns=[self.column],
+                            copy=False)
+
+    def equity(self, symbol, start_date=None, end_date=None):
+        """
+        Builds an equity viewing the panel's prices of a symbol
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol for equity as found on exchange
+        start_date : (optional) str or datetime or datetime.date
+            First date of interest in YYYY-MM-DD form, defaults to the first
+            date of the panel
+        end_date : (optional) str of datetime or datetime.date
+            Last date of interest in YYYY-MM-DD form, defaults to the last
+            date of the panel
+
+        Returns
+        -------
+        equity : radium.Equity
+
+        Raises
+        ------
+        ValueError
+            Equity symbol does not exist
+            End date is same as or before start date
+        """
+
+        if start_date is None:
+            start_date = self.dates[0].date()
+        if end_date is None:
+            end_date = self.dates[-1].date()
+
+        return Equity(symbol, start_date, end_date, source=self)
+
+    def pair(self, symbol1, symbol2, start_date=None, end_date=None):
+        """
+        Builds a pair of equities viewing the panel's prices
+
+        Parameters
+        ----------
+        symbol1 : str
+        symbol2 : str
+        start_date : (optional) str or datetime or datetime.date
+            First date of interest in YYYY-MM-DD form, defaults to the first
+            date of the panel
+        end_date : (optional) str of datetime or datetime.date
+            Last date of interest in YYYY-MM-DD form, defaults to the last
+            date of the panel
+
+        Returns
+        -------
+        pair : radium.Pair
+        """
+
+        return Pair(self.equity(symbol1, start_date, end_date),
+                    self.equity(symbol2, start_date, end_date))
+
+    def __reduce__(self):
+        # Memory-mapped panels are reopened from their directory when
+        # unpickled, e.g. in worker processes, rather than copied
+        if self.path is None:
+            return (PricePanel, (self.symbols, self.dates, self.values,
+                                 self.column))
+
+        return (PricePanel.open, (self.path,))
+
+    def __len__(self):
+        return len(self.symbols)
@@ -0,0 +1,2 @@
+from .engle_granger import screen_pairs
+from .prefilter import prefilter_pairs, PrefilterResult
@@ -0,0 +1,231 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa import adfvalues
+
+from radium.equity.equity import _date_slice
+from radium.helpers import _convert_date, _mackinnonp
+from radium.pair._coint import (_engle_granger, _default_maxlag,
+                                _CHUNK_ELEMENTS)
+from radium.panel import PricePanel
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8, prices are copied to each worker instead
+    shared_memory = None
+
+# Prices read by a pool's worker process, set by _init_worker
+_worker_prices = None
+_worker_memory = None
+
+
+def screen_pairs(panel, pairs=None, start_date=None, end_date=None,
+                 maxlag=None, n_jobs=1):
+    """
+    Engle-Granger cointegration tests of many pairs of a panel at once
+
+    Gives the same results as statsmodels' coint(y0, y1) of each pair, which
+    cadf_test uses, with the ADF lag chosen by AIC. Regressions of every pair
+    in a chunk are solved together from their moment matrices and chunks are
+    spread over a process pool when n_jobs > 1. Only dates where every
+    symbol screened has a price are used, so every pair shares one sample.
+
+    Parameters
+    ----------
+    panel : radium.PricePanel
+    pairs : (optional) list of tuple of (str, str)
+        Pairs of symbols to test, the first regressed on the second, defaults
+        to every two symbols of the panel in panel order
+    start_date : (optional) str or datetime or datetime.date
+        First date of interest in YYYY-MM-DD form, defaults to the first
+        date of the panel
+    end_date : (optional) str or datetime or datetime.date
+        Last date of interest in YYYY-MM-DD form, defaults to the last date
+        of the panel
+    maxlag : (optional) int
+        Largest number of lagged differences in the ADF regressions, defaults
+        to statsmodels' 12 * (nobs / 100) ** (1 / 4)
+    n_jobs : (optional) int or None
+        Number of processes, None uses every CPU, defaults to 1
+
+    Returns
+    -------
+    results : pd.DataFrame
+        Row per pair ranked by p-value with columns symbol1, symbol2,
+        statistic, pvalue, hedge_ratio (gradient of symbol1 on symbol2), lags
+        (lagged differences chosen), nobs and the crit_1, crit_5, crit_10
+        critical values
+
+    Raises
+    ------
+    TypeError
+        If panel is not of type radium.PricePanel.
+        If maxlag or n_jobs isn't an integer.
+    ValueError
+        If a symbol isn't in the panel.
+        If maxlag < 0 or n_jobs < 1.
+        If too few dates have a price for every symbol.
+    """
+
+    if not isinstance(panel, PricePanel):
+        raise TypeError('panel must be of type radium.PricePanel')
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    elif not isinstance(n_jobs, int):
+        raise TypeError('n_jobs must be an integer or None')
+    elif n_jobs < 1:
+        raise ValueError('n_jobs must be >= 1')
+
+    # Rows of the panel each pair regresses
+    if pairs is None:
+        first, second = np.triu_indices(len(panel), k=1)
+    else:
+        pairs = list(pairs)
+        first = np.array([panel.row(s1) for s1, _ in pairs], dtype=int)
+        second = np.array([panel.row(s2) for _, s2 in pairs], dtype=int)
+
+    columns = ['symbol1', 'symbol2', 'statistic', 'pvalue', 'hedge_ratio',
+               'lags', 'nobs', 'crit_1', 'crit_5', 'crit_10']
+    if first.shape[0] == 0:
+        return pd.DataFrame(columns=columns)
+
+    # Dates where every symbol screened has a price
+    dates = slice(None)
+    if start_date is not None or end_date is not None:
+        start = panel.dates[0] if start_date is None else \
+            _convert_date(start_date)
+        end = panel.dates[-1] if end_date is None else _convert_date(end_date)
+        dates = _date_slice(panel.dates, start, end)
+
+    symbols, index = np.unique(np.concatenate([first, second]),
+                               return_inverse=True)
+    prices = np.asarray(panel.values[symbols, dates], dtype=np.float64).T
+    prices = np.ascontiguousarray(prices[np.isfinite(prices).all(axis=1)])
+    first, second = index[:first.shape[0]], index[first.shape[0]:]
+
+    nobs = prices.shape[0]
+    if maxlag is None:
+        maxlag = _default_maxlag(nobs)
+    elif not isinstance(maxlag, int):
+        raise TypeError('maxlag must be an integer')
+    elif maxlag < 0:
+        raise ValueError('maxlag must be >= 0')
+
+    if maxlag < 0 or maxlag > nobs // 2 - 1:
+        raise ValueError('Too few dates with prices for every symbol')
+
+    # Pairs are chunked so each chunk's residuals fit in memory
+    step = max(1, _CHUNK_ELEMENTS // nobs)
+    chunks = [(a, min(a + step, first.shape[0]))
+              for a in range(0, first.shape[0], step)]
+
+    if n_jobs == 1 or len(chunks) == 1:
+        results = [_engle_granger(prices[:, first[a:b]],
+                                  prices[:, second[a:b]], maxlag)
+                   for a, b in chunks]
+    else:
+        results = _pool_chunks(prices, first, second, maxlag, chunks, n_jobs)
+
+    statistic, beta, lags = (np.concatenate(r) for r in zip(*results))
+
+    crit = adfvalues.mackinnoncrit(N=2, regression='c', nobs=nobs - 1)
+    symbols = np.asarray(panel.symbols, dtype=object)[symbols]
+
+    results = pd.DataFrame({'symbol1': symbols[first],
+                            'symbol2': symbols[second],
+                            'statistic': statistic,
+                            'pvalue': _mackinnonp(statistic),
+                            'hedge_ratio': beta,
+                            'lags': lags,
+                            'nobs': nobs,
+                            'crit_1': crit[0],
+                            'crit_5': crit[1],
+                            'crit_10': crit[2]}, columns=columns)
+
+    return results.sort_values(['pvalue', 'statistic'], ignore_index=True)
+
+
+def _pool_chunks(prices, first, second, maxlag, chunks, n_jobs):
+    """
+    Tests chunks of pairs over a process pool reading prices from shared
+    memory
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per symbol
+    first : int np.ndarray[]
+        Column of the first symbol of each pair
+    second : int np.ndarray[]
+        Column of the second symbol of each pair
+    maxlag : int
+        Largest number of lagged differences
+    chunks : list of tuple of (int, int)
+        Bounds of the pairs of each chunk
+    n_jobs : int
+        Number of processes
+
+    Returns
+    -------
+    results : list of tuple
+        Result of _engle_granger for each chunk
+    """
+
+    memory = None
+    if shared_memory is not None:
+        memory = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+        shared = np.ndarray(prices.shape, dtype=np.float64,
+                            buffer=memory.buf)
+        shared[:] = prices
+        initargs = (memory.name, prices.shape, None)
+    else:
+        initargs = (None, None, prices)
+
+    try:
+        with ProcessPoolExecutor(n_jobs, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            futures = [pool.submit(_worker_chunk, first[a:b], second[a:b],
+                                   maxlag)
+                       for a, b in chunks]
+            results = [future.result() for future in futures]
+    finally:
+        if memory is not None:
+            del shared
+            memory.close()
+            memory.unlink()
+
+    return results
+
+
+def _init_worker(name, shape, prices):
+    """
+    Points a worker process at the prices of its pool
+
+    Parameters
+    ----------
+    name : str or None
+        Name of the shared memory holding the prices
+    shape : tuple of int or None
+        Shape of the prices in shared memory
+    prices : float np.ndarray[][] or None
+        Prices, if not in shared memory
+    """
+
+    global _worker_prices, _worker_memory
+
+    if name is None:
+        _worker_prices = prices
+        return
+
+    # The parent process owns and unlinks the memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_prices = np.ndarray(shape, dtype=np.float64,
+                                buffer=_worker_memory.buf)
+
+
+def _worker_chunk(first, second, maxlag):
+    return _engle_granger(_worker_prices[:, first], _worker_prices[:, second],
+                          maxlag)
@@ -0,0 +1,287 @@
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.tsa.stattools as ts
+
+from radium.equity.equity import _date_slice
+from radium.helpers import _convert_date
+from radium.panel import PricePanel
+
+
+class PrefilterResult:
+    """
+    Result of prefiltering the pairs of a panel.
+
+    Print the result or call summary() for a readable report.
+
+    Attributes
+    ----------
+    statistics : pd.DataFrame
+        Row per pair with columns symbol1, symbol2, hedge_ratio (of the log
+        price spread), correlation (of daily log returns), hurst (Hurst
+        exponent of the spread), variance_ratio and passed (whether the pair
+        passed every threshold)
+    survivors : list of tuple of (str, str)
+        Pairs which passed, e.g. to test by screen_pairs(panel, survivors)
+    nobs : int
+        Number of dates used
+    elapsed : float
+        Seconds spent prefiltering
+    test_seconds : float or None
+        Estimated seconds of statsmodels' coint, as cadf_test, on one pair
+    timing_elapsed : float
+        Seconds spent timing coint on a sample of pairs
+    time_saved : float or None
+        Estimated seconds saved by testing only the survivors, less the time
+        spent prefiltering and timing the sample
+    """
+
+    def __init__(self, statistics, nobs, elapsed, test_seconds,
+                 timing_elapsed=0.0):
+        """
+        Initialises PrefilterResult class
+
+        Parameters
+        ----------
+        statistics : pd.DataFrame
+        nobs : int
+        elapsed : float
+        test_seconds : float or None
+        timing_elapsed : (optional) float
+        """
+
+        self.statistics = statistics
+        self.nobs = int(nobs)
+        self.elapsed = float(elapsed)
+        self.test_seconds = test_seconds
+        self.timing_elapsed = float(timing_elapsed)
+
+        passed = statistics[statistics['passed']]
+        self.survivors = list(zip(passed['symbol1'], passed['symbol2']))
+
+        self.time_saved = None
+        if test_seconds is not None:
+            skipped = len(statistics) - len(self.survivors)
+            self.time_saved = skipped * test_seconds - self.elapsed \
+                - self.timing_elapsed
+
+    def summary(self):
+        """
+        Readable report of the prefilter
+
+        Returns
+        -------
+        summary : str
+        """
+
+        lines = [f'Prefiltered {len(self.statistics)} pairs over '
+                 f'{self.nobs} dates in {self.elapsed:.3f}s',
+                 f'{len(self.survivors)} pairs passed']
+
+        if self.time_saved is not None:
+            lines.append(f'Estimated cointegration testing time saved: '
+                         f'{self.time_saved:.1f}s '
+                         f'({self.test_seconds * 1000:.1f}ms per pair)')
+
+        return '\n'.join(lines) + '\n'
+
+    def __str__(self):
+        return self.summary()
+
+    def __repr__(self):
+        return (f'PrefilterResult(pairs={len(self.statistics)}, '
+                f'survivors={len(self.survivors)}, elapsed={self.elapsed})')
+
+
+def prefilter_pairs(panel, start_date=None, end_date=None,
+                    min_correlation=None, max_hurst=0.5,
+                    max_variance_ratio=1.0, lags=(1, 2, 4, 8, 16, 32),
+                    timing_sample=5):
+    """
+    Quick statistics of every pair of a panel, to drop pairs which are
+    obviously not mean reverting before testing for cointegration
+
+    Each pair's spread is the first log price less its OLS hedge ratio
+    times the second, the hedge ratio coming from the covariance matrix of
+    the log prices. Variances of the spread's differences over each lag come
+    from the covariance matrix of the log price differences of every
+    symbol, so every pair is computed together by one matrix product per
+    lag. Only dates where every symbol has a price are used, as by
+    screen_pairs.
+
+    Parameters
+    ----------
+    panel : radium.PricePanel
+    start_date : (optional) str or datetime or datetime.date
+        First date of interest in YYYY-MM-DD form, defaults to the first
+        date of the panel
+    end_date : (optional) str or datetime or datetime.date
+        Last date of interest in YYYY-MM-DD form, defaults to the last date
+        of the panel
+    min_correlation : (optional) float
+        Smallest correlation of daily log returns to pass, defaults to None
+        for no limit. Cointegrated pairs with noisy spreads can have weakly
+        correlated returns, so only set this to drop unrelated pairs.
+    max_hurst : (optional) float
+        Largest Hurst exponent of the spread to pass, 0.5 for a random walk
+        and less for mean reversion, defaults to 0.5
+    max_variance_ratio : (optional) float
+        Largest ratio of the variance of the spread's differences over the
+        last lag to lag times that over one date to pass, 1 for a random
+        walk and less for mean reversion, defaults to 1
+    lags : (optional) tuple of int
+        Lags the Hurst exponent is fitted over, starting from 1, defaults to
+        (1, 2, 4, 8, 16, 32)
+    timing_sample : (optional) int
+        Number of pairs to time statsmodels' coint on to estimate the time
+        saved, 0 to skip, defaults to 5
+
+    Returns
+    -------
+    result : radium.screen.PrefilterResult
+        Statistics of each pair, the survivors and the estimated time saved
+
+    Raises
+    ------
+    TypeError
+        If panel is not of type radium.PricePanel.
+    ValueError
+        If lags don't start from 1 or have fewer than 2 lags.
+        If too few dates have a price for every symbol.
+        If a price isn't positive.
+    """
+
+    if not isinstance(panel, PricePanel):
+        raise TypeError('panel must be of type radium.PricePanel')
+
+    lags = [int(lag) for lag in lags]
+    if len(lags) < 2 or lags[0] != 1 or np.any(np.diff(lags) <= 0):
+        raise ValueError('lags must be increasing from 1 with at least 2 '
+                         'lags')
+
+    start = time.perf_counter()
+
+    # Dates where every symbol has a price
+    dates = slice(None)
+    if start_date is not None or end_date is not None:
+        first = panel.dates[0] if start_date is None else \
+            _convert_date(start_date)
+        last = panel.dates[-1] if end_date is None else _convert_date(end_date)
+        dates = _date_slice(panel.dates, first, last)
+
+    prices = np.asarray(panel.values[:, dates], dtype=np.float64).T
+    prices = prices[np.isfinite(prices).all(axis=1)]
+
+    nobs = prices.shape[0]
+    if nobs <= 2 * lags[-1]:
+        raise ValueError('Too few dates with prices for every symbol')
+    elif np.any(prices <= 0):
+        raise ValueError('Prices must be positive')
+
+    log_prices = np.log(prices)
+    rows, columns = np.triu_indices(prices.shape[1], k=1)
+
+    # OLS hedge ratio of the first log prices on the second, as the first
+    # stage of an Engle-Granger test
+    centred = log_prices - log_prices.mean(axis=0)
+    covariance = centred.T @ centred
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hedge_ratio = covariance[rows, columns] / np.diag(covariance)[columns]
+
+    # Variance of each pair's spread differences over each lag
+    variances = np.empty((len(lags), rows.shape[0]))
+    for i, lag in enumerate(lags):
+        covariance = _difference_covariance(log_prices, lag)
+        diagonal = np.diag(covariance)
+
+        # Correlation of daily log returns
+        if lag == 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                correlation = covariance[rows, columns] \
+                    / np.sqrt(diagonal[rows] * diagonal[columns])
+
+        variances[i] = diagonal[rows] \
+            - 2 * hedge_ratio * covariance[rows, columns] \
+            + hedge_ratio ** 2 * diagonal[columns]
+
+    # Variances grow as lag ** (2 * hurst), fitted on log scales together
+    x = np.log(lags)
+    x = (x - x.mean()) / np.sum((x - x.mean()) ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hurst = x @ np.log(variances) / 2
+        variance_ratio = variances[-1] / (lags[-1] * variances[0])
+
+    passed = (hurst <= max_hurst) & (variance_ratio <= max_variance_ratio)
+    if min_correlation is not None:
+        passed &= correlation >= min_correlation
+
+    symbols = np.asarray(panel.symbols, dtype=object)
+    statistics = pd.DataFrame({'symbol1': symbols[rows],
+                               'symbol2': symbols[columns],
+                               'hedge_ratio': hedge_ratio,
+                               'correlation': correlation,
+                               'hurst': hurst,
+                               'variance_ratio': variance_ratio,
+                               'passed': passed})
+
+    elapsed = time.perf_counter() - start
+
+    test_seconds = None
+    timing = time.perf_counter()
+    if timing_sample > 0 and rows.shape[0] > 0:
+        test_seconds = _time_coint(prices, rows, columns, timing_sample)
+    timing_elapsed = time.perf_counter() - timing
+
+    return PrefilterResult(statistics, nobs, elapsed, test_seconds,
+                           timing_elapsed)
+
+
+def _difference_covariance(values, lag):
+    """
+    Covariance matrix of the differences of columns over a lag
+
+    Parameters
+    ----------
+    values : float np.ndarray[][]
+        Values with a row per date and a column per symbol
+    lag : int
+
+    Returns
+    -------
+    covariance : float np.ndarray[][]
+    """
+
+    differences = values[lag:] - values[:-lag]
+    differences = differences - differences.mean(axis=0)
+
+    return differences.T @ differences / (differences.shape[0] - 1)
+
+
+def _time_coint(prices, rows, columns, sample):
+    """
+    Average seconds of statsmodels' coint on a sample of pairs
+
+    Parameters
+    ----------
+    prices : float np.ndarray[][]
+        Prices with a row per date and a column per symbol
+    rows : int np.ndarray[]
+        Column of the first symbol of each pair
+    columns : int np.ndarray[]
+        Column of the second symbol of each pair
+    sample : int
+        Number of pairs to time, spread evenly over the pairs
+
+    Returns
+    -------
+    seconds : float
+    """
+
+    pairs = np.unique(np.linspace(0, rows.shape[0] - 1, sample).astype(int))
+
+    start = time.perf_counter()
+    for k in pairs:
+        ts.coint(prices[:, rows[k]], prices[:, columns[k]])
+
+    return (time.perf_counter() - start) / pairs.shape[0]
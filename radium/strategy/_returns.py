@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 from radium.helpers import _truncate
 
 
@@ -15,15 +14,11 @@ def returns(self):
 
     # Calculate integer positions determined by rounding optimal positions to 3 d.p.
     rounded_positions = np.zeros(optimal_positions.shape)
-    for i in range(self.lookback, optimal_positions.shape[0] - 1):
-        rounded_positions[i, 0] = _truncate(optimal_positions[i, 0],
-                                            3) * 10 ** 3
-        rounded_positions[i, 1] = _truncate(optimal_positions[i, 1],
-                                            3) * 10 ** 3
+    rows = slice(self.lookback, optimal_positions.shape[0] - 1)
+    rounded_positions[rows] = _truncate(optimal_positions[rows], 3) * 10 ** 3
 
-    # Get closed prices
-    prices = pd.concat([self.pair.equity1.closed, self.pair.equity2.closed],
-                       axis=1)
+    # Get aligned closed prices
+    prices = self.pair.prices
 
     # Calculate orders
     equity1_orders = np.diff(rounded_positions[:, 0])
@@ -32,22 +27,23 @@ def returns(self):
     equity2_orders = np.append(0, equity2_orders)
 
     # Calculate commissions per daily order (minimum price of 0.35)
-    equity1_comm = np.array(
-        [max(abs(x) * 0.0035, 0.35) if x != 0 else 0 for x in equity1_orders])
-    equity2_comm = np.array(
-        [max(abs(x) * 0.0035, 0.35) if x != 0 else 0 for x in equity2_orders])
+    equity1_comm = np.where(equity1_orders != 0,
+                            np.maximum(np.abs(equity1_orders) * 0.0035, 0.35),
+                            0)
+    equity2_comm = np.where(equity2_orders != 0,
+                            np.maximum(np.abs(equity2_orders) * 0.0035, 0.35),
+                            0)
 
     # Calculate Initial Budget, equal to buy 1000 units of each equity
-    init_budget = 1000 * (self.pair.equity1.closed.iloc[0] +
-                          self.pair.equity2.closed.iloc[0])
+    init_budget = 1000 * (prices[0, 0] + prices[0, 1])
     # Truncate to 2 d.p.
     budget = _truncate(init_budget, 2)
 
-    # Calculate returns from Equity 1 and Equity 2
-    for i in range(0, len(equity1_orders) - 1):
-        budget += -1 * equity1_orders[i] * self.pair.equity1.closed.iloc[i] - \
-                  equity1_comm[i]
-        budget += -1 * equity2_orders[i] * self.pair.equity2.closed.iloc[i] - \
-                  equity2_comm[i]
+    # Calculate returns from Equity 1 and Equity 2, the last date's orders
+    # aren't traded
+    budget += np.sum(-1 * equity1_orders[:-1] * prices[:-1, 0]
+                     - equity1_comm[:-1])
+    budget += np.sum(-1 * equity2_orders[:-1] * prices[:-1, 1]
+                     - equity2_comm[:-1])
 
     return budget / init_budget - 1
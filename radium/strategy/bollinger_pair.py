@@ -3,6 +3,8 @@ import numpy as np
 import statsmodels.tsa.stattools as ts
 import pandas as pd
 
+from radium.pair.half_life import _auto_lookback
+
 
 class BollingerPair(PairStrategy):
     """
@@ -36,12 +38,21 @@ class BollingerPair(PairStrategy):
             Z-score to enter position at
         exit_z : float
             Z-score to exit position at
-        lookback : int
-            Days to lookback on when calculating optimal positions
+        lookback : int or str
+            Days to lookback on when calculating optimal positions, 'auto'
+            looks back on the half-life of the pair's spread
+
+        Raises
+        ------
+        ValueError
+            If lookback is 'auto' and the pair's spread doesn't mean revert.
         """
 
         super().__init__(pair)
 
+        if isinstance(lookback, str) and lookback == 'auto':
+            lookback = _auto_lookback(pair.half_life(), len(pair.dates))
+
         self.entry_z = entry_z
         self.exit_z = exit_z
         self.lookback = lookback
@@ -83,17 +94,17 @@ class BollingerPair(PairStrategy):
         units_long[long_entry] = 1
         units_long[long_exit] = 0
         units_long = pd.DataFrame(data=units_long,
-                                  index=self.pair.equity1.data.index,
+                                  index=self.pair.dates,
                                   columns=["Units Long"])
-        units_long.fillna(method='ffill', inplace=True)
+        units_long = units_long.ffill()
 
         units_short[0] = 0
         units_short[short_entry] = -1
         units_short[short_exit] = 0
         units_short = pd.DataFrame(data=units_short,
-                                   index=self.pair.equity1.data.index,
+                                   index=self.pair.dates,
                                    columns=["Units Short"])
-        units_short.fillna(method='ffill', inplace=True)
+        units_short = units_short.ffill()
 
         units = units_short.values + units_long.values
 
@@ -56,21 +56,21 @@ class PairStrategy:
 
         # Calculate th_daily_returns if undefined
         if hasattr(self, '_th_daily_returns') == False:
-            # Get closed prices
-            prices = pd.concat(
-                [self.pair.equity1.closed, self.pair.equity2.closed], axis=1)
+            # Get aligned closed prices
+            prices = self.pair.prices
 
             # Calculate capital allocation to each position
-            position_values = self.th_positions * prices.values
+            position_values = self.th_positions * prices
 
             # Convert positions_values to DataFrame
             position_values = pd.DataFrame(position_values,
-                                           index=self.pair.equity1.data.index)
+                                           index=self.pair.dates)
             position_values.columns = [self.pair.equity1.symbol,
                                        self.pair.equity2.symbol]
 
             # Calculate P&L with % change of close price and positions
-            close_pct_change = prices.pct_change().values
+            close_pct_change = np.full(prices.shape, np.nan)
+            close_pct_change[1:] = prices[1:] / prices[:-1] - 1
             pnl = np.sum(position_values.shift().values * close_pct_change,
                          axis=1)
 
@@ -129,7 +129,8 @@ class PairStrategy:
             days = (end_date - start_date).days
             days = int(days)
 
-            self._CAGR = (1 + self.cum_returns[-1]) ** (365 / days) - 1
+            final_returns = np.asarray(self.cum_returns)[-1]
+            self._CAGR = (1 + final_returns) ** (365 / days) - 1
 
         return self._CAGR
 
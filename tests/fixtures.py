@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from radium.equity import ArraySource
+
+
+def cointegrated_source():
+    """
+    Offline source of a cointegrated pair of random walks
+
+    Y is 1.5 times X plus 10 and noise over 200 business days from
+    2015-01-01, X has no price on the 51st date.
+
+    Returns
+    -------
+    source : radium.equity.ArraySource
+        Source of the symbols 'Y' and 'X'
+    """
+
+    rng = np.random.default_rng(0)
+    days = 200
+    dates = pd.bdate_range('2015-01-01', periods=days)
+    x = 100 + np.cumsum(rng.normal(0, 1, days))
+    y = 1.5 * x + 10 + rng.normal(0, 1, days)
+
+    source = ArraySource()
+    source.add('Y', dates, y)
+    source.add('X', np.delete(dates, 50), np.delete(x, 50))
+
+    return source
@@ -0,0 +1,127 @@
+import unittest
+import numpy as np
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+from radium import Basket, Equity, Pair
+from radium.equity import ArraySource
+from radium.pair import johansen_test, johansen_test_many, JohansenResult
+
+
+class TestBasket(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Three equities driven by two random walks, C missing one date
+        rng = np.random.default_rng(0)
+        dates = np.datetime64('2015-01-01') + np.arange(200)
+        walks = 50 + np.cumsum(rng.normal(size=(200, 2)), axis=0)
+        a = walks[:, 0] + rng.normal(scale=0.5, size=200)
+        b = walks[:, 1] + rng.normal(scale=0.5, size=200)
+        c = walks[:, 0] + 2 * walks[:, 1] + rng.normal(scale=0.5, size=200)
+
+        cls.source = ArraySource()
+        cls.source.add('A', dates, a)
+        cls.source.add('B', dates, b)
+        cls.source.add('C', np.delete(dates, 50), np.delete(c, 50))
+
+        cls.equities = [Equity(symbol, '2015-01-01', '2016-01-01',
+                               source=cls.source)
+                        for symbol in ('A', 'B', 'C')]
+
+    def setUp(self):
+        self.basket = Basket(self.equities)
+
+    def test_align(self):
+        """
+        Test prices are aligned on dates every equity has a price for
+        """
+
+        self.assertEqual(self.basket.prices.shape, (199, 3))
+        self.assertEqual(len(self.basket.dates), 199)
+        self.assertEqual(self.basket.symbols, ['A', 'B', 'C'])
+        self.assertFalse(self.basket.prices.flags.writeable)
+
+    def test_johansen_test(self):
+        """
+        Test johansen_test gives statistics of every rank of a basket
+        """
+
+        reference = coint_johansen(self.basket.prices, 0, 1)
+
+        result = johansen_test(self.basket)
+        self.assertIsInstance(result, JohansenResult)
+        self.assertEqual(result.symbols, ('A', 'B', 'C'))
+        np.testing.assert_array_equal(result.trace_stat, reference.lr1)
+        np.testing.assert_array_equal(result.eigen_crit, reference.cvm)
+        self.assertIn('r<=2 Trace Statistic', str(result))
+
+        results = johansen_test_many([self.basket, self.basket])
+        self.assertEqual(results.shape, (2, 6 + 3 * 8))
+        self.assertAlmostEqual(results['trace_stat_2'].iloc[1],
+                               reference.lr1[2], places=8)
+        self.assertEqual(results['eigen_crit_2_99'].iloc[0],
+                         reference.cvm[2, 2])
+
+        with self.assertRaises(ValueError):
+            johansen_test_many([self.basket, Pair(*self.equities[:2])])
+
+    def test_hedge(self):
+        """
+        Test hedge ratios are each window's first cointegrating vector
+        """
+
+        self.basket.hedge('JOHANSEN', 60)
+        hedge_ratios = self.basket.hedge_ratios
+        prices = self.basket.prices
+
+        self.assertEqual(hedge_ratios.shape, (199, 3))
+        self.assertTrue(np.all(hedge_ratios[:59] == 0))
+        self.assertTrue(np.all(hedge_ratios[-1] == 0))
+        self.assertTrue(np.all(hedge_ratios[59:-1, 0] == 1))
+
+        for row in (59, 120, 197):
+            vector = coint_johansen(prices[row - 59:row + 1], 0, 1).evec[:, 0]
+            np.testing.assert_allclose(hedge_ratios[row], vector / vector[0],
+                                       rtol=1e-6)
+
+        # Spread is each date's hedge ratios times prices
+        np.testing.assert_allclose(self.basket.price_spread.values,
+                                   np.sum(hedge_ratios * prices, axis=1))
+
+        # Two equities hedge as a pair
+        basket = Basket(self.equities[:2])
+        basket.hedge('JOHANSEN', 40)
+        pair = Pair(*self.equities[:2])
+        pair.hedge('JOHANSEN', 40)
+        np.testing.assert_allclose(basket.hedge_ratios, pair.hedge_ratios)
+
+    def test_rolling_johansen(self):
+        """
+        Test rolling_johansen matches coint_johansen on each window
+        """
+
+        results = self.basket.rolling_johansen(80, step=30)
+        self.assertEqual(results.shape, (len(range(79, 199, 30)), 6))
+
+        reference = coint_johansen(self.basket.prices[30:110], 0, 1)
+        np.testing.assert_allclose(results.iloc[1],
+                                   np.concatenate([reference.lr1,
+                                                   reference.lr2]),
+                                   rtol=1e-8)
+
+    def test_bad_input(self):
+        """
+        Test exception handling of Basket
+        """
+
+        self.assertRaises(TypeError, Basket, ['not equity', 'not equity'])
+        self.assertRaises(ValueError, Basket, self.equities[:1])
+        self.assertRaises(ValueError, self.basket.hedge, 'OLS', 30)
+        self.assertRaises(TypeError, self.basket.hedge, 'JOHANSEN', 30.5)
+        with self.assertRaises(ValueError):
+            self.basket.hedge_ratios = np.zeros((199, 2))
+        with self.assertRaises(Exception):
+            self.basket.price_spread
+
+
+if __name__ == '__main__':
+    unittest.main()
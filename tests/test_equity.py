@@ -1,6 +1,20 @@
+import json
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 from radium import Equity
-from datetime import datetime
+from radium.equity import PriceCache, AlphaVantageSource, ArraySource, \
+    DirectorySource, TokenBucket, load_universe, prefetch_equities, \
+    SymbolStore, configure_store
+from radium.equity.source import _parse_daily, _adjust
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import requests
 
 
 class TestEquity(unittest.TestCase):
@@ -68,8 +82,8 @@ class TestEquity(unittest.TestCase):
         open = [263.38, 256.31]
         closed = [63.5205770973, 61.2004533847]
 
-        jan_date = datetime.strptime("2015-01-02", "%Y-%m-%d").date()
-        feb_date = datetime.strptime("2015-02-02", "%Y-%m-%d").date()
+        jan_date = pd.Timestamp("2015-01-02")
+        feb_date = pd.Timestamp("2015-02-02")
 
         dates = [jan_date, feb_date]
 
@@ -87,5 +101,609 @@ class TestEquity(unittest.TestCase):
                 self.visa.closed[self.visa.closed.index == date].item())
 
 
+class TestPriceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = PriceCache(self.directory.name, ttl=60)
+
+        dates = pd.to_datetime(['2015-01-02', '2015-01-05', '2015-01-06'])
+        self.df = pd.DataFrame({"1. open": [1.0, 2.0, 3.0],
+                                "5. adjusted close": [1.5, 2.5, 3.5]},
+                               index=dates)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_load(self):
+        """
+        Test cached signals are returned unchanged
+
+        """
+
+        self.assertIsNone(self.cache.load('V'))
+
+        self.cache.save('V', self.df)
+        df, fetched_at = self.cache.load('V')
+
+        pd.testing.assert_frame_equal(self.df, df, check_index_type=False)
+        self.assertFalse(self.cache.is_stale(fetched_at))
+
+    def test_stale(self):
+        """
+        Test entries older than the ttl are stale
+
+        """
+
+        self.cache.save('V', self.df, fetched_at=time.time() - 61)
+        df, fetched_at = self.cache.load('V')
+
+        self.assertTrue(self.cache.is_stale(fetched_at))
+
+    def test_clear(self):
+        """
+        Test cached entries are removed
+
+        """
+
+        self.cache.save('V', self.df)
+        self.cache.save('MA', self.df)
+
+        self.cache.clear('V')
+        self.assertIsNone(self.cache.load('V'))
+        self.assertIsNotNone(self.cache.load('MA'))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.load('MA'))
+
+    def test_bad_ttl(self):
+        """
+        Test error handling of invalid ttl
+
+        """
+
+        with self.assertRaises(TypeError):
+            PriceCache(self.directory.name, ttl='1 day')
+
+        with self.assertRaises(ValueError):
+            PriceCache(self.directory.name, ttl=timedelta(seconds=-1))
+
+    def test_merge(self):
+        """
+        Test merging the latest signals into a cached history
+
+        """
+
+        dates = pd.to_datetime(['2015-01-06', '2015-01-07'])
+        tail = pd.DataFrame({"1. open": [3.0, 4.0],
+                             "5. adjusted close": [3.5, 4.5]},
+                            index=dates)
+
+        merged = AlphaVantageSource._merge(self.df, tail)
+        self.assertEqual(list(merged["1. open"]), [1.0, 2.0, 3.0, 4.0])
+
+        # Tail with no overlap can't be merged
+        self.assertIsNone(AlphaVantageSource._merge(self.df, tail.iloc[1:]))
+
+        # Signals of the tail replace those of the history
+        tail["1. open"] = [3.3, 4.0]
+        merged = AlphaVantageSource._merge(self.df, tail)
+        self.assertEqual(list(merged["1. open"]), [1.0, 2.0, 3.3, 4.0])
+
+
+class TestDataSource(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = ['2015-01-02', '2015-01-05', '2015-01-06', '2015-01-07']
+        self.closed = [1.0, 2.0, 3.0, 4.0]
+
+        self.source = ArraySource()
+        self.source.add('V', self.dates, self.closed, high=[2, 3, 4, 5])
+
+    def test_array_source(self):
+        """
+        Test equity built from an in-memory source
+
+        """
+
+        visa = Equity('V', '2015-01-03', '2015-01-07', source=self.source)
+
+        self.assertEqual(list(visa.closed), [2.0, 3.0, 4.0])
+        self.assertEqual(list(visa.high), [3.0, 4.0, 5.0])
+        self.assertEqual(list(visa.open), [2.0, 3.0, 4.0])
+
+    def test_window(self):
+        """
+        Test windows of signals are views between dates inclusive
+
+        """
+
+        visa = Equity('V', '2015-01-01', '2015-01-07', source=self.source)
+
+        window = visa.window('2015-01-03', '2015-01-06')
+        self.assertEqual(list(window["5. adjusted close"]), [2.0, 3.0])
+        self.assertTrue(np.shares_memory(window.values, visa.data.values))
+
+        window = visa.window(end_date='2015-01-05')
+        self.assertEqual(list(window["5. adjusted close"]), [1.0, 2.0])
+
+        self.assertIsInstance(visa.data.index, pd.DatetimeIndex)
+
+        with self.assertRaises(ValueError):
+            visa.window('2015-01-06', '2015-01-05')
+
+    def test_directory_source(self):
+        """
+        Test equity built from a directory of csv files
+
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            df = self.source.daily('V')
+            df.columns = [column.split('. ')[1] for column in df.columns]
+            df.to_csv(f'{directory}/V.csv')
+
+            source = DirectorySource(directory)
+            visa = Equity('V', '2015-01-01', '2015-01-06', source=source)
+
+            self.assertEqual(list(visa.closed), [1.0, 2.0, 3.0])
+
+            with self.assertRaises(ValueError):
+                Equity('MA', '2015-01-01', '2015-01-06', source=source)
+
+    def test_bad_source(self):
+        """
+        Test error handling of invalid sources
+
+        """
+
+        with self.assertRaises(ValueError):
+            Equity('MA', '2015-01-01', '2015-01-06', source=self.source)
+
+        with self.assertRaises(TypeError):
+            Equity('V', '2015-01-01', '2015-01-06', source='source')
+
+        with self.assertRaises(ValueError):
+            Equity('V', '2015-01-01', '2015-01-06', 'key', source=self.source)
+
+        with self.assertRaises(ValueError):
+            self.source.add('MA', self.dates, [1.0, 2.0])
+
+
+class TestUniverse(unittest.TestCase):
+
+    def setUp(self):
+        dates = ['2015-01-02', '2015-01-05', '2015-01-06']
+
+        self.source = ArraySource()
+        for symbol in ('V', 'MA', 'KO'):
+            self.source.add(symbol, dates, [1.0, 2.0, 3.0])
+
+    def test_load_universe(self):
+        """
+        Test equities are loaded for every symbol in order
+
+        """
+
+        equities = load_universe(['V', 'MA', 'KO'], '2015-01-01', '2015-01-06',
+                                 source=self.source)
+
+        self.assertEqual(list(equities), ['V', 'MA', 'KO'])
+        self.assertEqual(list(equities['MA'].closed), [1.0, 2.0, 3.0])
+
+    def test_retry(self):
+        """
+        Test symbols are retried after the call limit is reached
+
+        """
+
+        calls = []
+        daily = self.source.daily
+
+        def limited_daily(symbol):
+            calls.append(symbol)
+            if len(calls) == 1:
+                raise RuntimeError("API call limit reached")
+            return daily(symbol)
+
+        self.source.daily = limited_daily
+        equities = load_universe(['V'], '2015-01-01', '2015-01-06',
+                                 source=self.source, backoff=0)
+
+        self.assertEqual(calls, ['V', 'V'])
+        self.assertIn('V', equities)
+
+    def test_timeout(self):
+        """
+        Test symbols are retried after request timeouts and skipped if they
+        keep timing out
+
+        """
+
+        calls = []
+        daily = self.source.daily
+
+        def timing_out_daily(symbol):
+            calls.append(symbol)
+            if symbol == 'MA' or len(calls) == 1:
+                raise requests.Timeout("Read timed out")
+            return daily(symbol)
+
+        self.source.daily = timing_out_daily
+        equities = load_universe(['V', 'MA'], '2015-01-01', '2015-01-06',
+                                 source=self.source, max_workers=1,
+                                 retries=1, backoff=0, errors='skip')
+
+        self.assertEqual(calls, ['V', 'V', 'MA', 'MA'])
+        self.assertEqual(list(equities), ['V'])
+
+        with self.assertRaises(requests.Timeout):
+            load_universe(['MA'], '2015-01-01', '2015-01-06',
+                          source=self.source, retries=0)
+
+    def test_errors(self):
+        """
+        Test error handling of symbols which fail to load
+
+        """
+
+        with self.assertRaises(ValueError):
+            load_universe(['V', 'asifhj'], '2015-01-01', '2015-01-06',
+                          source=self.source)
+
+        equities = load_universe(['V', 'asifhj'], '2015-01-01', '2015-01-06',
+                                 source=self.source, errors='skip')
+        self.assertEqual(list(equities), ['V'])
+
+        with self.assertRaises(ValueError):
+            load_universe(['V'], '2015-01-01', '2015-01-06',
+                          source=self.source, max_workers=0)
+
+        # Key is needed without a source
+        with self.assertRaisesRegex(ValueError, 'Invalid API Key'):
+            load_universe(['V'], '2015-01-01', '2015-01-06')
+
+    def test_lazy(self):
+        """
+        Test lazy equities only fetch signals when accessed or prefetched
+
+        """
+
+        calls = []
+        daily = self.source.daily
+
+        def counted_daily(symbol):
+            calls.append(symbol)
+            return daily(symbol)
+
+        self.source.daily = counted_daily
+
+        visa = Equity('V', '2015-01-01', '2015-01-06', source=self.source,
+                      lazy=True)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(list(visa.closed), [1.0, 2.0, 3.0])
+        visa.prefetch()
+        self.assertEqual(calls, ['V'])
+
+        equities = [Equity(symbol, '2015-01-01', '2015-01-06',
+                           source=self.source, lazy=True)
+                    for symbol in ('MA', 'asifhj', 'KO')]
+        fetched = prefetch_equities(equities, errors='skip')
+
+        self.assertEqual([equity.symbol for equity in fetched], ['MA', 'KO'])
+        self.assertEqual(sorted(calls), ['KO', 'MA', 'V', 'asifhj'])
+
+    def test_token_bucket(self):
+        """
+        Test calls beyond the burst wait for the quota
+
+        """
+
+        bucket = TokenBucket(600, burst=2)
+
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+
+        # Third call waits for a token refilled at 10 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class TestAlphaVantageSource(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        series = {
+            "2015-01-06": {"1. open": "3.0", "2. high": "3.5", "3. low": "2.5",
+                           "4. close": "3.2", "5. adjusted close": "3.1",
+                           "6. volume": "300", "7. dividend amount": "0.0000",
+                           "8. split coefficient": "1.0"},
+            "2015-01-05": {"1. open": "2.0", "2. high": "2.5", "3. low": "1.5",
+                           "4. close": "2.2", "5. adjusted close": "2.1",
+                           "6. volume": "200", "7. dividend amount": "0.0000",
+                           "8. split coefficient": "1.0"},
+        }
+        dividend = {
+            "2015-01-06": {"1. open": "4.0", "2. high": "4.0", "3. low": "4.0",
+                           "4. close": "4.0", "5. adjusted close": "4.0",
+                           "6. volume": "0", "7. dividend amount": "0.2000",
+                           "8. split coefficient": "1.0"},
+            "2015-01-05": {"1. open": "2.0", "2. high": "2.0", "3. low": "2.0",
+                           "4. close": "2.0", "5. adjusted close": "1.8",
+                           "6. volume": "0", "7. dividend amount": "0.0000",
+                           "8. split coefficient": "1.0"},
+        }
+        payloads = {"V": {"Time Series (Daily)": series},
+                    "KO": {"Time Series (Daily)": dividend},
+                    "asifhj": {"Error Message": "Invalid API call."},
+                    "MA": {"Note": "API call frequency exceeded."}}
+        cls.queries = []
+
+        # Stand-in for the Alpha-vantage API answering by symbol
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                cls.queries.append(query)
+                body = json.dumps(payloads[query["symbol"][0]]).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        cls.url = "http://%s:%d/query" % cls.server.server_address
+        cls.source = AlphaVantageSource("key", url=cls.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_daily(self):
+        """
+        Test signals are parsed from the API payload
+
+        """
+
+        visa = Equity('V', '2015-01-01', '2015-01-07', source=self.source)
+
+        self.assertEqual(list(visa.closed), [2.1, 3.1])
+        self.assertEqual(list(visa.high), [2.5, 3.5])
+        self.assertEqual(list(visa.data["6. volume"]), [200.0, 300.0])
+
+    def test_errors(self):
+        """
+        Test error handling of API error payloads
+
+        """
+
+        with self.assertRaises(ValueError):
+            self.source.daily('asifhj')
+
+        with self.assertRaises(RuntimeError):
+            self.source.daily('MA')
+
+    def test_refresh(self):
+        """
+        Test stale cache entries are refreshed with the latest signals only
+        and re-adjusted locally for new dividends
+
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PriceCache(directory, ttl=60)
+
+            # Cached history from before the dividend
+            source = ArraySource()
+            source.add('KO', ['2015-01-02', '2015-01-05'], [1.0, 2.0])
+            cache.save('KO', source.daily('KO'), fetched_at=time.time() - 61)
+
+            del self.queries[:]
+            source = AlphaVantageSource("key", cache, url=self.url)
+            df = source.daily('KO')
+
+            self.assertEqual([query["outputsize"] for query in self.queries],
+                             [["compact"]])
+            self.assertEqual(list(df["4. close"]), [1.0, 2.0, 4.0])
+            np.testing.assert_allclose(df["5. adjusted close"],
+                                       [0.9, 1.8, 4.0])
+
+            # Refreshed entry is fresh so the API isn't called again
+            source.daily('KO')
+            self.assertEqual(len(self.queries), 1)
+
+    def test_adjust(self):
+        """
+        Test adjusted closes computed from dividends and splits
+
+        """
+
+        df = pd.DataFrame({"4. close": [10.0, 10.0, 5.0, 5.0],
+                           "7. dividend amount": [0.0, 0.0, 0.0, 0.5],
+                           "8. split coefficient": [1.0, 1.0, 2.0, 1.0]})
+        adjusted = _adjust(df)["5. adjusted close"]
+
+        # 2:1 split then a dividend of 10% of the previous close
+        np.testing.assert_allclose(adjusted, [4.5, 4.5, 4.5, 5.0])
+
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                AlphaVantageSource("key", PriceCache(directory), adjust='api')
+
+    def test_parse_daily(self):
+        """
+        Test payload is parsed into contiguous arrays in payload order
+
+        """
+
+        daily_json = {"2015-01-06": {"1. open": "3.0", "6. volume": "300"},
+                      "2015-01-05": {"1. open": "2.0", "6. volume": "200"}}
+        dates, values, columns = _parse_daily(daily_json)
+
+        self.assertEqual(dates.dtype, np.dtype('datetime64[D]'))
+        self.assertEqual(str(dates[0]), "2015-01-06")
+        self.assertTrue(values.flags.c_contiguous)
+        self.assertEqual(values.tolist(), [[3.0, 300.0], [2.0, 200.0]])
+        self.assertEqual(columns, ["1. open", "6. volume"])
+
+
+class TestSymbolStore(unittest.TestCase):
+
+    def setUp(self):
+        dates = ['2015-01-02', '2015-01-05', '2015-01-06', '2015-01-07']
+
+        self.source = ArraySource()
+        for symbol in ('V', 'MA', 'KO'):
+            self.source.add(symbol, dates, [1.0, 2.0, 3.0, 4.0])
+
+        self.calls = []
+        daily = self.source.daily
+
+        def counted_daily(symbol):
+            self.calls.append(symbol)
+            return daily(symbol)
+
+        self.source.daily = counted_daily
+
+    def test_shared(self):
+        """
+        Test equities of a symbol share one read-only history
+
+        """
+
+        visa1 = Equity('V', '2015-01-01', '2015-01-05', source=self.source)
+        visa2 = Equity('V', '2015-01-05', '2015-01-07', source=self.source)
+
+        self.assertEqual(self.calls, ['V'])
+        self.assertEqual(list(visa2.closed), [2.0, 3.0, 4.0])
+        self.assertTrue(np.shares_memory(visa1.data.values,
+                                         visa2.data.values))
+
+        df = SymbolStore().daily(self.source, 'V')
+        self.assertFalse(df.to_numpy().flags.writeable)
+
+    def test_eviction(self):
+        """
+        Test least recently used histories are evicted beyond the budget
+
+        """
+
+        nbytes = 4 * 8 * 8 + 4 * 8
+        store = SymbolStore(2 * nbytes)
+
+        store.daily(self.source, 'V')
+        store.daily(self.source, 'MA')
+        store.daily(self.source, 'V')
+        store.daily(self.source, 'KO')
+
+        self.assertEqual(store.nbytes, 2 * nbytes)
+        self.assertIn((self.source, 'V'), store)
+        self.assertNotIn((self.source, 'MA'), store)
+
+        store.clear('V')
+        self.assertEqual(len(store), 1)
+
+        store.daily(self.source, 'V')
+        self.assertEqual(self.calls, ['V', 'MA', 'KO', 'V'])
+
+    def test_failed_fetch(self):
+        """
+        Test a failed fetch doesn't leave its symbol's lock behind
+
+        """
+
+        store = SymbolStore()
+
+        with self.assertRaises(ValueError):
+            store.daily(self.source, 'AAPL')
+
+        self.assertEqual(store._fetching, {})
+        self.assertNotIn((self.source, 'AAPL'), store)
+
+    def test_stale(self):
+        """
+        Test histories are fetched again once the source reports them stale
+
+        """
+
+        store = SymbolStore()
+        store.daily(self.source, 'V')
+        store.daily(self.source, 'V')
+
+        with mock.patch.object(ArraySource, 'is_stale', return_value=True):
+            store.daily(self.source, 'V')
+
+        self.assertEqual(self.calls, ['V', 'V'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = AlphaVantageSource('key', PriceCache(directory, ttl=60))
+            self.assertFalse(source.is_stale(time.time()))
+            self.assertTrue(source.is_stale(time.time() - 120))
+
+        self.assertFalse(AlphaVantageSource('key').is_stale(0.0))
+
+    def test_add(self):
+        """
+        Test adding signals to an array source replaces its held history
+
+        """
+
+        configure_store()
+        dates = ['2015-01-02', '2015-01-05']
+
+        visa = Equity('V', '2015-01-01', '2015-01-07', source=self.source)
+        self.assertEqual(list(visa.closed), [1.0, 2.0, 3.0, 4.0])
+
+        self.source.add('V', dates, [5.0, 6.0])
+        visa = Equity('V', '2015-01-01', '2015-01-07', source=self.source)
+        self.assertEqual(list(visa.closed), [5.0, 6.0])
+
+    def test_default_source(self):
+        """
+        Test default Alpha-vantage equities of a key share one history
+
+        """
+
+        calls = []
+
+        def request(source, symbol, outputsize):
+            calls.append(symbol)
+            return self.source.frames[symbol]
+
+        configure_store()
+        with mock.patch.object(AlphaVantageSource, '_request', request):
+            ko1 = Equity('KO', '2015-01-01', '2015-01-05', 'key')
+            ko2 = Equity('KO', '2015-01-05', '2015-01-07', 'key')
+            Equity('KO', '2015-01-01', '2015-01-07', 'other key')
+
+        self.assertEqual(calls, ['KO', 'KO'])
+        self.assertEqual(ko1.source, ko2.source)
+        self.assertTrue(np.shares_memory(ko1.data.values, ko2.data.values))
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertNotEqual(AlphaVantageSource('key'),
+                                AlphaVantageSource('key',
+                                                   PriceCache(directory)))
+
+    def test_bad_budget(self):
+        """
+        Test error handling of invalid memory budgets
+
+        """
+
+        with self.assertRaises(TypeError):
+            SymbolStore(1.5)
+
+        with self.assertRaises(ValueError):
+            SymbolStore(-1)
+
+
 if __name__ == '__main__':
     unittest.main()
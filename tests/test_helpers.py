@@ -1,6 +1,10 @@
 import unittest
-from radium.helpers import _truncate, _convert_date
+from radium.helpers import (_truncate, _convert_date, _LRUCache, _align,
+                            _GrowingArray, _mackinnonp)
 from datetime import datetime
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.adfvalues import mackinnonp
 
 
 class TestTruncate(unittest.TestCase):
@@ -24,6 +28,19 @@ class TestTruncate(unittest.TestCase):
             result = _truncate(number, decimals)
             self.assertEqual(truncated_number, result)
 
+    def test_truncate_array(self):
+        """
+        Test _truncate of arrays matches truncating each number
+        """
+
+        numbers = np.array([[1.9999999, -1.9999999], [0.123456, -7.5]])
+
+        for decimals in range(4):
+            expected = [[_truncate(n, decimals) for n in row]
+                        for row in numbers]
+            np.testing.assert_array_equal(_truncate(numbers, decimals),
+                                          expected)
+
     def test_not_integer(self):
         """
         _truncate should fail when decimals not integer
@@ -90,5 +107,128 @@ class TestDate(unittest.TestCase):
             _convert_date([self.date])
 
 
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        """
+        Tests least recently used items are evicted first
+        """
+
+        cache = _LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.keys(), ['a', 'c'])
+        self.assertIsNone(cache.get('b'))
+
+    def test_sizeof(self):
+        """
+        Tests items are evicted by total size
+        """
+
+        cache = _LRUCache(10, sizeof=len)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.put('c', 'xxxx')
+
+        self.assertEqual(cache.total, 8)
+        self.assertEqual(cache.keys(), ['b', 'c'])
+
+        # Items over the budget are not held
+        cache.put('d', 'x' * 11)
+        self.assertNotIn('d', cache)
+
+    def test_negative(self):
+        """
+        Tests function with a negative budget
+        """
+
+        with self.assertRaises(ValueError):
+            _LRUCache(-1)
+
+
+class TestAlign(unittest.TestCase):
+    def setUp(self):
+        dates = pd.bdate_range('2020-01-01', periods=5)
+        self.series1 = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0], index=dates)
+        self.series2 = pd.Series([10.0, 30.0, 40.0],
+                                 index=dates[[1, 3, 4]])
+
+    def test_inner(self):
+        """
+        Test inner alignment keeps only dates every series has a price for
+        """
+
+        dates, prices = _align([self.series1, self.series2], 'inner')
+
+        self.assertTrue(dates.equals(self.series2.index))
+        np.testing.assert_array_equal(prices, [[2, 10], [4, 30], [5, 40]])
+        self.assertTrue(prices.flags.c_contiguous)
+
+    def test_ffill(self):
+        """
+        Test ffill alignment carries prices forward after every series starts
+        """
+
+        dates, prices = _align([self.series1, self.series2], 'ffill')
+
+        self.assertTrue(dates.equals(self.series1.index[1:]))
+        np.testing.assert_array_equal(prices,
+                                      [[2, 10], [3, 10], [4, 30], [5, 40]])
+
+    def test_bad_how(self):
+        """
+        _align should fail when how isn't an available policy
+        """
+
+        self.assertRaises(TypeError, _align, [self.series1], 1)
+        self.assertRaises(ValueError, _align, [self.series1], 'outer')
+
+
+class TestGrowingArray(unittest.TestCase):
+    def test_append(self):
+        """
+        Test appended rows are written into a buffer doubled when full
+        """
+
+        rows = _GrowingArray(np.zeros((4, 2)))
+        first = rows.view
+
+        rows.append(np.ones((1, 2)))
+        second = rows.append(2 * np.ones((2, 2)))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows._buffer.shape, (8, 2))
+        self.assertFalse(np.shares_memory(first, second))
+
+        # Rows from start are replaced in place, earlier rows are kept
+        third = rows.append(3 * np.ones((2, 2)), start=6)
+        self.assertTrue(np.shares_memory(second, third))
+        np.testing.assert_array_equal(third[:, 0], [0, 0, 0, 0, 1, 2, 3, 3])
+        self.assertFalse(third.flags.writeable)
+
+    def test_bad_start(self):
+        """
+        _GrowingArray should fail when start is past the rows held
+        """
+
+        rows = _GrowingArray(np.zeros(3))
+        self.assertRaises(ValueError, rows.append, np.ones(1), 4)
+        self.assertRaises(ValueError, rows.append, np.ones(1), -1)
+
+
+class TestMackinnonp(unittest.TestCase):
+    def test_statsmodels(self):
+        """
+        Test vendored MacKinnon (1994) p-values match statsmodels' mackinnonp
+        """
+
+        statistic = np.concatenate([np.linspace(-20, 2, 221),
+                                    [-18.86, -2.62, 0.92]])
+        expected = [mackinnonp(t, regression='c', N=2) for t in statistic]
+        np.testing.assert_allclose(_mackinnonp(statistic), expected,
+                                   rtol=1e-12, atol=1e-300)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,21 @@
 import unittest
 from datetime import date
 import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+import statsmodels.tsa.stattools as ts
+from scipy.stats import theilslopes
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
 
 from radium import Pair, Equity
-from radium.pair import cadf_test, johansen_test
+from radium.pair import (cadf_test, cadf_test_many, CADFResult,
+                         johansen_test, johansen_test_many, JohansenResult,
+                         half_lives, KalmanHedge)
+from radium.pair.pair import _lookback_hedge_ratios
 from radium.helpers import _truncate
 
+from fixtures import cointegrated_source
+
 
 class TestPair(unittest.TestCase):
     @classmethod
@@ -160,6 +170,512 @@ class TestPair(unittest.TestCase):
                           date(2022, 1, 1))
 
 
+class TestPairOffline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Cointegrated random walks with a gap in the second equity
+        cls.source = cointegrated_source()
+
+        cls.equity1 = Equity('Y', '2015-01-01', '2016-01-01',
+                             source=cls.source)
+        cls.equity2 = Equity('X', '2015-01-01', '2016-01-01',
+                             source=cls.source)
+
+    def setUp(self):
+        self.pair = Pair(self.equity1, self.equity2)
+
+    def test_align(self):
+        """
+        Test prices are aligned once by the missing data policy
+        """
+
+        # Inner alignment drops the date X has no price for
+        prices = self.pair.prices
+        self.assertEqual(prices.shape, (199, 2))
+        self.assertEqual(prices.dtype, np.float64)
+        self.assertTrue(prices.flags.c_contiguous)
+        self.assertFalse(prices.flags.writeable)
+        self.assertNotIn(pd.Timestamp('2015-03-12'), self.pair.dates)
+        self.assertFalse(np.isnan(prices).any())
+
+        # Forward filling keeps the date with X's previous price
+        pair = Pair(self.equity1, self.equity2, align='ffill')
+        self.assertEqual(pair.prices.shape, (200, 2))
+        self.assertEqual(pair.prices[50, 1], pair.prices[49, 1])
+        self.assertEqual(pair.prices[50, 0], self.equity1.closed.iloc[50])
+
+        # Spread is indexed by the aligned dates
+        self.pair.hedge_ratios = np.tile([1.0, -1.5], (199, 1))
+        np.testing.assert_allclose(self.pair.price_spread.values,
+                                   prices[:, 0] - 1.5 * prices[:, 1])
+        self.assertTrue(self.pair.price_spread.index.equals(self.pair.dates))
+
+        with self.assertRaises(TypeError):
+            Pair(self.equity1, self.equity2, align=1)
+        with self.assertRaises(ValueError):
+            Pair(self.equity1, self.equity2, align='outer')
+
+    def test_hedge_ols(self):
+        """
+        Test vectorized OLS hedge ratios match statsmodels fits of each window
+        """
+
+        for lookback in (5, 30, 199, 250):
+            np.testing.assert_allclose(self.pair._hedge_ols(lookback),
+                                       self.pair._hedge_ols_reference(lookback),
+                                       rtol=1e-8, atol=1e-8)
+
+        hedge_ratios = self.pair._hedge_ols(30)
+        self.assertTrue(np.all(hedge_ratios[:29] == 0))
+        self.assertTrue(np.all(hedge_ratios[29:-1, 0] == 1))
+        self.assertTrue(np.all(hedge_ratios[-1] == 0))
+
+    def test_hedge_sweep(self):
+        """
+        Test hedge sweep matches separate hedges and caches each lookback
+        """
+
+        lookbacks = [5, 30, 60, 250]
+        hedge_ratios = self.pair.hedge_sweep('OLS', lookbacks)
+
+        self.assertEqual(hedge_ratios.shape, (4, 199, 2))
+        for i, lookback in enumerate(lookbacks):
+            np.testing.assert_allclose(hedge_ratios[i],
+                                       self.pair._hedge_ols(lookback))
+
+        # Swept lookbacks are looked up rather than recalculated
+        cached = self.pair._hedge_cache.get(('OLS', 30))
+        self.pair.hedge('OLS', 30)
+        self.assertIs(self.pair.hedge_ratios, cached)
+        self.assertFalse(self.pair.hedge_ratios.flags.writeable)
+
+        # Lookbacks fitted together match those fitted one at a time
+        for method in ('TLS', 'JOHANSEN'):
+            hedge_ratios = self.pair.hedge_sweep(method, lookbacks + [2, 199])
+            for i, lookback in enumerate(lookbacks + [2, 199]):
+                expected = _lookback_hedge_ratios(self.pair.prices, method,
+                                                  lookback)
+                np.testing.assert_allclose(hedge_ratios[i], expected,
+                                           rtol=1e-10)
+                self.pair.hedge(method, lookback)
+                np.testing.assert_array_equal(hedge_ratios[i],
+                                              self.pair.hedge_ratios)
+
+        with self.assertRaises(TypeError):
+            self.pair.hedge_sweep('OLS', [30, 30.5])
+        with self.assertRaises(ValueError):
+            self.pair.hedge_sweep('OLS', [0])
+        with self.assertRaises(ValueError):
+            self.pair.hedge_sweep('KALMAN', [30])
+
+    def test_hedge_symmetric(self):
+        """
+        Test TLS and Johansen hedges agree when the equities are swapped
+        """
+
+        swapped = Pair(self.equity2, self.equity1)
+        prices = self.pair.prices
+
+        for method in ('TLS', 'JOHANSEN'):
+            self.pair.hedge(method, 30)
+            swapped.hedge(method, 30)
+
+            # [1, -b] and [1, -1/b] give the same spread up to scale
+            ratios = self.pair.hedge_ratios[29:-1, 1]
+            swapped_ratios = swapped.hedge_ratios[29:-1, 1]
+            np.testing.assert_allclose(ratios * swapped_ratios, 1)
+
+            # Moment methods take no parameters
+            with self.assertRaisesRegex(TypeError, method):
+                self.pair.hedge(method, 30, n_jobs=2)
+
+        with self.assertRaisesRegex(TypeError, 'OLS'):
+            self.pair.hedge('OLS', 30, c=1.0)
+
+        # Johansen hedge is the first cointegrating vector of each window
+        for i in range(29, prices.shape[0] - 1, 17):
+            result = coint_johansen(prices[i - 29:i + 1], 0, 1)
+            vector = result.evec[:, 0]
+            self.assertAlmostEqual(self.pair.hedge_ratios[i, 1],
+                                   vector[1] / vector[0])
+
+    def test_hedge_robust(self):
+        """
+        Test robust hedge ratios match statsmodels and scipy fits of windows
+        """
+
+        # Outlying prices in the response equity
+        prices = self.pair.prices.copy()
+        prices[[40, 90, 91, 150], 0] += 25
+
+        lookback = 30
+        huber = _lookback_hedge_ratios(prices, 'HUBER', lookback)
+        theilsen = _lookback_hedge_ratios(prices, 'THEILSEN', lookback)
+
+        for i in range(lookback - 1, prices.shape[0] - 1, 13):
+            y = prices[i - lookback + 1:i + 1, 0]
+            x = prices[i - lookback + 1:i + 1, 1]
+
+            rlm = sm.RLM(y, sm.add_constant(x), M=sm.robust.norms.HuberT())
+            gradient = rlm.fit(tol=1e-12, maxiter=200).params[1]
+            self.assertAlmostEqual(-huber[i, 1], gradient, places=6)
+            self.assertAlmostEqual(-theilsen[i, 1], theilslopes(y, x)[0])
+
+        self.assertTrue(np.all(huber[:lookback - 1] == 0))
+        self.assertTrue(np.all(huber[-1] == 0))
+
+        # Windows split over processes give the same hedge ratios
+        np.testing.assert_allclose(
+            _lookback_hedge_ratios(prices, 'HUBER', lookback, n_jobs=2),
+            huber, rtol=1e-6, atol=1e-6)
+        np.testing.assert_array_equal(
+            _lookback_hedge_ratios(prices, 'THEILSEN', lookback, n_jobs=2),
+            theilsen)
+
+        self.pair.hedge('THEILSEN', lookback)
+        self.assertEqual(self.pair.hedge_ratios.shape, (199, 2))
+
+        with self.assertRaises(TypeError):
+            self.pair.hedge('THEILSEN', lookback, c=1.0)
+        with self.assertRaises(ValueError):
+            self.pair.hedge('HUBER', lookback, n_jobs=0)
+
+    def test_price_spread_cache(self):
+        """
+        Test spreads follow re-hedging and are cached per hedge
+        """
+
+        prices = self.pair.prices
+
+        self.pair.hedge('OLS', 30)
+        spread30 = self.pair.price_spread
+        self.pair.hedge('OLS', 60)
+        spread60 = self.pair.price_spread
+
+        hedge_ratios = self.pair._hedge_ols(60)
+        np.testing.assert_allclose(spread60.values,
+                                   np.sum(hedge_ratios * prices, axis=1))
+        self.assertFalse(np.allclose(spread30.values, spread60.values))
+
+        # Repeated hedges are lookups
+        self.pair.hedge('OLS', 30)
+        self.assertIs(self.pair.price_spread, spread30)
+
+        # Directly set ratios replace the spread without being cached
+        self.pair.hedge_ratios = np.tile([1.0, -1.5], (199, 1))
+        np.testing.assert_allclose(self.pair.price_spread.values,
+                                   prices[:, 0] - 1.5 * prices[:, 1])
+        self.assertEqual(len(self.pair._spread_cache), 2)
+
+        del self.pair.hedge_ratios
+        with self.assertRaises(Exception):
+            self.pair.price_spread
+
+        # Cache is bounded
+        pair = Pair(self.equity1, self.equity2, cache_size=1)
+        pair.hedge_sweep('OLS', [10, 20, 30])
+        self.assertEqual(len(pair._hedge_cache), 1)
+
+    def test_extend(self):
+        """
+        Test extending a pair by new dates matches hedging all dates at once
+        """
+
+        dates = self.pair.dates
+        prices = self.pair.prices
+
+        for method, lookback, kwargs in (('OLS', 30, {}),
+                                         ('OLS', 160, {}),
+                                         ('TLS', 30, {}),
+                                         ('JOHANSEN', 40, {}),
+                                         ('THEILSEN', 20, {}),
+                                         ('HUBER', 30, {'c': 2.0}),
+                                         ('KALMAN', None, {'ve': 1.0})):
+            self.pair.hedge(method, lookback, **kwargs)
+            hedge_ratios = self.pair.hedge_ratios
+            price_spread = self.pair.price_spread
+
+            # Pair of the first 150 dates extended by a block then day by day
+            pair = Pair(Equity('Y', '2015-01-01', dates[149].date(),
+                               source=self.source),
+                        Equity('X', '2015-01-01', dates[149].date(),
+                               source=self.source))
+            pair.hedge(method, lookback, **kwargs)
+            pair.price_spread
+            for first, last in [(150, 190)] + [(i, i + 1)
+                                               for i in range(190, 199)]:
+                previous = (pair.prices, pair._hedge_ratios,
+                            pair._price_spread.values)
+                read = (pair.hedge_ratios, pair.price_spread)
+                expected = (read[0].copy(), read[1].copy())
+                pair.extend(dates[first:last], prices[first:last])
+
+                # Arrays read before extending never change, whether or not
+                # the buffers grew
+                np.testing.assert_array_equal(read[0], expected[0])
+                pd.testing.assert_series_equal(read[1], expected[1])
+
+            # Daily extends write into the same buffers rather than copying,
+            # and hedge ratios and spread are copied out once when read
+            current = (pair.prices, pair._hedge_ratios,
+                       pair._price_spread.values)
+            for before, after in zip(previous, current):
+                self.assertTrue(np.shares_memory(before, after))
+                self.assertFalse(after.flags.writeable)
+            self.assertFalse(np.shares_memory(pair.hedge_ratios, current[1]))
+            self.assertIs(pair.hedge_ratios, pair.hedge_ratios)
+            self.assertIs(pair.price_spread, pair.price_spread)
+
+            self.assertTrue(pair.dates.equals(dates))
+            np.testing.assert_allclose(pair.hedge_ratios, hedge_ratios,
+                                       rtol=1e-6, atol=1e-6)
+            np.testing.assert_allclose(pair.price_spread.values,
+                                       price_spread.values,
+                                       rtol=1e-6, atol=1e-6)
+            self.assertEqual(pair.end_date, dates[-1].date())
+
+        # Missing prices are dropped by the inner policy
+        pair = Pair(self.equity1, self.equity2)
+        pair.hedge_ratios = np.ones((199, 2))
+        pair.extend(pd.bdate_range('2016-01-01', periods=2),
+                    [[1.0, np.nan], [2.0, 3.0]])
+        self.assertEqual(pair.prices.shape, (200, 2))
+        self.assertFalse(hasattr(pair, 'hedge_ratios'))
+
+        with self.assertRaises(ValueError):
+            pair.extend(dates[-2:], prices[-2:])
+        with self.assertRaises(ValueError):
+            pair.extend(pd.bdate_range('2017-01-01', periods=2), [1.0, 2.0])
+
+    def test_budget_series(self):
+        """
+        Test budget series matches the budget of each date's hedge ratios
+        """
+
+        self.pair.hedge('OLS', 30)
+        budget = self.pair.budget_series(2)
+
+        self.assertTrue(budget.index.equals(self.pair.dates))
+        for i in (0, 29, 100, 197):
+            hedge_ratios = self.pair.hedge_ratios[i]
+            units = [abs(_truncate(h, 2)) * 100 for h in hedge_ratios]
+            expected = _truncate(units[0] * self.pair.prices[i, 0]
+                                 + units[1] * self.pair.prices[i, 1], 2)
+            self.assertAlmostEqual(budget.iloc[i], expected)
+
+        # Last date agrees with Pair.budget
+        self.pair.hedge_ratios = np.tile([1.0, -1.5], (199, 1))
+        self.assertAlmostEqual(self.pair.budget_series(2).iloc[-1],
+                               self.pair.budget([1.0, -1.5], 2))
+
+        with self.assertRaises(ValueError):
+            self.pair.budget_series(-1)
+
+    def test_hedge_kalman(self):
+        """
+        Test Kalman hedge ratios track the gradient and can be continued
+        """
+
+        self.pair.hedge('KALMAN', delta=1e-4, ve=1.0)
+        hedge_ratios = self.pair.hedge_ratios
+
+        self.assertEqual(hedge_ratios.shape, (199, 2))
+        self.assertTrue(np.all(hedge_ratios[:, 0] == 1))
+        # Intercept is weakly identified over 200 dates so only roughly 1.5
+        self.assertAlmostEqual(hedge_ratios[-1, 1], -1.5, delta=0.2)
+
+        # Filtering in two parts gives the same state as in one
+        prices = self.pair.prices
+        kalman = KalmanHedge(1e-4, 1.0)
+        kalman.filter(prices[:150, 0], prices[:150, 1])
+        for y, x in prices[150:]:
+            state = kalman.update(y, x)
+
+        self.assertAlmostEqual(state[1], -hedge_ratios[-1, 1])
+        np.testing.assert_allclose(kalman.covariance,
+                                   self.pair.kalman.covariance)
+
+        with self.assertRaises(ValueError):
+            self.pair.hedge('KALMAN', 30)
+        with self.assertRaises(ValueError):
+            KalmanHedge(delta=1.5)
+
+    def test_cadf_test(self):
+        """
+        Test cadf_test returns full precision results matching statsmodels
+        """
+
+        prices = self.pair.prices
+        statistic, pvalue, crit_value = ts.coint(prices[:, 0], prices[:, 1])
+
+        result = cadf_test(self.pair)
+        self.assertIsInstance(result, CADFResult)
+        self.assertEqual(result.symbols, ('Y', 'X'))
+        self.assertEqual(result.statistic, statistic)
+        self.assertEqual(result.pvalue, pvalue)
+        np.testing.assert_array_equal(result.critical_values, crit_value)
+        self.assertEqual(result.nobs, 199)
+        self.assertEqual(result.start_date, self.pair.dates[0].date())
+        self.assertEqual(result.end_date, self.pair.dates[-1].date())
+        self.assertIn(f't-statistic = {round(statistic, 3)}', str(result))
+
+        # Pairs of each length are tested together
+        end = self.pair.dates[149].date()
+        short = Pair(Equity('Y', '2015-01-01', end, source=self.source),
+                     Equity('X', '2015-01-01', end, source=self.source))
+        pairs = [self.pair, short, self.pair]
+
+        results = cadf_test_many(pairs)
+        self.assertEqual(results.shape, (3, 10))
+        self.assertEqual(list(results['nobs']), [199, 150, 199])
+        self.assertEqual(results['end_date'].iloc[1], end)
+        for i, pair in enumerate(pairs):
+            expected = ts.coint(pair.prices[:, 0], pair.prices[:, 1])
+            self.assertAlmostEqual(results['statistic'].iloc[i], expected[0],
+                                   places=8)
+            self.assertAlmostEqual(results['pvalue'].iloc[i], expected[1],
+                                   places=8)
+            np.testing.assert_array_equal(
+                results[['crit_1', 'crit_5', 'crit_10']].iloc[i], expected[2])
+
+        with self.assertRaises(TypeError):
+            cadf_test_many([self.pair, 'not pair'])
+
+    def test_johansen_test(self):
+        """
+        Test johansen_test returns full precision results matching statsmodels
+        """
+
+        reference = coint_johansen(self.pair.prices, 0, 1)
+
+        result = johansen_test(self.pair)
+        self.assertIsInstance(result, JohansenResult)
+        np.testing.assert_array_equal(result.trace_stat, reference.lr1)
+        np.testing.assert_array_equal(result.trace_crit, reference.cvt)
+        np.testing.assert_array_equal(result.eigen_stat, reference.lr2)
+        np.testing.assert_array_equal(result.eigen_crit, reference.cvm)
+        np.testing.assert_array_equal(result.eigenvectors, reference.evec)
+        self.assertEqual(result.nobs, 199)
+        self.assertIn('r<=1 Eigenvalue Statistic', str(result))
+
+        # Pairs of any length are solved together
+        end = self.pair.dates[149].date()
+        short = Pair(Equity('Y', '2015-01-01', end, source=self.source),
+                     Equity('X', '2015-01-01', end, source=self.source))
+
+        results = johansen_test_many([self.pair, short])
+        self.assertEqual(results.shape, (2, 21))
+        self.assertEqual(list(results['nobs']), [199, 150])
+        for i, prices in enumerate([self.pair.prices, short.prices]):
+            expected = coint_johansen(prices, 0, 1)
+            for r in range(2):
+                self.assertAlmostEqual(results[f'trace_stat_{r}'].iloc[i],
+                                       expected.lr1[r], places=8)
+                self.assertAlmostEqual(results[f'eigen_stat_{r}'].iloc[i],
+                                       expected.lr2[r], places=8)
+        self.assertEqual(results['eigen_crit_1_95'].iloc[0],
+                         reference.cvm[1, 1])
+        self.assertEqual(results['trace_crit_0_99'].iloc[1],
+                         reference.cvt[0, 2])
+
+        with self.assertRaises(TypeError):
+            johansen_test_many([self.pair, 'not pair'])
+
+    def test_rolling_cadf(self):
+        """
+        Test rolling_cadf matches statsmodels' coint on each window
+        """
+
+        prices = self.pair.prices
+        results = self.pair.rolling_cadf(60, step=7, lag=2)
+        self.assertEqual(len(results), len(range(59, 199, 7)))
+        self.assertEqual(results.index[0], self.pair.dates[59])
+
+        for k in (0, 5, len(results) - 1):
+            window = prices[7 * k:7 * k + 60]
+            statistic, pvalue, _ = ts.coint(window[:, 0], window[:, 1],
+                                            maxlag=2, autolag=None)
+            self.assertAlmostEqual(results['statistic'].iloc[k], statistic,
+                                   places=8)
+            self.assertAlmostEqual(results['pvalue'].iloc[k], pvalue,
+                                   places=8)
+
+        parallel = self.pair.rolling_cadf(60, step=7, lag=2, n_jobs=2)
+        np.testing.assert_allclose(parallel.values, results.values,
+                                   rtol=1e-8)
+
+        with self.assertRaises(ValueError):
+            self.pair.rolling_cadf(60, lag=30)
+        with self.assertRaises(ValueError):
+            self.pair.rolling_cadf(60, step=0)
+
+    def test_rolling_johansen(self):
+        """
+        Test rolling_johansen matches statsmodels' coint_johansen on each
+        window
+        """
+
+        prices = self.pair.prices
+        results = self.pair.rolling_johansen(50, step=10)
+        self.assertEqual(len(results), len(range(49, 199, 10)))
+
+        for k in (0, len(results) - 1):
+            reference = coint_johansen(prices[10 * k:10 * k + 50], 0, 1)
+            np.testing.assert_allclose(results.iloc[k],
+                                       np.concatenate([reference.lr1,
+                                                       reference.lr2]),
+                                       rtol=1e-8)
+
+    def test_half_life(self):
+        """
+        Test half-lives match an AR(1) regression of each spread
+        """
+
+        rng = np.random.default_rng(1)
+        spreads = np.empty((300, 3))
+        spreads[0] = 0
+        for t in range(1, 300):
+            spreads[t] = spreads[t - 1] * np.array([0.9, 0.97, 1.0]) \
+                         + rng.normal(size=3)
+        spreads[100, 1] = np.nan
+
+        results = half_lives(pd.DataFrame(spreads, columns=list('abc')))
+        self.assertEqual(list(results.index), ['a', 'b', 'c'])
+
+        for i in (0, 1):
+            s = spreads[:, i]
+            valid = np.isfinite(s[1:]) & np.isfinite(s[:-1])
+            ols = sm.OLS(np.diff(s)[valid], sm.add_constant(s[:-1][valid]))
+            b = ols.fit().params[1]
+            self.assertAlmostEqual(results.iloc[i],
+                                   -np.log(2) / np.log(abs(1 + b)))
+            self.assertAlmostEqual(half_lives(s), results.iloc[i])
+
+        # A spread which doesn't revert never halves
+        self.assertEqual(half_lives(np.arange(50.0)), np.inf)
+
+        half_life = self.pair.half_life()
+        self.assertGreater(half_life, 0)
+        self.assertLess(half_life, 5)
+
+    def test_hedge_auto(self):
+        """
+        Test lookback='auto' looks back on the spread's half-life
+        """
+
+        lookback = max(2, int(np.ceil(self.pair.half_life())))
+
+        self.pair.hedge('OLS', 'auto')
+        auto = self.pair.hedge_ratios
+        self.pair.hedge('OLS', lookback)
+        np.testing.assert_array_equal(auto, self.pair.hedge_ratios)
+
+        with self.assertRaises(TypeError):
+            self.pair.hedge('OLS', 'other')
+        with self.assertRaises(ValueError):
+            self.pair.hedge('KALMAN', 'auto')
+
+
 # Test radium.pair functions outside Pair class
 class TestPairFunctions(unittest.TestCase):
 
@@ -0,0 +1,85 @@
+import pickle
+import tempfile
+import unittest
+import numpy as np
+
+from radium import Equity, Pair, PricePanel
+from radium.equity import ArraySource
+
+
+class TestPricePanel(unittest.TestCase):
+    def setUp(self):
+        self.source = ArraySource()
+        self.source.add('V', ['2015-01-02', '2015-01-05', '2015-01-06'],
+                        [1.0, 2.0, 3.0])
+        self.source.add('MA', ['2015-01-05', '2015-01-06', '2015-01-07'],
+                        [4.0, 5.0, 6.0])
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.panel = PricePanel.from_source(self.source, ['V', 'MA'],
+                                            '2015-01-01', '2015-01-07',
+                                            path=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_calendar(self):
+        """
+        Test prices are aligned on the union of dates
+        """
+
+        np.testing.assert_array_equal(self.panel.prices,
+                                      [[1.0, np.nan],
+                                       [2.0, 4.0],
+                                       [3.0, 5.0],
+                                       [np.nan, 6.0]])
+        self.assertEqual(self.panel.symbols, ['V', 'MA'])
+        self.assertIsInstance(self.panel.values, np.memmap)
+
+    def test_views(self):
+        """
+        Test equities and pairs built from the panel view its prices
+        """
+
+        visa = self.panel.equity('V', '2015-01-05')
+        np.testing.assert_array_equal(visa.closed, [2.0, 3.0, np.nan])
+        self.assertTrue(np.shares_memory(visa.data.values, self.panel.values))
+
+        pair = self.panel.pair('V', 'MA')
+        self.assertIsInstance(pair, Pair)
+        self.assertIsInstance(pair.equity1, Equity)
+
+        with self.assertRaises(ValueError):
+            self.panel.equity('KO')
+
+    def test_open(self):
+        """
+        Test memory-mapped panels are reopened rather than copied
+        """
+
+        panel = pickle.loads(pickle.dumps(self.panel))
+
+        self.assertIsInstance(panel.values, np.memmap)
+        self.assertEqual(panel.symbols, ['V', 'MA'])
+        np.testing.assert_array_equal(panel.prices, self.panel.prices)
+
+    def test_from_equities(self):
+        """
+        Test panels built in memory from equities
+        """
+
+        equities = [Equity(symbol, '2015-01-01', '2015-01-06',
+                           source=self.source) for symbol in ('MA', 'V')]
+        panel = PricePanel.from_equities(equities)
+
+        self.assertEqual(panel.symbols, ['MA', 'V'])
+        np.testing.assert_array_equal(panel.values,
+                                      [[np.nan, 4.0, 5.0],
+                                       [1.0, 2.0, 3.0]])
+
+        with self.assertRaises(TypeError):
+            PricePanel.from_equities(['V'])
+
+
+if __name__ == '__main__':
+    unittest.main()
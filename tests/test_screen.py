@@ -0,0 +1,177 @@
+import unittest
+import numpy as np
+import statsmodels.tsa.stattools as ts
+
+from radium import PricePanel
+from radium.screen import prefilter_pairs, PrefilterResult, screen_pairs
+
+
+class TestScreenPairs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Random walks and noisy combinations of a common random walk
+        rng = np.random.default_rng(0)
+        common = np.cumsum(rng.normal(size=300))
+        values = np.empty((6, 300))
+        for i in range(6):
+            if i % 3 == 0:
+                values[i] = 50 + np.cumsum(rng.normal(size=300))
+            else:
+                noise = np.convolve(rng.normal(size=303), [1, 0.5, 0.3, 0.2],
+                                    'valid')
+                values[i] = 30 + (1 + i / 10) * common + i * noise
+        values[4, 10] = np.nan
+
+        dates = np.datetime64('2015-01-01') + np.arange(300)
+        cls.values = values
+        cls.panel = PricePanel(['A', 'B', 'C', 'D', 'E', 'F'], dates, values)
+
+    def test_screen_pairs(self):
+        """
+        Test screen_pairs matches statsmodels' coint on every pair
+        """
+
+        results = screen_pairs(self.panel)
+        self.assertEqual(results.shape, (15, 10))
+        self.assertTrue(np.all(np.diff(results['pvalue']) >= 0))
+
+        valid = np.isfinite(self.values).all(axis=0)
+        for row in results.itertuples():
+            y = self.values[self.panel.row(row.symbol1), valid]
+            x = self.values[self.panel.row(row.symbol2), valid]
+            statistic, pvalue, crit_value = ts.coint(y, x)
+
+            self.assertAlmostEqual(row.statistic, statistic, places=8)
+            self.assertAlmostEqual(row.pvalue, pvalue, places=8)
+            self.assertAlmostEqual(row.crit_5, crit_value[1])
+            self.assertEqual(row.nobs, 299)
+
+    def test_pairs(self):
+        """
+        Test screening given pairs between dates
+        """
+
+        results = screen_pairs(self.panel, pairs=[('B', 'C'), ('C', 'B')],
+                               start_date='2015-03-01', maxlag=2)
+        self.assertEqual(results.shape[0], 2)
+        self.assertEqual(set(results['symbol1']), {'B', 'C'})
+
+        y = self.values[1, 59:]
+        x = self.values[2, 59:]
+        statistic, _, _ = ts.coint(y, x, maxlag=2)
+        row = results[results['symbol1'] == 'B'].iloc[0]
+        self.assertAlmostEqual(row['statistic'], statistic, places=8)
+        self.assertLessEqual(row['lags'], 2)
+
+    def test_bad_input(self):
+        """
+        Test exception handling of screen_pairs
+        """
+
+        self.assertRaises(TypeError, screen_pairs, 'not panel')
+        self.assertRaises(ValueError, screen_pairs, self.panel,
+                          pairs=[('A', 'Z')])
+        self.assertRaises(ValueError, screen_pairs, self.panel, n_jobs=0)
+        self.assertRaises(TypeError, screen_pairs, self.panel, maxlag=1.5)
+        self.assertRaises(ValueError, screen_pairs, self.panel, maxlag=200)
+
+
+class TestPrefilterPairs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A and B share a random walk, E holds 0.4 of it, C and D are
+        # independent random walks
+        rng = np.random.default_rng(1)
+        common = np.cumsum(rng.normal(scale=0.01, size=400))
+        values = np.empty((5, 400))
+        values[0] = common + rng.normal(scale=0.01, size=400)
+        values[1] = common + rng.normal(scale=0.01, size=400)
+        values[2:4] = np.cumsum(rng.normal(scale=0.01, size=(2, 400)), axis=1)
+        values[4] = 0.4 * common + rng.normal(scale=0.01, size=400)
+        values = 50 * np.exp(values)
+        values[3, 20] = np.nan
+
+        dates = np.datetime64('2015-01-01') + np.arange(400)
+        cls.values = values
+        cls.panel = PricePanel(['A', 'B', 'C', 'D', 'E'], dates, values)
+
+    def test_prefilter_pairs(self):
+        """
+        Test statistics of every pair match those of its hedged log price
+        spread
+        """
+
+        result = prefilter_pairs(self.panel, max_hurst=1,
+                                 max_variance_ratio=10, timing_sample=0)
+        self.assertIsInstance(result, PrefilterResult)
+        self.assertEqual(result.statistics.shape, (10, 7))
+        self.assertEqual(len(result.survivors), 10)
+        self.assertEqual(result.nobs, 399)
+        self.assertIsNone(result.time_saved)
+
+        valid = np.isfinite(self.values).all(axis=0)
+        log_prices = np.log(self.values[:, valid])
+        lags = np.array([1, 2, 4, 8, 16, 32])
+        for row in result.statistics.itertuples():
+            y = log_prices[self.panel.row(row.symbol1)]
+            x = log_prices[self.panel.row(row.symbol2)]
+            hedge_ratio = np.polyfit(x, y, 1)[0]
+            spread = y - hedge_ratio * x
+            variances = [np.var(spread[k:] - spread[:-k], ddof=1)
+                         for k in lags]
+
+            hurst = np.polyfit(np.log(lags), np.log(variances), 1)[0] / 2
+            self.assertAlmostEqual(row.hedge_ratio, hedge_ratio)
+            self.assertAlmostEqual(row.hurst, hurst)
+            self.assertAlmostEqual(row.variance_ratio,
+                                   variances[-1] / (32 * variances[0]))
+            self.assertAlmostEqual(row.correlation,
+                                   np.corrcoef(np.diff(y), np.diff(x))[0, 1])
+
+        # Correlation gate is opt-in
+        result = prefilter_pairs(self.panel, min_correlation=0.99,
+                                 max_hurst=1, max_variance_ratio=10,
+                                 timing_sample=0)
+        self.assertEqual(result.survivors, [])
+
+    def test_survivors(self):
+        """
+        Test cointegrated pairs, whatever their hedge ratio, survive the
+        default thresholds
+        """
+
+        result = prefilter_pairs(self.panel, timing_sample=2)
+        cointegrated = [('A', 'B'), ('A', 'E'), ('B', 'E')]
+        for pair in cointegrated:
+            self.assertIn(pair, result.survivors)
+
+        tight = prefilter_pairs(self.panel, max_variance_ratio=0.1,
+                                timing_sample=0)
+        self.assertEqual(tight.survivors, cointegrated)
+
+        # Time saved is net of prefiltering and timing the sample
+        skipped = len(result.statistics) - len(result.survivors)
+        self.assertGreater(result.test_seconds, 0)
+        self.assertGreater(result.timing_elapsed, 0)
+        self.assertAlmostEqual(result.time_saved,
+                               skipped * result.test_seconds
+                               - result.elapsed - result.timing_elapsed)
+        self.assertIn(f'{len(result.survivors)} pairs passed', str(result))
+
+        results = screen_pairs(self.panel, pairs=result.survivors)
+        self.assertEqual(results.shape[0], len(result.survivors))
+
+    def test_bad_input(self):
+        """
+        Test exception handling of prefilter_pairs
+        """
+
+        self.assertRaises(TypeError, prefilter_pairs, 'not panel')
+        self.assertRaises(ValueError, prefilter_pairs, self.panel, lags=(2, 4))
+        self.assertRaises(ValueError, prefilter_pairs, self.panel, lags=(1,))
+        self.assertRaises(ValueError, prefilter_pairs, self.panel,
+                          lags=(1, 300))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,11 @@ import unittest
 import numpy as np
 
 from radium import Pair, Equity
-from radium.strategy import PairStrategy
+from radium.strategy import PairStrategy, BollingerPair
 from radium.helpers import _truncate
 
+from fixtures import cointegrated_source
+
 
 class TestPairStrategy(unittest.TestCase):
     @classmethod
@@ -126,5 +128,39 @@ class TestPairStrategy(unittest.TestCase):
             new_strategy.strategy.CAGR
 
 
+class TestBollingerPairOffline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Cointegrated random walks with a gap in the second equity
+        source = cointegrated_source()
+
+        cls.pair = Pair(Equity('Y', '2015-01-01', '2016-01-01', source=source),
+                        Equity('X', '2015-01-01', '2016-01-01', source=source))
+        cls.pair.hedge('OLS', 30)
+
+    def test_aligned(self):
+        """
+        Test strategy positions and returns follow the pair's aligned dates
+        """
+
+        bollinger = BollingerPair(self.pair, 1, 0, 30)
+
+        self.assertEqual(bollinger.th_positions.shape, self.pair.prices.shape)
+        self.assertEqual(len(bollinger.daily_returns), len(self.pair.dates))
+        self.assertTrue(np.isfinite(bollinger.sharpe))
+        self.assertIsInstance(bollinger.CAGR, float)
+
+    def test_auto_lookback(self):
+        """
+        Test lookback='auto' looks back on the pair's half-life
+        """
+
+        bollinger = BollingerPair(self.pair, 1, 0, 'auto')
+
+        self.assertEqual(bollinger.lookback,
+                         max(2, int(np.ceil(self.pair.half_life()))))
+        self.assertEqual(bollinger.th_positions.shape, self.pair.prices.shape)
+
+
 if __name__ == '__main__':
     unittest.main()